@@ -1,6 +1,34 @@
+"""Skill Track from the command line.
+
+    python SkillTrackCLi.py [--db PATH] [--user NAME] COMMAND ...
+
+    start ENTITY                 start a timer (entity id or name)
+    stop [ENTITY]                stop running timers (all, or one entity's)
+    status                       list running timers
+    report [--from DAY] [--to DAY] [--group-by day|week|month] [--entity E ...] [--format table|csv|json]
+    sessions list [--from DAY] [--to DAY] [--entity E ...] [--deleted] [--limit N] [--format ...]
+    import PATH ...              bulk-import legacy text files (see skilltrack.importer)
+    export sessions|report ...   stream CSV / JSON Lines (see skilltrack.export)
+    menu                         the interactive menu (also the default with no command)
+
+--user (or SKILLTRACK_USER) limits every command to that user's entities;
+without it they span all users.  Commands read through the batched query
+paths (one query per report or status, keyset pages for session lists) and
+print rows as they arrive; json output is one JSON object per line.  Nothing
+from Qt or the plotting libraries is imported.
+"""
+import argparse
+import csv
+import json
 import os
-from datetime import datetime, timedelta
-from logic import Entity, loadEntitiesFromFile, appendEntityToFile, startSession, loadStartedSessionsFromFile, endSession, GenerateReport;
+import sys
+from datetime import date, datetime, timedelta
+from logic import Entity, loadEntitiesFromFile, appendEntityToFile, startSession, loadStartedSessionsFromFile, endSession, GenerateReport, GenerateReports;
+import logic
+
+USER_ENV_VAR = 'SKILLTRACK_USER'
+OUTPUT_FORMATS = ('table', 'csv', 'json')
+REPORT_DAYS = 7
 
 def clear_screen():
     # 'nt' refers to Windows; 'posix' refers to Linux/macOS/Unix
@@ -11,10 +39,9 @@ def clear_screen():
 def pause():
     input("Press Enter to continue...")
 
-# main
 
-if __name__ == "__main__":
-    from datetime import datetime, timedelta
+def run_menu():
+    """The original interactive menu."""
     appRun = True
     while(appRun):
         clear_screen()
@@ -69,8 +96,9 @@ if __name__ == "__main__":
             clear_screen()
             print("Started Sessions:")
             startedSessions = loadStartedSessionsFromFile()
+            entitiesById = {e.id: e for e in loadEntitiesFromFile()}
             for session in startedSessions:
-                entity = next((e for e in loadEntitiesFromFile() if e.id == session.entityId), None)
+                entity = entitiesById.get(session.entityId)
                 if entity:
                     print(f"Session ID: {session.id}, Entity: {entity.name}, Start Time: {session.startTime}")
             
@@ -110,12 +138,11 @@ if __name__ == "__main__":
             elif(reportChoice == 2):
                 print("Generating Reports for all Entities...")
                 entities = loadEntitiesFromFile()
-                Reports = []
-                for entity in entities:
-                    Reports.append(GenerateReport(entity, datetime.now() - timedelta(days=7), datetime.now()))
+                Reports = GenerateReports(entities, datetime.now() - timedelta(days=7), datetime.now()).values()
             
+                entitiesById = {e.id: e for e in entities}
                 for report in Reports:
-                    entity = next((e for e in entities if e.id == report.entityId), None)
+                    entity = entitiesById.get(report.entityId)
                     if entity:
                         hours, minutes, seconds = report.totalTimeSpent
                         print(f"Report for {entity.name} from {report.startDate} to {report.endDate}: {hours} hours, {minutes} minutes, {seconds} seconds")
@@ -127,4 +154,242 @@ if __name__ == "__main__":
             print("Invalid choice!")
             pause()
         
-    
\ No newline at end of file
+
+
+# --- Subcommands ---
+
+class CliError(Exception):
+    """A user-facing error: printed to stderr, exit status 1."""
+
+
+class _Output:
+    """Write rows as an aligned table, CSV or JSON Lines, one row at a time."""
+
+    def __init__(self, fmt, columns, widths=None, out=None):
+        self.fmt = fmt
+        self.columns = list(columns)
+        self.widths = widths or [max(len(c), 12) for c in self.columns]
+        self.out = out or sys.stdout
+        self._csv = csv.writer(self.out) if fmt == 'csv' else None
+        if fmt == 'table':
+            self._line(self.columns)
+            self._line(['-' * w for w in self.widths])
+        elif fmt == 'csv':
+            self._csv.writerow(self.columns)
+
+    def _line(self, values):
+        cells = [str(v).ljust(w) if isinstance(v, str) else str(v).rjust(w) for v, w in zip(values, self.widths)]
+        self.out.write('  '.join(cells).rstrip() + '\n')
+
+    def row(self, *values):
+        if self.fmt == 'table':
+            self._line(values)
+        elif self.fmt == 'csv':
+            self._csv.writerow(values)
+        else:
+            self.out.write(json.dumps(dict(zip(self.columns, values))) + '\n')
+
+
+def _day(value):
+    try:
+        return date.fromisoformat(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"not a YYYY-MM-DD date: {value!r}")
+
+
+def _hms(seconds):
+    h, rem = divmod(int(seconds), 3600)
+    m, s = divmod(rem, 60)
+    return f"{h}:{m:02d}:{s:02d}"
+
+
+def _entities(args):
+    """{id: Entity} for --user (all entities without one), loaded once per command."""
+    return {e.id: e for e in loadEntitiesFromFile(username=args.user)}
+
+
+def _resolve(entities, value):
+    """The entity whose id or (case-insensitive) name is `value`."""
+    if value.isdigit() and int(value) in entities:
+        return entities[int(value)]
+    matches = [e for e in entities.values() if e.name.lower() == value.lower()]
+    if len(matches) == 1:
+        return matches[0]
+    if matches:
+        raise CliError(f"entity name {value!r} is ambiguous; use one of the ids {[e.id for e in matches]}")
+    raise CliError(f"no entity {value!r}")
+
+
+def _selected(args, entities):
+    if not args.entities:
+        return sorted(entities.values(), key=lambda e: e.id)
+    return [_resolve(entities, value) for value in args.entities]
+
+
+def cmd_start(args):
+    entities = _entities(args)
+    entity = _resolve(entities, args.entity)
+    if any(s.entityId == entity.id for s in logic.iter_started_sessions(entity_ids=[entity.id])):
+        raise CliError(f"{entity.name} is already running")
+    session = startSession(entity)
+    print(f"Started {entity.name} (session {session.id}) at {session.startTime:%Y-%m-%d %H:%M:%S}")
+
+
+def cmd_stop(args):
+    entities = _entities(args)
+    ids = [_resolve(entities, args.entity).id] if args.entity else None
+    running = list(logic.iter_started_sessions(username=args.user, entity_ids=ids))
+    if not running:
+        raise CliError("nothing is running")
+    for session in running:
+        ended = endSession(session)
+        name = entities[session.entityId].name if session.entityId in entities else f"entity {session.entityId}"
+        print(f"Stopped {name} after {_hms((ended.endTime - ended.startTime).total_seconds())}")
+
+
+def cmd_status(args):
+    entities = _entities(args)
+    now = datetime.now()
+    out = _Output(args.format, ['session', 'entity', 'started', 'elapsed'], [8, 24, 19, 10])
+    for session in logic.iter_started_sessions(username=args.user):
+        entity = entities.get(session.entityId)
+        out.row(session.id, entity.name if entity else f"entity {session.entityId}",
+                f"{session.startTime:%Y-%m-%d %H:%M:%S}", _hms((now - session.startTime).total_seconds()))
+
+
+def _date_range(args):
+    last = args.last_day or date.today()
+    first = args.first_day or last - timedelta(days=REPORT_DAYS - 1)
+    if first > last:
+        raise CliError("--from must not be after --to")
+    return first, last
+
+
+def cmd_report(args):
+    first, last = _date_range(args)
+    selected = _selected(args, _entities(args))
+    ids = [e.id for e in selected]
+    names = {e.id: e.name for e in selected}
+    if args.group_by:
+        from skilltrack.export import iter_report
+        out = _Output(args.format, ['period', 'entity_id', 'entity', 'hours', 'cumulative_hours'], [10, 9, 24, 10, 16])
+        running = dict.fromkeys(ids, 0.0)
+        for period, seconds in iter_report(ids, first, last, args.group_by, args.user):
+            for eid, secs in zip(ids, seconds):
+                running[eid] += secs
+                out.row(period.isoformat(), eid, names[eid], round(secs / 3600.0, 3), round(running[eid] / 3600.0, 3))
+        return
+    # whole days, so this reads the daily rollups in one query
+    start = datetime.combine(first, datetime.min.time())
+    end = datetime.combine(last, datetime.max.time().replace(microsecond=0))
+    reports = GenerateReports(ids, start, end, username=args.user)
+    out = _Output(args.format, ['entity_id', 'entity', 'hours', 'time'], [9, 24, 10, 10])
+    for eid in ids:
+        h, m, s = reports[eid].totalTimeSpent
+        seconds = h * 3600 + m * 60 + s
+        out.row(eid, names[eid], round(seconds / 3600.0, 3), _hms(seconds))
+
+
+def cmd_sessions_list(args):
+    entities = _entities(args)
+    ids = [e.id for e in _selected(args, entities)] if args.entities else None
+    start = datetime.combine(args.first_day, datetime.min.time()) if args.first_day else None
+    end = datetime.combine(args.last_day + timedelta(days=1), datetime.min.time()) if args.last_day else None
+    out = _Output(args.format, ['id', 'entity', 'start', 'end', 'duration'], [8, 24, 19, 19, 10])
+    # newest first, one keyset page at a time
+    remaining, after = args.limit, None
+    while remaining is None or remaining > 0:
+        limit = logic.SESSION_PAGE_SIZE if remaining is None else min(remaining, logic.SESSION_PAGE_SIZE)
+        page = logic.loadSessionPage(args.user, ids, start, end, args.deleted, after, limit)
+        for s in page:
+            entity = entities.get(s.entityId)
+            out.row(s.id, entity.name if entity else f"entity {s.entityId}", f"{s.startTime:%Y-%m-%d %H:%M:%S}",
+                    f"{s.endTime:%Y-%m-%d %H:%M:%S}", _hms((s.endTime - s.startTime).total_seconds()))
+        if len(page) < limit:
+            break
+        after = (page[-1].startTime, page[-1].id)
+        if remaining is not None:
+            remaining -= len(page)
+
+
+def _add_filters(parser, dates=True):
+    parser.add_argument('--user', help=f'default: the global --user or ${USER_ENV_VAR}')
+    parser.add_argument('--entity', action='append', dest='entities', metavar='ENTITY',
+                        help='entity id or name (repeatable; default: all)')
+    if dates:
+        parser.add_argument('--from', dest='first_day', type=_day, metavar='YYYY-MM-DD')
+        parser.add_argument('--to', dest='last_day', type=_day, metavar='YYYY-MM-DD')
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog='SkillTrackCLi.py', description=__doc__.splitlines()[0],
+                                     formatter_class=argparse.RawDescriptionHelpFormatter,
+                                     epilog='\n'.join(__doc__.splitlines()[4:13]))
+    parser.add_argument('--db', help=f'database file (default: ${logic.DB_ENV_VAR} or {logic.DB_FILE})')
+    parser.add_argument('--user', dest='global_user', metavar='USER', help=f'default: ${USER_ENV_VAR}')
+    commands = parser.add_subparsers(dest='command', metavar='COMMAND')
+
+    start = commands.add_parser('start', help='start a timer')
+    start.add_argument('entity', help='entity id or name')
+    start.set_defaults(handler=cmd_start)
+
+    stop = commands.add_parser('stop', help='stop running timers')
+    stop.add_argument('entity', nargs='?', help='entity id or name (default: every running timer)')
+    stop.set_defaults(handler=cmd_stop)
+
+    status = commands.add_parser('status', help='list running timers')
+    status.add_argument('--format', choices=OUTPUT_FORMATS, default='table')
+    status.set_defaults(handler=cmd_status)
+
+    report = commands.add_parser('report', help=f'time per entity (default: the last {REPORT_DAYS} days)')
+    _add_filters(report)
+    report.add_argument('--group-by', choices=('day', 'week', 'month'))
+    report.add_argument('--format', choices=OUTPUT_FORMATS, default='table')
+    report.set_defaults(handler=cmd_report)
+
+    sessions = commands.add_parser('sessions', help='completed sessions')
+    sessions_commands = sessions.add_subparsers(dest='sessions_command', metavar='ACTION', required=True)
+    listing = sessions_commands.add_parser('list', help='newest first')
+    _add_filters(listing)
+    listing.add_argument('--deleted', action='store_true', help='list deleted sessions instead')
+    listing.add_argument('--limit', type=int, help='at most this many sessions')
+    listing.add_argument('--format', choices=OUTPUT_FORMATS, default='table')
+    listing.set_defaults(handler=cmd_sessions_list)
+
+    from skilltrack import export, importer
+    importing = commands.add_parser('import', help='bulk-import legacy text files')
+    importer.add_arguments(importing)
+    importing.set_defaults(handler=importer.run, wrapped=True)
+    exporting = commands.add_parser('export', help='stream sessions or reports to CSV / JSON Lines')
+    export.add_arguments(exporting)
+    exporting.set_defaults(handler=export.run, wrapped=True)
+
+    commands.add_parser('menu', help='interactive menu').set_defaults(handler=lambda args: run_menu())
+    return parser
+
+
+def main(argv=None) -> int:
+    args = build_parser().parse_args(argv)
+    if args.db:
+        logic.configure_db(args.db)
+    # report, sessions list, import and export also take --user after the command
+    args.user = getattr(args, 'user', None) or args.global_user or os.environ.get(USER_ENV_VAR)
+    if getattr(args, 'wrapped', False):
+        return args.handler(args)
+    handler = getattr(args, 'handler', None)
+    if handler is None:
+        run_menu()
+        return 0
+    try:
+        handler(args)
+    except CliError as ex:
+        print(f"error: {ex}", file=sys.stderr)
+        return 1
+    except BrokenPipeError:
+        # e.g. piped into `head`; don't print a traceback
+        sys.stderr.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
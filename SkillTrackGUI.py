@@ -14,46 +14,71 @@ This file replaces the previous CLI loop and uses functions from `logic.py`.
 
 import sys
 import os
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
 
 from PyQt6.QtWidgets import (
     QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
     QLabel, QLineEdit, QTextEdit, QListWidget, QListWidgetItem, QPushButton, QMessageBox,
     QComboBox, QTabWidget, QFormLayout, QDialog, QDialogButtonBox, QDateEdit, QDateTimeEdit, QSizePolicy, QStyle, QFileDialog,
-    QSystemTrayIcon, QMenu, QCheckBox
+    QSystemTrayIcon, QMenu, QCheckBox, QProgressBar, QTableView, QAbstractItemView, QHeaderView
 )
-from PyQt6.QtCore import Qt, QTimer, QDate, QDateTime, QSettings, QSize, QPoint
-import urllib.request
-import json
-
-# Matplotlib (optional) for plotting reports
-try:
-    from matplotlib.backends.backend_qtagg import FigureCanvasQTAgg as FigureCanvas
-    from matplotlib.figure import Figure
-    MATPLOTLIB_AVAILABLE = True
-except Exception:
-    MATPLOTLIB_AVAILABLE = False
-
-# Optional pyqtgraph for interactive plots
-try:
-    import pyqtgraph as pg
-    PYQTGRAPH_AVAILABLE = True
-except Exception:
-    PG = None
-    PYQTGRAPH_AVAILABLE = False
-
-from logic import Entity, calculateTotalTime
+from PyQt6.QtCore import Qt, QTimer, QDate, QDateTime, QSettings, QSize, QPoint, QAbstractTableModel, QModelIndex, pyqtSignal
+
+# Plotting backends (optional) are only needed by FullReportWindow, so they
+# are imported on first use by _load_plotting() rather than at startup.  The
+# same goes for NumPy (skilltrack.reports) and urllib/json (sync_time).
+pg = FigureCanvas = Figure = None
+PYQTGRAPH_AVAILABLE = False
+MATPLOTLIB_AVAILABLE = False
+_plotting_loaded = False
+
+
+def _load_plotting():
+    """Import the plotting backend once: pyqtgraph if present, else matplotlib."""
+    global pg, FigureCanvas, Figure, PYQTGRAPH_AVAILABLE, MATPLOTLIB_AVAILABLE, _plotting_loaded
+    if _plotting_loaded:
+        return
+    _plotting_loaded = True
+    # Optional pyqtgraph for interactive plots
+    try:
+        import pyqtgraph as pg
+        PYQTGRAPH_AVAILABLE = True
+        return
+    except Exception:
+        PYQTGRAPH_AVAILABLE = False
+    # Matplotlib (optional) as the fallback
+    try:
+        from matplotlib.backends.backend_qtagg import FigureCanvasQTAgg as FigureCanvas
+        from matplotlib.figure import Figure
+        MATPLOTLIB_AVAILABLE = True
+    except Exception:
+        MATPLOTLIB_AVAILABLE = False
+
+from logic import Entity, SESSION_PAGE_SIZE, DB_ENV_VAR
+from skilltrack.tasks import TaskRunner, task_pool
 from skilltrack.controller import (
-    get_entities, create_entity, delete_entity, update_entity,
+    get_entities, get_entity, entity_name_map, create_entity, delete_entity, update_entity,
     get_started_sessions, start_entity_session, stop_session,
-    get_completed_sessions, generate_report,
-    register_user, login_user, logout_user, is_authenticated, current_user, list_users,
-    get_goals, add_goal, update_goal, delete_goal,
-    delete_session, recover_session, add_manual_session, update_session
+    get_session_page, generate_reports, get_daily_total_columns, export_sessions, export_report,
+    register_user, login_user, logout_user, remember_login, resume_login, forget_login, is_authenticated, current_user, list_users,
+    get_goal_progress, add_goal, update_goal, delete_goal, evaluate_goals, on_goal_events,
+    delete_session, recover_session, add_manual_session, update_session,
+    get_data_version, set_database, database_path, shutdown
 )
 from PyQt6.QtGui import QAction, QIcon
 
 
+def _format_elapsed(delta):
+    elapsed = int(delta.total_seconds())
+    return f"{elapsed // 3600:02d}:{(elapsed % 3600) // 60:02d}:{elapsed % 60:02d}"
+
+
+def _elapsed_html(start_time, now):
+    start_str = start_time.strftime('%#m/%#d/%y %#I:%M:%S %p').lower()
+    return (f"<span style='font-size: 9px; font-weight: normal;'>{start_str}</span> | "
+            f"<span style='font-size: 13px; font-weight: bold;'>{_format_elapsed(now - start_time)}</span>")
+
+
 class AddEntityDialog(QDialog):
     def __init__(self, parent=None):
         super().__init__(parent)
@@ -76,6 +101,21 @@ class AddEntityDialog(QDialog):
         return self.name_input.text().strip(), self.type_input.currentText(), self.desc_input.text().strip()
 
 
+def _store_login_token(remember):
+    """Replace the remembered-login token kept in QSettings, revoking the old one."""
+    settings = QSettings("SkillTrack", "SkillTrackGUI")
+    forget_login(settings.value("auth_token", ""))
+    token = remember_login() if remember else None
+    if token:
+        settings.setValue("auth_token", token)
+    else:
+        settings.remove("auth_token")
+
+
+def _register_and_login(username, password):
+    return register_user(username, password) and login_user(username, password)
+
+
 class RegisterDialog(QDialog):
     def __init__(self, parent=None):
         super().__init__(parent)
@@ -93,6 +133,7 @@ class RegisterDialog(QDialog):
         self.buttons.accepted.connect(self.on_accept)
         self.buttons.rejected.connect(self.reject)
         self.layout.addRow(self.buttons)
+        self.tasks = TaskRunner(self)
 
     def on_accept(self):
         user = self.username.text().strip()
@@ -107,16 +148,24 @@ class RegisterDialog(QDialog):
         if pwd != pwd2:
             QMessageBox.warning(self, 'Validation', 'Passwords do not match')
             return
-        ok = register_user(user, pwd)
+        # hashing is deliberately slow, so register (and auto-login) off-thread
+        self.buttons.setEnabled(False)
+        self.tasks.submit('auth', _register_and_login, user, pwd,
+                          on_result=lambda ok: self._on_registered(user, ok),
+                          on_error=self._on_auth_error)
+
+    def _on_registered(self, user, ok):
+        self.buttons.setEnabled(True)
         if not ok:
             QMessageBox.warning(self, 'Exists', 'User already exists')
             return
-        # auto-login after successful registration
-        from skilltrack.controller import login_user
-        login_user(user, pwd)
         QMessageBox.information(self, 'Registered', f'User {user} created and logged in')
         self.accept()
 
+    def _on_auth_error(self, error):
+        self.buttons.setEnabled(True)
+        QMessageBox.warning(self, 'Error', f'Registration failed: {error}')
+
 
 class LoginDialog(QDialog):
     def __init__(self, parent=None):
@@ -128,6 +177,9 @@ class LoginDialog(QDialog):
         self.password.setEchoMode(QLineEdit.EchoMode.Password)
         self.layout.addRow('Username:', self.username)
         self.layout.addRow('Password:', self.password)
+        self.remember_check = QCheckBox('Remember me')
+        self.remember_check.setChecked(bool(QSettings("SkillTrack", "SkillTrackGUI").value("auth_token", "")))
+        self.layout.addRow('', self.remember_check)
 
         self.buttons = QDialogButtonBox()
         self.login_btn = self.buttons.addButton('Login', QDialogButtonBox.ButtonRole.AcceptRole)
@@ -137,6 +189,7 @@ class LoginDialog(QDialog):
         self.register_btn.clicked.connect(self.on_register)
         self.cancel_btn.clicked.connect(self.reject)
         self.layout.addRow(self.buttons)
+        self.tasks = TaskRunner(self)
 
     def on_login(self):
         user = self.username.text().strip()
@@ -144,10 +197,17 @@ class LoginDialog(QDialog):
         if not user or not pwd:
             QMessageBox.warning(self, 'Validation', 'Both fields are required')
             return
-        ok = login_user(user, pwd)
+        self.buttons.setEnabled(False)
+        self.tasks.submit('auth', login_user, user, pwd,
+                          on_result=lambda ok: self._on_login_result(user, ok),
+                          on_error=lambda ex: self._on_login_result(user, False))
+
+    def _on_login_result(self, user, ok):
+        self.buttons.setEnabled(True)
         if not ok:
             QMessageBox.warning(self, 'Login Failed', 'Invalid username or password')
             return
+        _store_login_token(self.remember_check.isChecked())
         QMessageBox.information(self, 'Welcome', f'Logged in as {user}')
         self.accept()
 
@@ -156,6 +216,15 @@ class LoginDialog(QDialog):
         dlg.exec()
 
 
+# (combo label, Goal.period, phrase after "Xh")
+GOAL_PERIOD_CHOICES = (
+    ("All time", None, "total"),
+    ("Every day", 'day', "today"),
+    ("Every week", 'week', "this week"),
+    ("Every month", 'month', "this month"),
+)
+
+
 class GoalDialog(QDialog):
     def __init__(self, parent=None, goal=None):
         super().__init__(parent)
@@ -163,18 +232,19 @@ class GoalDialog(QDialog):
         self.layout = QFormLayout(self)
         self.name_input = QLineEdit()
         self.target_input = QLineEdit()
-        self.status_input = QComboBox()
-        self.status_input.addItems(["Incomplete", "Completed"])
+        self.period_input = QComboBox()
+        for label, period, _ in GOAL_PERIOD_CHOICES:
+            self.period_input.addItem(label, userData=period)
         
         if goal:
             self.name_input.setText(goal.name)
             self.target_input.setText(str(goal.targetHours))
-            self.status_input.setCurrentText(goal.status)
+            self.period_input.setCurrentIndex(max(self.period_input.findData(goal.period), 0))
         
         self.layout.addRow("Milestone Name:", self.name_input)
         self.layout.addRow("Target Hours:", self.target_input)
-        if goal:
-            self.layout.addRow("Status:", self.status_input)
+        self.layout.addRow("Counted:", self.period_input)
+        # status follows the recorded time (see logic.update_goal_statuses)
             
         self.buttons = QDialogButtonBox(QDialogButtonBox.StandardButton.Ok | QDialogButtonBox.StandardButton.Cancel)
         self.buttons.accepted.connect(self.accept)
@@ -187,8 +257,7 @@ class GoalDialog(QDialog):
             target = float(self.target_input.text())
         except ValueError:
             target = 0.0
-        status = self.status_input.currentText()
-        return name, target, status
+        return name, target, self.period_input.currentData()
 
 
 class EditEntityDialog(AddEntityDialog):
@@ -204,6 +273,105 @@ class EditEntityDialog(AddEntityDialog):
         self.desc_input.setText(desc)
 
 
+class SessionTableModel(QAbstractTableModel):
+    """Completed sessions, newest first, fetched a page at a time as the view scrolls."""
+
+    HEADERS = ('ID', 'Entity', 'Start', 'End', 'Duration')
+
+    def __init__(self, tasks, key, parent=None, deleted=False):
+        super().__init__(parent)
+        self.tasks = tasks
+        self.key = key
+        self.deleted = deleted
+        self.entity_id = None
+        self.start = None
+        self.end = None
+        self._rows = []
+        self._names = {}
+        self._exhausted = False
+        self._loading = False
+
+    def reset(self, entity_id=None, start=None, end=None):
+        """Apply new filters and drop loaded rows; the first page is fetched right away."""
+        self.beginResetModel()
+        self.entity_id, self.start, self.end = entity_id, start, end
+        self._rows = []
+        self._names = entity_name_map()
+        self._exhausted = False
+        self._loading = False
+        self.endResetModel()
+        # a page still in flight for the old filters is superseded here
+        self.fetchMore(QModelIndex())
+
+    def session(self, row):
+        return self._rows[row] if 0 <= row < len(self._rows) else None
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.HEADERS)
+
+    def canFetchMore(self, parent=QModelIndex()):
+        return not parent.isValid() and not self._exhausted and not self._loading
+
+    def fetchMore(self, parent=QModelIndex()):
+        if parent.isValid() or self._exhausted or self._loading:
+            return
+        last = self._rows[-1] if self._rows else None
+        self._loading = True
+        self.tasks.submit(self.key, get_session_page, self.entity_id, self.start, self.end,
+                          deleted=self.deleted, after=(last.startTime, last.id) if last else None,
+                          on_result=self._append_page, on_error=lambda ex: self._append_page([]))
+
+    def _append_page(self, page):
+        self._loading = False
+        if len(page) < SESSION_PAGE_SIZE:
+            self._exhausted = True
+        if not page:
+            return
+        self.beginInsertRows(QModelIndex(), len(self._rows), len(self._rows) + len(page) - 1)
+        self._rows.extend(page)
+        self.endInsertRows()
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if role == Qt.ItemDataRole.DisplayRole and orientation == Qt.Orientation.Horizontal:
+            return self.HEADERS[section]
+        return None
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        s = self._rows[index.row()]
+        if role == Qt.ItemDataRole.UserRole:
+            return s
+        if role != Qt.ItemDataRole.DisplayRole:
+            return None
+        col = index.column()
+        if col == 0:
+            return s.id
+        if col == 1:
+            return self._names.get(s.entityId, f"Entity {s.entityId}")
+        if col == 2:
+            return s.startTime.strftime('%Y-%m-%d %H:%M:%S')
+        if col == 3:
+            return s.endTime.strftime('%Y-%m-%d %H:%M:%S') if s.endTime else 'N/A'
+        dur = int((s.endTime - s.startTime).total_seconds()) if s.endTime else 0
+        return f"{dur // 3600}h {(dur % 3600) // 60}m {dur % 60}s"
+
+
+def _session_table(model):
+    view = QTableView()
+    view.setModel(model)
+    view.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+    view.setSelectionMode(QAbstractItemView.SelectionMode.SingleSelection)
+    view.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+    view.verticalHeader().setVisible(False)
+    view.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.ResizeToContents)
+    view.horizontalHeader().setStretchLastSection(True)
+    return view
+
+
 class TrashBinDialog(QDialog):
     def __init__(self, entities, parent=None):
         super().__init__(parent)
@@ -212,50 +380,29 @@ class TrashBinDialog(QDialog):
         self.entities = entities
         self.layout = QVBoxLayout(self)
         
-        self.list = QListWidget()
-        self.list.setSelectionMode(QListWidget.SelectionMode.NoSelection)
-        self.layout.addWidget(self.list)
+        self.tasks = TaskRunner(self)
+        self.model = SessionTableModel(self.tasks, 'trash', self, deleted=True)
+        self.view = _session_table(self.model)
+        self.view.doubleClicked.connect(lambda index: self.on_restore_item(self.model.session(index.row()).id))
+        self.layout.addWidget(self.view)
         
         self.refresh_list()
         
+        self.restore_btn = QPushButton("Restore")
+        self.restore_btn.setStyleSheet("background-color: #d1e7dd; border: 1px solid #badbcc; border-radius: 4px;")
+        self.restore_btn.clicked.connect(self.on_restore_selected)
         self.buttons = QDialogButtonBox(QDialogButtonBox.StandardButton.Close)
+        self.buttons.addButton(self.restore_btn, QDialogButtonBox.ButtonRole.ActionRole)
         self.buttons.rejected.connect(self.reject)
         self.layout.addWidget(self.buttons)
 
     def refresh_list(self):
-        self.list.clear()
-        try:
-            all_sessions = get_completed_sessions(include_deleted=True)
-            deleted = [s for s in all_sessions if s.is_deleted == 1]
-        except Exception:
-            deleted = []
-        
-        for s in sorted(deleted, key=lambda x: x.startTime, reverse=True):
-            ent = next((e for e in self.entities if e.id == s.entityId), None)
-            name = ent.name if ent else f"Entity {s.entityId}"
-            start_str = s.startTime.strftime('%Y-%m-%d %H:%M:%S')
-            
-            # Create a widget for the row
-            item_widget = QWidget()
-            item_layout = QHBoxLayout(item_widget)
-            item_layout.setContentsMargins(5, 2, 5, 2)
-            
-            info = QLabel(f"[{s.id}] {name} — {start_str}")
-            info.setStyleSheet("font-size: 11px;")
-            
-            restore_btn = QPushButton("Restore")
-            restore_btn.setFixedWidth(70)
-            restore_btn.setStyleSheet("background-color: #d1e7dd; border: 1px solid #badbcc; border-radius: 4px;")
-            restore_btn.clicked.connect(lambda checked, sess_id=s.id: self.on_restore_item(sess_id))
-            
-            item_layout.addWidget(info)
-            item_layout.addStretch()
-            item_layout.addWidget(restore_btn)
-            
-            item = QListWidgetItem(self.list)
-            item.setSizeHint(item_widget.sizeHint())
-            self.list.addItem(item)
-            self.list.setItemWidget(item, item_widget)
+        self.model.reset()
+
+    def on_restore_selected(self):
+        rows = self.view.selectionModel().selectedRows()
+        if rows:
+            self.on_restore_item(self.model.session(rows[0].row()).id)
 
     def on_restore_item(self, session_id):
         recover_session(session_id)
@@ -319,8 +466,18 @@ class SettingsDialog(QDialog):
         self.sync_btn = QPushButton("Sync Time with Internet")
         self.sync_btn.clicked.connect(self.on_sync_time)
         
+        # database file; applied on the next start (SKILLTRACK_DB overrides it)
+        self.db_path_input = QLineEdit(QSettings("SkillTrack", "SkillTrackGUI").value("db_path", ""))
+        self.db_path_input.setPlaceholderText(database_path())
+        self.db_browse_btn = QPushButton("Browse…")
+        self.db_browse_btn.clicked.connect(self.on_browse_db)
+        db_row = QHBoxLayout()
+        db_row.addWidget(self.db_path_input)
+        db_row.addWidget(self.db_browse_btn)
+
         self.layout.addRow("Theme:", self.theme_combo)
         self.layout.addRow("Clock:", self.sync_btn)
+        self.layout.addRow("Database:", db_row)
         
         self.buttons = QDialogButtonBox(QDialogButtonBox.StandardButton.Ok | QDialogButtonBox.StandardButton.Cancel)
         self.buttons.accepted.connect(self.accept)
@@ -330,12 +487,25 @@ class SettingsDialog(QDialog):
     def get_theme(self):
         return self.theme_combo.currentText()
 
+    def get_db_path(self):
+        return self.db_path_input.text().strip()
+
+    def on_browse_db(self):
+        fname, _ = QFileDialog.getSaveFileName(self, 'Database File', self.get_db_path() or database_path(),
+                                               filter='SQLite Databases (*.db);;All Files (*)',
+                                               options=QFileDialog.Option.DontConfirmOverwrite)
+        if fname:
+            self.db_path_input.setText(fname)
+
     def on_sync_time(self):
         if self.parent():
             self.parent().sync_time()
 
 
 class MainWindow(QMainWindow):
+    # [logic.GoalEvent, ...]; emitted on whichever thread wrote the session
+    goalsChanged = pyqtSignal(object)
+
     def __init__(self):
         super().__init__()
         self.setWindowTitle("SkillTrack - Compact")
@@ -354,6 +524,11 @@ class MainWindow(QMainWindow):
         self.tabs = QTabWidget()
         self.setCentralWidget(self.tabs)
 
+        # Database loads run on a worker pool; each tab shows a loading state
+        # while its task is pending
+        self.tasks = TaskRunner(self)
+        self.tasks.busyChanged.connect(self._on_task_busy)
+
         # five tabs: Timers, Entities, Sessions, Reports, Goals
         self.timers_tab = QWidget()
         self.entities_tab = QWidget()
@@ -372,10 +547,23 @@ class MainWindow(QMainWindow):
         self._build_sessions_tab()
         self._build_report_tab()
         self._build_goals_tab()
-
-        # Start a UI timer to refresh elapsed timers every second
+        self._task_tabs = {
+            'entities': self.entities_tab, 'timers': self.timers_tab, 'sessions': self.sessions_tab,
+            'reports': self.report_tab, 'goals': self.goals_tab,
+        }
+        self._tab_titles = {tab: self.tabs.tabText(self.tabs.indexOf(tab)) for tab in self._task_tabs.values()}
+
+        # Live timers: running sessions are reloaded only after start/stop or
+        # when another connection commits; the 1 s tick just refreshes the
+        # elapsed-time labels and the tray.
+        self.started = []
+        self._timer_labels = {}
+        self._tray_timer_actions = {}
+        self._data_version = None
+        self._ticks = 0
+        self._goal_day = date.today()
         self.ui_timer = QTimer(self)
-        self.ui_timer.timeout.connect(self.load_timers)
+        self.ui_timer.timeout.connect(self.tick_timers)
         self.ui_timer.start(1000)
 
         # Account menu and status
@@ -385,6 +573,12 @@ class MainWindow(QMainWindow):
         # System Tray initialization
         self.setup_system_tray()
 
+        # Goals complete or reopen inside session writes, possibly on a worker
+        # thread; the signal queues the events to the GUI thread
+        self.goalsChanged.connect(self._on_goals_changed)
+        unsubscribe = on_goal_events(self.goalsChanged.emit)
+        self.destroyed.connect(lambda *_: unsubscribe())
+
         # Apply saved theme
         current_theme = self.settings.value("theme", "System")
         self.apply_theme(current_theme)
@@ -417,7 +611,8 @@ class MainWindow(QMainWindow):
     def on_logout(self):
         confirm = QMessageBox.question(self, 'Logout', 'Logout and switch user?')
         if confirm == QMessageBox.StandardButton.Yes:
-            logout_user()
+            logout_user(self.settings.value("auth_token", ""))
+            self.settings.remove("auth_token")
             self.update_user_ui()
             # prompt for login again
             dlg = LoginDialog(self)
@@ -458,6 +653,7 @@ class MainWindow(QMainWindow):
         if dlg.exec() == QDialog.DialogCode.Accepted:
             self.update_user_ui()
             self.refresh_all()
+            self.check_goals()
 
     def setup_system_tray(self):
         # Create the tray icon
@@ -493,6 +689,21 @@ class MainWindow(QMainWindow):
         self.tray_icon.activated.connect(self.on_tray_activated)
         self.tray_icon.show()
 
+    def _on_goals_changed(self, events):
+        names = entity_name_map()
+        for e in events:
+            if e.completed and e.goal.entityId in names:
+                window = f" per {e.goal.period}" if e.goal.period else ""
+                self.tray_icon.showMessage(
+                    "Goal reached", f"{names[e.goal.entityId]}: {e.goal.name} ({e.goal.targetHours}h{window})",
+                    QSystemTrayIcon.MessageIcon.Information, 5000)
+        if self.goals_entity_combo.currentData() in {e.goal.entityId for e in events}:
+            self.load_goals()
+
+    def check_goals(self):
+        """Re-evaluate goal statuses off-thread: after login and when a new day begins."""
+        self.tasks.submit('goal-check', evaluate_goals)
+
     def on_tray_activated(self, reason):
         if reason == QSystemTrayIcon.ActivationReason.Trigger:
             if self.isVisible():
@@ -502,51 +713,62 @@ class MainWindow(QMainWindow):
                 self.activateWindow()
 
     def update_tray_menu(self):
-        # Clear existing dynamic timer actions
-        # We'll recreate the menu structure to keep it simple
+        """Rebuild the tray menu's timer entries; only needed when self.started changes."""
+        for action in self._tray_timer_actions.values():
+            action[0].deleteLater()
         self.tray_menu.clear()
         self.tray_menu.addAction(self.restore_action)
         self.tray_menu.addSeparator()
-        
-        now = datetime.now()
-        active_found = False
-        if hasattr(self, 'started') and self.started:
-            for s in self.started:
-                # find entity name
-                entity = next((e for e in self.entities if e.id == s.entityId), None)
-                if entity:
-                    active_found = True
-                    elapsed = int((now - s.startTime).total_seconds())
-                    h = elapsed // 3600
-                    m = (elapsed % 3600) // 60
-                    sec = elapsed % 60
-                    timer_text = f"● {entity.name}: {h:02d}:{m:02d}:{sec:02d}"
-                    timer_action = QAction(timer_text, self)
-                    # Clicking a timer action could restore the window
-                    timer_action.triggered.connect(self.showNormal)
-                    timer_action.triggered.connect(self.activateWindow)
-                    self.tray_menu.addAction(timer_action)
-        
-        if not active_found:
+
+        self._tray_timer_actions = {}
+        for s in self.started:
+            entity = get_entity(s.entityId)
+            if entity:
+                timer_action = QAction(self)
+                # Clicking a timer action could restore the window
+                timer_action.triggered.connect(self.showNormal)
+                timer_action.triggered.connect(self.activateWindow)
+                self.tray_menu.addAction(timer_action)
+                self._tray_timer_actions[s.entityId] = (timer_action, entity.name, s)
+
+        if not self._tray_timer_actions:
             no_timers_action = QAction("No running timers", self)
             no_timers_action.setEnabled(False)
             self.tray_menu.addAction(no_timers_action)
-            self.tray_icon.setToolTip("SkillTrack: No running timers")
-        else:
-            # Build tooltip string for running timers
-            tooltips = ["SkillTrack: Running Timers"]
-            for s in self.started:
-                entity = next((e for e in self.entities if e.id == s.entityId), None)
-                if entity:
-                    elapsed = int((now - s.startTime).total_seconds())
-                    h = elapsed // 3600
-                    m = (elapsed % 3600) // 60
-                    sec = elapsed % 60
-                    tooltips.append(f"• {entity.name}: {h:02d}:{m:02d}:{sec:02d}")
-            self.tray_icon.setToolTip("\n".join(tooltips))
-            
+
         self.tray_menu.addSeparator()
         self.tray_menu.addAction(self.quit_action)
+        self.update_tray_timers(datetime.now())
+
+    def update_tray_timers(self, now):
+        """Refresh the elapsed time shown by the tray menu entries and tooltip."""
+        if not self._tray_timer_actions:
+            self.tray_icon.setToolTip("SkillTrack: No running timers")
+            return
+        tooltips = ["SkillTrack: Running Timers"]
+        for action, name, s in self._tray_timer_actions.values():
+            elapsed = _format_elapsed(now - s.startTime)
+            action.setText(f"● {name}: {elapsed}")
+            tooltips.append(f"• {name}: {elapsed}")
+        self.tray_icon.setToolTip("\n".join(tooltips))
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        if not self.ui_timer.isActive():
+            # The tick was suspended, so changes made elsewhere went unnoticed
+            self.reload_started()
+
+    def hideEvent(self, event):
+        super().hideEvent(event)
+        self._update_tick_state()
+
+    def _update_tick_state(self):
+        # Nothing needs a tick while hidden with no running timer
+        if self.isVisible() or self.started:
+            if not self.ui_timer.isActive():
+                self.ui_timer.start(1000)
+        else:
+            self.ui_timer.stop()
 
     def closeEvent(self, event):
         # Save window geometry
@@ -591,15 +813,32 @@ class MainWindow(QMainWindow):
         self.settings_btn.setIcon(self.style().standardIcon(QStyle.StandardPixmap.SP_FileDialogDetailedView))
         self.settings_btn.clicked.connect(self.open_settings)
         
+        # optional start-date range, applied in SQL
+        self.sessions_date_check = QCheckBox('From')
+        self.sessions_from_edit = QDateEdit(QDate.currentDate().addMonths(-1))
+        self.sessions_to_edit = QDateEdit(QDate.currentDate())
+        for edit in (self.sessions_from_edit, self.sessions_to_edit):
+            edit.setCalendarPopup(True)
+            edit.setEnabled(False)
+            edit.dateChanged.connect(self.load_sessions)
+        self.sessions_date_check.toggled.connect(self.sessions_from_edit.setEnabled)
+        self.sessions_date_check.toggled.connect(self.sessions_to_edit.setEnabled)
+        self.sessions_date_check.toggled.connect(self.load_sessions)
+
         top.addWidget(self.sessions_entity_combo)
+        top.addWidget(self.sessions_date_check)
+        top.addWidget(self.sessions_from_edit)
+        top.addWidget(QLabel('to'))
+        top.addWidget(self.sessions_to_edit)
         top.addWidget(self.sessions_refresh_btn)
         top.addWidget(self.settings_btn)
         layout.addLayout(top)
 
-        # sessions list
-        self.sessions_list = QListWidget()
-        self.sessions_list.itemDoubleClicked.connect(self.show_session_details)
-        layout.addWidget(self.sessions_list)
+        # sessions table, paged in from the database as it scrolls
+        self.sessions_model = SessionTableModel(self.tasks, 'sessions', self)
+        self.sessions_view = _session_table(self.sessions_model)
+        self.sessions_view.doubleClicked.connect(self.show_session_details)
+        layout.addWidget(self.sessions_view)
 
         # Compact bottom row for session actions
         bottom_row = QHBoxLayout()
@@ -621,6 +860,11 @@ class MainWindow(QMainWindow):
         self.delete_session_btn.setFixedWidth(80)
         self.delete_session_btn.clicked.connect(self.on_delete_session)
 
+        self.export_sessions_btn = QPushButton("Export")
+        self.export_sessions_btn.setToolTip("Export the listed sessions to CSV or JSON Lines")
+        self.export_sessions_btn.setFixedWidth(80)
+        self.export_sessions_btn.clicked.connect(self.on_export_sessions)
+
         self.trash_btn = QPushButton("Trash")
         self.trash_btn.setIcon(self.style().standardIcon(QStyle.StandardPixmap.SP_TrashIcon))
         self.trash_btn.setToolTip("View deleted sessions")
@@ -629,6 +873,7 @@ class MainWindow(QMainWindow):
         
         bottom_row.addWidget(self.edit_session_btn)
         bottom_row.addWidget(self.delete_session_btn)
+        bottom_row.addWidget(self.export_sessions_btn)
         bottom_row.addWidget(self.trash_btn)
         layout.addLayout(bottom_row)
 
@@ -695,21 +940,47 @@ class MainWindow(QMainWindow):
 
         self.report_tab.setLayout(layout)
 
+    def _on_task_busy(self, key, busy):
+        tab = self._task_tabs.get(key)
+        if tab is None:
+            return
+        title = self._tab_titles[tab]
+        self.tabs.setTabText(self.tabs.indexOf(tab), f"{title} …" if busy else title)
+
     def refresh_all(self):
-        self.load_entities()
-        self.load_timers()
+        """Reload every tab; the queries run on the worker pool."""
+        self.tasks.submit('entities', get_entities, on_result=self._on_entities_loaded,
+                          on_error=lambda ex: self._on_entities_loaded([]))
+
+    def _on_entities_loaded(self, entities):
+        self.load_entities(entities)
+        self.reload_started()
         self.load_sessions()
         self.load_reports()
         self.load_goals()
 
-    def load_entities(self):
-        try:
-            self.entities = get_entities()
-        except Exception:
-            self.entities = []
+    def load_entities(self, entities=None):
+        if entities is None:
+            try:
+                entities = get_entities()
+            except Exception:
+                entities = []
+        self.entities = entities
         
         self.entity_list.clear()
-        
+        # Repopulating the filter combos would fire currentIndexChanged (and a
+        # query) once per clear/add; _on_entities_loaded reloads each tab once
+        combos = [getattr(self, name) for name in ('entity_filter_combo', 'sessions_entity_combo', 'goals_entity_combo')
+                  if hasattr(self, name)]
+        for combo in combos:
+            combo.blockSignals(True)
+        try:
+            self._fill_entity_widgets()
+        finally:
+            for combo in combos:
+                combo.blockSignals(False)
+
+    def _fill_entity_widgets(self):
         # 1. Reports tab filter
         self.entity_filter_combo.clear()
         self.entity_filter_combo.addItem('-- All Entities --', userData=None)
@@ -780,17 +1051,57 @@ class MainWindow(QMainWindow):
             else:
                 QMessageBox.warning(self, "Error", "Failed to update entity")
 
-    def load_timers(self):
-        # Load started sessions to determine active timers
+    # Poll PRAGMA data_version every few ticks to pick up timers started or
+    # stopped by another process (e.g. the CLI)
+    DB_CHECK_TICKS = 5
+
+    def reload_started(self):
+        """Re-read running sessions off-thread, then rebuild the timer rows and tray entries."""
+        # data_version is per connection, so read it here on the GUI thread's
+        # connection (before the query, so no change can slip in between)
         try:
-            self.started = get_started_sessions()
+            self._data_version = get_data_version()
         except Exception:
-            self.started = []
+            self._data_version = None
+        self.tasks.submit('timers', get_started_sessions, on_result=self._on_started_loaded,
+                          on_error=lambda ex: self._on_started_loaded([]))
 
+    def _on_started_loaded(self, started):
+        self.started = started
+        self.load_timers()
+        self._update_tick_state()
+
+    def tick_timers(self):
+        """1 s tick: update elapsed-time labels and the tray, nothing else."""
+        self._ticks += 1
+        if date.today() != self._goal_day:
+            # a new day (and maybe week or month) reopens windowed goals
+            self._goal_day = date.today()
+            self.check_goals()
+            self.load_goals()
+        if self._ticks % self.DB_CHECK_TICKS == 0:
+            try:
+                version = get_data_version()
+            except Exception:
+                version = self._data_version
+            if version != self._data_version:
+                self.reload_started()
+                return
+        now = datetime.now()
+        for s in self.started:
+            label = self._timer_labels.get(s.entityId)
+            if label is not None:
+                label.setText(_elapsed_html(s.startTime, now))
+        self.update_tray_timers(now)
+
+    def load_timers(self):
+        """Rebuild the Timers tab rows from self.started (no database access)."""
         self.timer_list.clear()
+        self._timer_labels = {}
         now = datetime.now()
+        started_by_entity = {s.entityId: s for s in self.started}
         # show running entities first
-        entities_sorted = sorted(self.entities, key=lambda ee: any(s.entityId == ee.id for s in self.started), reverse=True)
+        entities_sorted = sorted(self.entities, key=lambda ee: ee.id in started_by_entity, reverse=True)
         for e in entities_sorted:
             item = QListWidgetItem()
             widget = QWidget()
@@ -803,20 +1114,16 @@ class MainWindow(QMainWindow):
 
             btn = QPushButton()
             style = QApplication.style()
-            active = next((s for s in self.started if s.entityId == e.id), None)
+            active = started_by_entity.get(e.id)
             if active and active.startTime:
                 btn.setText('Stop')
                 btn.setObjectName('stopBtn')
                 stop_icon = style.standardIcon(QStyle.StandardPixmap.SP_MediaStop)
                 btn.setIcon(stop_icon)
                 btn.setToolTip('Stop timer')
-                elapsed_seconds = int((now - active.startTime).total_seconds())
-                h_s = elapsed_seconds // 3600
-                m_s = (elapsed_seconds % 3600) // 60
-                s_s = elapsed_seconds % 60
-                start_str = active.startTime.strftime('%#m/%#d/%y %#I:%M:%S %p').lower()
-                elapsed_label.setText(f"<span style='font-size: 9px; font-weight: normal;'>{start_str}</span> | <span style='font-size: 13px; font-weight: bold;'>{h_s:02d}:{m_s:02d}:{s_s:02d}</span>")
+                elapsed_label.setText(_elapsed_html(active.startTime, now))
                 elapsed_label.setStyleSheet('') # Use rich text for styling
+                self._timer_labels[e.id] = elapsed_label
             else:
                 btn.setText('Start')
                 btn.setObjectName('startBtn')
@@ -841,7 +1148,7 @@ class MainWindow(QMainWindow):
         self.update_tray_menu()
 
     def toggle_timer(self, entity_id):
-        entity = next((x for x in self.entities if x.id == entity_id), None)
+        entity = get_entity(entity_id)
         if not entity:
             QMessageBox.warning(self, "Error", "Entity not found")
             return
@@ -867,57 +1174,55 @@ class MainWindow(QMainWindow):
         dlg = TrashBinDialog(self.entities, self)
         dlg.exec()
 
+    def _session_filters(self):
+        """(entity id, start, end) selected above the sessions table."""
+        ent_id = self.sessions_entity_combo.currentData()
+        start = end = None
+        if self.sessions_date_check.isChecked():
+            start = self.sessions_from_edit.date().toPyDate()
+            end = self.sessions_to_edit.date().toPyDate() + timedelta(days=1)
+            start = datetime(start.year, start.month, start.day)
+            end = datetime(end.year, end.month, end.day)
+        return ent_id, start, end
+
     def load_sessions(self):
-        """Load and display completed sessions filtered by entity."""
-        try:
-            completed = get_completed_sessions(include_deleted=False)
-        except Exception:
-            completed = []
+        """Reset the sessions table to the current entity and date filters."""
+        self.sessions_model.reset(*self._session_filters())
 
-        # sort by startTime descending
-        sessions = sorted(completed, key=lambda s: s.startTime, reverse=True)
+    def on_export_sessions(self):
+        fname, _ = QFileDialog.getSaveFileName(self, 'Export Sessions',
+                                               filter='CSV Files (*.csv);;JSON Lines (*.jsonl)')
+        if not fname:
+            return
+        # streamed straight from the database on the worker pool
+        self.export_sessions_btn.setEnabled(False)
+        self.tasks.submit('export', export_sessions, fname, *self._session_filters(),
+                          on_result=lambda rows: self._on_sessions_exported(f'{rows} sessions saved to {fname}'),
+                          on_error=lambda ex: self._on_sessions_exported(f'Failed to export sessions: {ex}'))
 
-        # filter
-        ent_id = None
-        if hasattr(self, 'sessions_entity_combo'):
-            ent_id = self.sessions_entity_combo.currentData()
-
-        self.sessions_list.clear()
-        for s in sessions:
-            if ent_id is not None and s.entityId != ent_id:
-                continue
-            ent = next((e for e in self.entities if e.id == s.entityId), None)
-            name = ent.name if ent else f"Entity {s.entityId}"
-            start_str = s.startTime.strftime('%Y-%m-%d %H:%M:%S')
-            end_str = s.endTime.strftime('%Y-%m-%d %H:%M:%S') if s.endTime else 'N/A'
-            dur = int((s.endTime - s.startTime).total_seconds()) if s.endTime else 0
-            h = dur // 3600
-            m = (dur % 3600) // 60
-            sec = dur % 60
-            dur_str = f"{h}h {m}m {sec}s"
-
-            text = f"[{s.id}] {name} — Start: {start_str} — End: {end_str} — {dur_str}"
-            item = QListWidgetItem(text)
-            item.setData(Qt.ItemDataRole.UserRole, s)
-            self.sessions_list.addItem(item)
+    def _on_sessions_exported(self, message):
+        self.export_sessions_btn.setEnabled(True)
+        QMessageBox.information(self, 'Export', message)
+
+    def _selected_session(self):
+        rows = self.sessions_view.selectionModel().selectedRows()
+        return self.sessions_model.session(rows[0].row()) if rows else None
 
     def on_delete_session(self):
-        curr = self.sessions_list.currentItem()
-        if not curr:
+        s = self._selected_session()
+        if not s:
             QMessageBox.warning(self, "Select Session", "Please select a session to delete.")
             return
-        s = curr.data(Qt.ItemDataRole.UserRole)
         confirm = QMessageBox.question(self, "Confirm Delete", f"Are you sure you want to delete session {s.id}?")
         if confirm == QMessageBox.StandardButton.Yes:
             delete_session(s.id)
             self.load_sessions()
 
     def on_edit_session(self):
-        item = self.sessions_list.currentItem()
-        if not item:
+        s = self._selected_session()
+        if not s:
             QMessageBox.warning(self, "Select Session", "Please select a session to edit.")
             return
-        s = item.data(Qt.ItemDataRole.UserRole)
         dlg = ManualSessionDialog(self.entities, self, session=s)
         if dlg.exec() == QDialog.DialogCode.Accepted:
             eid, start, end = dlg.get_data()
@@ -928,9 +1233,11 @@ class MainWindow(QMainWindow):
             QMessageBox.information(self, "Success", "Session updated.")
             self.load_sessions()
 
-    def show_session_details(self, item):
-        s = item.data(Qt.ItemDataRole.UserRole)
-        ent = next((e for e in self.entities if e.id == s.entityId), None)
+    def show_session_details(self, index):
+        s = self.sessions_model.session(index.row())
+        if s is None:
+            return
+        ent = get_entity(s.entityId)
         name = ent.name if ent else f"Entity {s.entityId}"
         msg = f"ID: {s.id}\nEntity: {name}\nStart: {s.startTime}\nEnd: {s.endTime or 'N/A'}"
         QMessageBox.information(self, 'Session Details', msg)
@@ -951,16 +1258,20 @@ class MainWindow(QMainWindow):
             return
 
         if not self.entities:
+            self.tasks.cancel('reports')
             self.report_out.setHtml('<i>No entities found</i>')
             return
 
         ent_id = self.entity_filter_combo.currentData()
+        selected = [e for e in self.entities if ent_id is None or e.id == ent_id]
+        self.tasks.submit('reports', generate_reports, [e.id for e in selected], start, end,
+                          on_result=lambda reports: self._show_reports(selected, start, end, reports),
+                          on_error=lambda ex: self.report_out.setHtml(f'<i>Failed to load report: {ex}</i>'))
+
+    def _show_reports(self, selected, start, end, reports):
         cards = []
-        for e in self.entities:
-            if ent_id is not None and e.id != ent_id:
-                continue
-            report = generate_report(e, start, end)
-            h, m, s = report.totalTimeSpent
+        for e in selected:
+            h, m, s = reports[e.id].totalTimeSpent
             card = f"""
             <div style='background:#fff;padding:8px;border-radius:6px;margin:6px 0;border:1px solid #e0e0e0;'>
               <div style='font-weight:bold;color:#333;'>{e.name}</div>
@@ -972,7 +1283,6 @@ class MainWindow(QMainWindow):
 
         html = "<div style='background:#f6f8fa;padding:8px;'>" + "".join(cards) + "</div>"
         self.report_out.setHtml(html)
-        return
 
     def open_full_report(self):
         """Open the Full Report dialog with current filters pre-filled."""
@@ -1011,7 +1321,7 @@ class MainWindow(QMainWindow):
         self.goals_list = QListWidget()
         layout.addWidget(self.goals_list)
         
-        note = QLabel("Progress is calculated based on total time spent for the entity.")
+        note = QLabel("Progress counts completed sessions: all of them, or those of the current day, week or month.")
         note.setStyleSheet("color:#666; font-size:11px;")
         layout.addWidget(note)
         
@@ -1019,31 +1329,29 @@ class MainWindow(QMainWindow):
 
     def load_goals(self):
         ent_id = self.goals_entity_combo.currentData()
-        self.goals_list.clear()
         if ent_id is None:
+            self.tasks.cancel('goals')
+            self.goals_list.clear()
             return
-        
-        goals = get_goals(ent_id)
-        # We need total time spent for this entity to show progress
-        sessions = get_completed_sessions()
-        ent_sessions = [s for s in sessions if s.entityId == ent_id]
-        h, m, s_total = calculateTotalTime(ent_sessions)
-        spent_hours = h + m/60.0 + s_total/3600.0
-        
-        for g in goals:
+        # one aggregate query over the daily rollups, cached until the next commit
+        self.tasks.submit('goals', lambda: get_goal_progress(ent_id), on_result=self._show_goals)
+
+    def _show_goals(self, progress):
+        self.goals_list.clear()
+        phrases = {period: phrase for _, period, phrase in GOAL_PERIOD_CHOICES}
+        for p in progress:
+            g = p.goal
             item = QListWidgetItem()
             widget = QWidget()
             h_layout = QHBoxLayout()
             
             status_color = "#2ecc71" if g.status == "Completed" else "#f1c40f"
             name_lbl = QLabel(f"<b>{g.name}</b>")
-            target_lbl = QLabel(f"{g.targetHours}h target")
+            target_lbl = QLabel(f"{g.targetHours}h target" + (f" per {g.period}" if g.period else ""))
             status_lbl = QLabel(g.status)
             status_lbl.setStyleSheet(f"color: {status_color}; font-weight: bold;")
             
-            progress = (spent_hours / g.targetHours * 100) if g.targetHours > 0 else 100
-            progress = min(progress, 100)
-            prog_lbl = QLabel(f"Progress: {progress:.1f}% ({spent_hours:.1f}h spent)")
+            prog_lbl = QLabel(f"Progress: {p.fraction * 100:.1f}% ({p.spent_hours:.1f}h {phrases.get(g.period, 'total')})")
             
             h_layout.addWidget(name_lbl)
             h_layout.addWidget(target_lbl)
@@ -1064,11 +1372,11 @@ class MainWindow(QMainWindow):
             return
         dlg = GoalDialog(self)
         if dlg.exec() == QDialog.DialogCode.Accepted:
-            name, target, _ = dlg.get_data()
+            name, target, period = dlg.get_data()
             if not name or target <= 0:
                 QMessageBox.warning(self, "Validation", "Valid name and target hours (>0) required")
                 return
-            add_goal(ent_id, name, target)
+            add_goal(ent_id, name, target, period)
             self.load_goals()
 
     def edit_goal_ui(self):
@@ -1078,8 +1386,8 @@ class MainWindow(QMainWindow):
         g = item.data(Qt.ItemDataRole.UserRole)
         dlg = GoalDialog(self, goal=g)
         if dlg.exec() == QDialog.DialogCode.Accepted:
-            name, target, status = dlg.get_data()
-            update_goal(g.id, name, target, status)
+            name, target, period = dlg.get_data()
+            update_goal(g.id, name, target, period)
             self.load_goals()
 
     def delete_goal_ui(self):
@@ -1109,6 +1417,10 @@ class MainWindow(QMainWindow):
             theme = dlg.get_theme()
             self.settings.setValue("theme", theme)
             self.apply_theme(theme)
+            db_path = dlg.get_db_path()
+            if db_path != self.settings.value("db_path", ""):
+                self.settings.setValue("db_path", db_path)
+                QMessageBox.information(self, "Database", "The new database location is used after restarting SkillTrack.")
 
     def apply_theme(self, theme):
         if theme == "Dark":
@@ -1139,6 +1451,8 @@ class MainWindow(QMainWindow):
             self.setStyleSheet("")
 
     def sync_time(self):
+        import json
+        import urllib.request
         try:
             # Use WorldTimeAPI (may require internet)
             req = urllib.request.Request("http://worldtimeapi.org/api/ip", headers={'User-Agent': 'Mozilla/5.0'})
@@ -1153,6 +1467,43 @@ class MainWindow(QMainWindow):
         except Exception as e:
             QMessageBox.warning(self, "Sync Error", f"Failed to fetch time: {e}")
 
+# Periods per Full Report chunk; the window redraws after every chunk
+REPORT_CHUNK_PERIODS = {'day': 92, 'week': 26, 'month': 6}
+
+
+def _full_report_job(job, ids, first_day, last_day, agg):
+    """Build the Full Report matrix chunk by chunk (runs on the worker pool).
+
+    job.progress() receives (chunks_done, chunk_count, chunk_matrix) after each
+    chunk so the window can draw what has loaded so far.  Leading chunks
+    without data are reported as None and left out, so the graph still starts
+    at the first period with data, and it ends today at the latest.
+    """
+    import numpy as np
+    from skilltrack.reports import concat_matrices, period_chunks, period_matrix
+
+    graph_end = min(last_day, datetime.now().date())
+    chunks = period_chunks(first_day, graph_end, agg, REPORT_CHUNK_PERIODS[agg]) or [(first_day, graph_end)]
+    parts = []
+    for i, (lo, hi) in enumerate(chunks):
+        job.check()
+        # the last chunk also loads days past the graph end so totals cover the whole range
+        load_to = last_day if i == len(chunks) - 1 else hi
+        cols = get_daily_total_columns(ids, lo, load_to)
+        if not parts and len(cols['day']):
+            # first chunk with data: start the graph at its first day with data
+            lo = min(max(cols['day'].min().astype(object), lo), hi)
+        part = period_matrix(cols['entity_id'], cols['day'], cols['seconds'], ids, agg, lo, hi)
+        if parts or part.totals.any():
+            parts.append(part)
+        else:
+            part = None
+        job.progress((i + 1, len(chunks), part))
+    if parts:
+        return concat_matrices(parts)
+    return period_matrix([], np.array([], dtype='datetime64[D]'), [], ids, agg, first_day, graph_end)
+
+
 class FullReportWindow(QDialog):
     def __init__(self, parent=None, entities=None, start_date=None, end_date=None, aggregation='Day', entity_filter=None):
         super().__init__(parent)
@@ -1201,9 +1552,18 @@ class FullReportWindow(QDialog):
         self.export_csv_btn.clicked.connect(self.export_csv)
         self.export_png_btn = QPushButton('Export PNG')
         self.export_png_btn.clicked.connect(self.export_png)
+        self.cancel_btn = QPushButton('Cancel')
+        self.cancel_btn.setEnabled(False)
+        self.cancel_btn.clicked.connect(self.cancel_generate)
         self.close_btn = QPushButton('Close')
         self.close_btn.clicked.connect(self.accept) 
 
+        # changing any input makes an in-flight report stale
+        self.start_date_edit.dateChanged.connect(self.cancel_generate)
+        self.end_date_edit.dateChanged.connect(self.cancel_generate)
+        self.aggregation_combo.currentIndexChanged.connect(self.cancel_generate)
+        self.entity_filter_combo.currentIndexChanged.connect(self.cancel_generate)
+
         # small calendar icons for date edits
         # Calendar emoji labels in Full Report dialog
         start_icon_lbl = QLabel('📅')
@@ -1227,6 +1587,7 @@ class FullReportWindow(QDialog):
         controls.addWidget(self.plot_mode_combo)
         controls.addWidget(self.entity_filter_combo)
         controls.addWidget(self.generate_btn)
+        controls.addWidget(self.cancel_btn)
         controls.addWidget(self.export_csv_btn)
         controls.addWidget(self.export_png_btn)
         controls.addWidget(self.close_btn)
@@ -1236,17 +1597,28 @@ class FullReportWindow(QDialog):
         # Keep the report summary compact so the canvas can take most space
         self.report_out.setMaximumHeight(160)
 
+        self.progress_bar = QProgressBar(self)
+        self.progress_bar.setVisible(False)
+        self.status_lbl = QLabel('')
+        self.status_lbl.setStyleSheet('color:#888;font-size:11px;')
+        progress_row = QHBoxLayout()
+        progress_row.addWidget(self.progress_bar)
+        progress_row.addWidget(self.status_lbl)
+        progress_row.addStretch()
+
         layout.addLayout(controls)
+        layout.addLayout(progress_row)
         layout.addWidget(self.report_out)
 
         # Plot area: prefer pyqtgraph for interactivity, fallback to matplotlib
+        _load_plotting()
         if PYQTGRAPH_AVAILABLE:
             self.plot_widget = pg.PlotWidget()
             self.plot_widget.setMinimumHeight(240)
             self.plot_widget.setBackground('w')
             layout.addWidget(self.plot_widget)
-            layout.setStretch(1, 0)
-            layout.setStretch(2, 1)
+            layout.setStretch(2, 0)
+            layout.setStretch(3, 1)
         elif MATPLOTLIB_AVAILABLE:
             self.canvas = FigureCanvas(Figure(figsize=(6, 3)))
             self.ax = self.canvas.figure.subplots()
@@ -1255,8 +1627,8 @@ class FullReportWindow(QDialog):
             self.canvas.setMinimumHeight(240)
             layout.addWidget(self.canvas)
             # Give canvas the larger stretch so it expands when resizing
-            layout.setStretch(1, 0)  # index 1 = report_out
-            layout.setStretch(2, 1)  # index 2 = canvas
+            layout.setStretch(2, 0)  # index 2 = report_out
+            layout.setStretch(3, 1)  # index 3 = canvas
             # ensure the matplotlib figure respects the canvas size
             self.canvas.figure.set_constrained_layout(True)
         else:
@@ -1264,48 +1636,42 @@ class FullReportWindow(QDialog):
             note.setStyleSheet('color:#888;font-size:11px;')
             layout.addWidget(note) 
 
-        # storage for last generated plot data (periods, labels, per_entity_agg)
-        self._current_periods = []
-        self._current_labels = []
-        self._current_per_entity_agg = {}
+        # last generated period x entity matrix, shared by the plot and exports
+        self._matrix = None
+        self._matrix_range = None
+        self._parts = []
+        self.tasks = TaskRunner(self)
+        self.tasks.busyChanged.connect(self._on_busy)
 
         self.setLayout(layout)
 
     def export_csv(self):
-        if not self._current_periods or not self._current_per_entity_agg:
+        if self._matrix is None or not len(self._matrix.periods):
             QMessageBox.warning(self, 'No data', 'Generate a report before exporting')
             return
-        fname, _ = QFileDialog.getSaveFileName(self, 'Save CSV', filter='CSV Files (*.csv)')
+        fname, _ = QFileDialog.getSaveFileName(self, 'Save CSV', filter='CSV Files (*.csv);;JSON Lines (*.jsonl)')
         if not fname:
             return
-        try:
-            import csv as _csv
-            # header: Period, EntityName1, EntityName2...
-            entities = [e for e in self.entities if e.id in self._current_per_entity_agg]
-            mode = self.plot_mode_combo.currentText().lower() if hasattr(self, 'plot_mode_combo') else 'cumulative'
-            with open(fname, 'w', newline='', encoding='utf-8') as f:
-                writer = _csv.writer(f)
-                header = ['Period'] + [e.name for e in entities]
-                writer.writerow(header)
-                for idx, p in enumerate(self._current_periods):
-                    row = [str(p)]
-                    for e in entities:
-                        ent_map = self._current_per_entity_agg.get(e.id, {})
-                        seconds = ent_map.get(p, 0)
-                        per_hours = seconds/3600.0
-                        if mode == 'cumulative':
-                            # cumulative up to this period
-                            prev = sum(ent_map.get(pp, 0) for pp in self._current_periods[:idx+1]) / 3600.0
-                            row.append(f"{prev:.3f}")
-                        else:
-                            row.append(f"{per_hours:.3f}")
-                    writer.writerow(row)
-            QMessageBox.information(self, 'Saved', f'CSV saved to {fname}')
-        except Exception as ex:
-            QMessageBox.warning(self, 'Error', f'Failed to save CSV: {ex}')
+        ids, first_day, last_day, agg = self._matrix_range
+        names = {e.id: e.name for e in self.entities}
+        mode = self.plot_mode_combo.currentText().lower() if hasattr(self, 'plot_mode_combo') else 'cumulative'
+        # streamed from the rollups in the worker: Period, EntityName1, EntityName2...
+        self.export_csv_btn.setEnabled(False)
+        self.tasks.submit('export', export_report, fname, ids, first_day, last_day, agg,
+                          names=names, wide=True, cumulative=(mode == 'cumulative'), skip_leading_empty=True,
+                          on_result=lambda _: self._on_exported(f'CSV saved to {fname}'),
+                          on_error=self._on_export_failed)
+
+    def _on_exported(self, message):
+        self.export_csv_btn.setEnabled(True)
+        QMessageBox.information(self, 'Saved', message)
+
+    def _on_export_failed(self, error):
+        self.export_csv_btn.setEnabled(True)
+        QMessageBox.warning(self, 'Error', f'Failed to save CSV: {error}')
 
     def export_png(self):
-        if not self._current_periods or not self._current_per_entity_agg:
+        if self._matrix is None or not len(self._matrix.periods):
             QMessageBox.warning(self, 'No data', 'Generate a report before exporting')
             return
         fname, _ = QFileDialog.getSaveFileName(self, 'Save PNG', filter='PNG Files (*.png)')
@@ -1341,20 +1707,45 @@ class FullReportWindow(QDialog):
 
         ent_id = self.entity_filter_combo.currentData()
         agg = self.aggregation_combo.currentText().lower()
-
+        selected = [e for e in self.entities if ent_id is None or e.id == ent_id]
+
+        # Load and bucket off-thread in chunks; a newer Generate supersedes this one
+        self._matrix = None
+        self._parts = []
+        self.report_out.setHtml('<i>Loading…</i>')
+        self.status_lbl.setText('')
+        self.progress_bar.setRange(0, 0)
+        self.tasks.submit_job('generate', _full_report_job, [e.id for e in selected], start.date(), end.date(), agg,
+                              on_progress=lambda p: self._on_report_progress(selected, start, end, agg, p),
+                              on_result=lambda matrix: self._show_matrix(selected, start, end, agg, matrix),
+                              on_error=lambda ex: self.report_out.setHtml(f'<i>Failed to generate report: {ex}</i>'))
+
+    def cancel_generate(self):
+        """Stop the running report, keeping whatever has been drawn so far."""
+        if self.tasks.is_busy('generate'):
+            self.tasks.cancel('generate')
+            self.status_lbl.setText('Cancelled')
+
+    def _on_busy(self, key, busy):
+        if key == 'generate':
+            self.cancel_btn.setEnabled(busy)
+            self.progress_bar.setVisible(busy)
+
+    def _on_report_progress(self, selected, start, end, agg, progress):
+        from skilltrack.reports import concat_matrices
+        done, total, part = progress
+        self.progress_bar.setRange(0, total)
+        self.progress_bar.setValue(done)
+        if part is not None:
+            self._parts.append(part)
+            self._show_matrix(selected, start, end, agg, concat_matrices(self._parts), partial=True)
+
+    def _show_matrix(self, selected, start, end, agg, matrix, partial=False):
         # Build summary cards
         cards = []
-        try:
-            sessions = get_completed_sessions()
-        except Exception:
-            sessions = []
-
-        per_entity_agg = {}
-        for e in self.entities:
-            if ent_id is not None and e.id != ent_id:
-                continue
-            report = generate_report(e, start, end)
-            h, m, s = report.totalTimeSpent
+        for e in selected:
+            h, rem = divmod(int(matrix.totals[matrix.column(e.id)]), 3600)
+            m, s = divmod(rem, 60)
             card = f"""
             <div style='background:#fff;padding:8px;border-radius:6px;margin:6px 0;border:1px solid #e0e0e0;'>
               <div style='font-weight:bold;color:#333;'>{e.name}</div>
@@ -1363,113 +1754,31 @@ class FullReportWindow(QDialog):
             </div>
             """
             cards.append(card)
-            # accumulate per-bucket
-            ent_map = {}
-            for s_obj in sessions:
-                if s_obj.endTime is None:
-                    continue
-                if s_obj.entityId != e.id:
-                    continue
-                if not (s_obj.startTime >= start and s_obj.endTime <= end):
-                    continue
-                d = s_obj.startTime.date()
-                if agg == 'day':
-                    key = d
-                elif agg == 'week':
-                    key = d - timedelta(days=d.weekday())
-                else:
-                    key = d.replace(day=1)
-                ent_map[key] = ent_map.get(key, 0) + (s_obj.endTime - s_obj.startTime).total_seconds()
-            per_entity_agg[e.id] = ent_map
 
         html = "<div style='background:#f6f8fa;padding:8px;'>" + "".join(cards) + "</div>"
         self.report_out.setHtml(html)
 
-        # Build periods and labels (common for both backends)
-        # Refine start/end dates for the graph:
-        # 1. Start from the earliest session date found
-        # 2. End at current date (today)
-        
-        # Find earliest session date from all included entities in this range
-        earliest_session_date = None
-        for e_id, ent_map in per_entity_agg.items():
-            if ent_map:
-                min_d = min(ent_map.keys())
-                if earliest_session_date is None or min_d < earliest_session_date:
-                    earliest_session_date = min_d
-        
-        # fallback to the user selected start if no sessions or if earliest is after start
-        graph_start = earliest_session_date if earliest_session_date else start.date()
-        # Clip graph start to the range selected by the user
-        if graph_start < start.date():
-             graph_start = start.date()
-             
-        # Clip end date to today
-        today = datetime.now().date()
-        graph_end = min(end.date(), today)
-        
-        # if range is inverted after clipping, just use start/end as fallback
-        if graph_start > graph_end:
-            graph_start = start.date()
-            graph_end = min(end.date(), today)
-
-        periods = []
-        labels = []
-        cur = graph_start
-        if agg == 'day':
-            while cur <= graph_end:
-                periods.append(cur)
-                labels.append(cur.strftime('%m-%d'))
-                cur = cur + timedelta(days=1)
-        elif agg == 'week':
-            cur = cur - timedelta(days=cur.weekday())
-            while cur <= graph_end:
-                periods.append(cur)
-                labels.append(cur.strftime('%Y-%m-%d'))
-                cur = cur + timedelta(days=7)
-        else:
-            cur = cur.replace(day=1)
-            while cur <= graph_end:
-                periods.append(cur)
-                labels.append(cur.strftime('%Y-%m'))
-                year = cur.year + (cur.month // 12)
-                month = cur.month % 12 + 1
-                cur = cur.replace(year=year, month=month, day=1)
-
-        # store current plot data for export
-        self._current_periods = periods
-        self._current_labels = labels
-        self._current_per_entity_agg = per_entity_agg
-
-        # Compute series for plotting (values per period and cumulative hours)
+        # store the finished matrix (and what it covers) for export
+        if not partial:
+            self._matrix = matrix
+            graph_end = min(end.date(), datetime.now().date())
+            self._matrix_range = ([e.id for e in selected], start.date(), graph_end, agg)
+        labels = matrix.labels()
+
+        # Series for plotting, one column of the matrix per entity
+        per_hours_all = matrix.hours
+        cum_all = matrix.cumulative_hours
         series_data = {}
-        max_value = 0.0
-        for e in self.entities:
-            if ent_id is not None and e.id != ent_id:
-                continue
-            ent_map = per_entity_agg.get(e.id, {})
-            values = [ent_map.get(p, 0) for p in periods]  # seconds per period
-            per_hours = [v / 3600.0 for v in values]
-            cum = []
-            total = 0.0
-            for h in per_hours:
-                total += h
-                cum.append(total)
+        for e in selected:
+            col = matrix.column(e.id)
             series_data[e.id] = {
                 'name': e.name,
-                'values_seconds': values,
-                'per_hours': per_hours,
-                'cum': cum
+                'per_hours': per_hours_all[:, col].tolist(),
+                'cum': cum_all[:, col].tolist(),
             }
-            if per_hours:
-                max_value = max(max_value, max(per_hours))
-            if cum:
-                max_value = max(max_value, max(cum))
-
-        # Debug: print series summary to console to help trace issues
-        print('Plot periods:', labels)
-        for sid, data in series_data.items():
-            print(f"Entity {sid} ({data['name']}): per_hours={data['per_hours']}, cum={data['cum']}")
+        max_value = 0.0
+        if per_hours_all.size:
+            max_value = max(float(per_hours_all.max()), float(cum_all.max()))
 
         # Plot using pyqtgraph if available, otherwise matplotlib
         if PYQTGRAPH_AVAILABLE:
@@ -1539,7 +1848,7 @@ class FullReportWindow(QDialog):
             except Exception as ex:
                 print('matplotlib plotting error:', ex)
                 QMessageBox.warning(self, 'Plot Error', f'Failed to render matplotlib plot: {ex}')
-        else:
+        elif not partial:
             QMessageBox.information(self, 'Matplotlib missing', 'Install matplotlib or pyqtgraph to view graphs in the Full Report')
 
 if __name__ == "__main__":
@@ -1554,19 +1863,16 @@ if __name__ == "__main__":
         QTextEdit { background: #ffffff; border: none; padding: 6px; }
         QLabel { color: #333; }
     """)
-    # Check for auto-login file
-    authenticated = False
-    if os.path.exists("login.txt"):
-        try:
-            with open("login.txt", "r") as f:
-                line = f.readline().strip()
-                if ',' in line:
-                    u, p = line.split(',', 1)
-                    from skilltrack.controller import login_user
-                    if login_user(u, p):
-                        authenticated = True
-        except Exception:
-            pass
+    # Database location: SKILLTRACK_DB wins over the saved setting
+    saved_db = QSettings("SkillTrack", "SkillTrackGUI").value("db_path", "")
+    if saved_db and not os.environ.get(DB_ENV_VAR):
+        set_database(saved_db)
+
+    # Resume a remembered login: a token lookup, no password hashing
+    settings = QSettings("SkillTrack", "SkillTrackGUI")
+    authenticated = resume_login(settings.value("auth_token", ""))
+    if not authenticated:
+        settings.remove("auth_token")
 
     if not authenticated:
         # Prompt for login at startup
@@ -1577,6 +1883,11 @@ if __name__ == "__main__":
 
     win = MainWindow()
     win.show()
-    sys.exit(app.exec())
+    win.check_goals()
+    exit_code = app.exec()
+    # let in-flight background queries finish before closing their connections
+    task_pool().waitForDone()
+    shutdown()
+    sys.exit(exit_code)
         
     
\ No newline at end of file
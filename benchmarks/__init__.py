@@ -0,0 +1 @@
+# SkillTrack benchmarks (run with `python -m benchmarks.<module>` from the repo root)
@@ -0,0 +1,180 @@
+"""Timing and memory of the logic/controller API at several data sizes.
+
+    python -m benchmarks.bench_logic [--sizes small medium] [--repeat 5] [--db-dir DIR]
+                                     [--output results.json] [--compare old.json]
+
+For every size in workload.SIZES a fresh database is generated (in memory,
+or as a file under --db-dir to include disk I/O) and each case is run once
+to warm up, then `repeat` times for the median/min wall time, then once more
+under tracemalloc for the peak Python allocation.  Cases act as the first
+generated user, who is logged in through the controller.
+
+Results are printed and written as JSON (--output) together with the Python
+and SQLite versions and the git commit, so runs can be kept and compared;
+--compare prints the median ratio against an earlier results file.
+"""
+import argparse
+import gc
+import json
+import os
+import platform
+import sqlite3
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import logic  # noqa: E402
+import skilltrack.controller as controller  # noqa: E402
+from skilltrack import export, reports  # noqa: E402
+from benchmarks import workload  # noqa: E402
+
+
+def _full_report(ids, first_day, last_day, group_by):
+    # the Full Report job without Qt: load and bucket one chunk at a time
+    parts = []
+    for lo, hi in reports.period_chunks(first_day, last_day, group_by, 92 if group_by == 'day' else 26):
+        cols = controller.get_daily_total_columns(ids, lo, hi)
+        parts.append(reports.period_matrix(cols['entity_id'], cols['day'], cols['seconds'], ids, group_by, lo, hi))
+    return reports.concat_matrices(parts)
+
+
+def _start_and_stop(entity):
+    session = logic.startSession(entity)
+    logic.endSession(session)
+
+
+def cases(work):
+    """{name: zero-argument callable} for the first user of `work`."""
+    username = work.users[0]
+    ids = work.entities[username]
+    entity = logic.Entity(ids[0], '', '', '')
+    first = datetime.combine(work.first_day, datetime.min.time())
+    last = datetime.combine(work.last_day, datetime.max.time().replace(microsecond=0))
+    # a range that does not fall on day boundaries reads raw sessions
+    partial = (first + timedelta(hours=12), last - timedelta(hours=12))
+    recent = (datetime.combine(work.last_day - timedelta(days=29), datetime.min.time()), last)
+    return {
+        'loadSessionsFromFile': lambda: logic.loadSessionsFromFile(username=username),
+        'iter_sessions': lambda: sum(1 for _ in logic.iter_sessions(username=username)),
+        'loadSessionPage': lambda: logic.loadSessionPage(username=username),
+        'loadEntitiesFromFile': lambda: logic.loadEntitiesFromFile(username=username),
+        'loadGoalsFromFile': lambda: logic.loadGoalsFromFile(username=username),
+        # the aggregate behind goal_progress(), bypassing its cache
+        'goal_progress[uncached]': lambda: logic._compute_goal_progress(logic.get_db_connection(), username,
+                                                                        None, work.last_day),
+        'GenerateReport[rollup]': lambda: logic.GenerateReport(entity, first, last, username=username),
+        'GenerateReport[sessions]': lambda: logic.GenerateReport(entity, *partial, username=username),
+        'GenerateReports[week]': lambda: logic.GenerateReports(ids, first, last, username=username, group_by='week'),
+        'startSession+endSession': lambda: _start_and_stop(entity),
+        'controller.get_entities': controller.get_entities,
+        'controller.generate_reports[30d]': lambda: controller.generate_reports(ids, *recent),
+        'controller.get_session_columns': controller.get_session_columns,
+        'full_report[day]': lambda: _full_report(ids, work.first_day, work.last_day, 'day'),
+        'full_report[week]': lambda: _full_report(ids, work.first_day, work.last_day, 'week'),
+        'export_sessions': lambda: _export_to_devnull(username),
+        'rebuild_rollups[verify]': lambda: logic.rebuild_rollups(verify_only=True),
+    }
+
+
+def _export_to_devnull(username):
+    with open(os.devnull, 'w') as f:
+        return export.export_sessions(f, username)
+
+
+def measure(fn, repeat):
+    fn()  # warm up caches and prepared statements
+    times = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        times.append((time.perf_counter() - started) * 1000)
+    gc.collect()
+    tracemalloc.start()
+    fn()
+    _current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {
+        'median_ms': round(statistics.median(times), 3),
+        'min_ms': round(min(times), 3),
+        'peak_kib': round(peak / 1024, 1),
+    }
+
+
+def run_size(size, repeat, db_dir=None, seed=0):
+    path = os.path.join(db_dir, f"bench-{size}.db") if db_dir else logic.MEMORY_DB
+    if db_dir:
+        for suffix in ('', '-wal', '-shm'):
+            if os.path.exists(path + suffix):
+                os.remove(path + suffix)
+    controller.set_database(path)
+    try:
+        work = workload.generate(*workload.SIZES[size], seed=seed)
+        controller.login_user(work.users[0], workload.PASSWORD)
+        results = {name: measure(fn, repeat) for name, fn in cases(work).items()}
+        return {'workload': work.as_dict(), 'cases': results}
+    finally:
+        controller.logout_user()
+        controller.set_database(None)
+
+
+def _git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results, previous):
+    """Lines of 'size case: old -> new ms (ratio)' for cases present in both runs."""
+    lines = []
+    for size, run in results['sizes'].items():
+        old_cases = previous.get('sizes', {}).get(size, {}).get('cases', {})
+        for name, new in run['cases'].items():
+            if name in old_cases:
+                old = old_cases[name]['median_ms']
+                ratio = new['median_ms'] / old if old else float('inf')
+                lines.append(f"{size:7} {name:34} {old:10.3f} -> {new['median_ms']:10.3f} ms  x{ratio:.2f}")
+    return lines
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', nargs='+', choices=sorted(workload.SIZES), default=['small', 'medium'])
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--db-dir', help='generate file databases here instead of in memory')
+    parser.add_argument('--output', help='write the results JSON here')
+    parser.add_argument('--compare', help='earlier results JSON to compare against')
+    args = parser.parse_args(argv)
+
+    results = {
+        'meta': {
+            'timestamp': datetime.now().isoformat(timespec='seconds'),
+            'commit': _git_commit(),
+            'python': platform.python_version(),
+            'sqlite': sqlite3.sqlite_version,
+            'platform': platform.platform(),
+            'repeat': args.repeat,
+            'seed': args.seed,
+            'storage': 'file' if args.db_dir else 'memory',
+        },
+        'sizes': {size: run_size(size, args.repeat, args.db_dir, args.seed) for size in args.sizes},
+    }
+    print(json.dumps(results, indent=2))
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            print('\n'.join(compare(results, json.load(f))))
+
+
+if __name__ == '__main__':
+    main()
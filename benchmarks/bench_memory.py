@@ -0,0 +1,70 @@
+"""Bytes per in-memory Session, before and after __slots__.
+
+    python -m benchmarks.bench_memory [--count 1000000]
+
+"before" is a replica of the original dict-backed Session class; "after" is
+logic.Session.  Each run builds `count` sessions with distinct start/end
+datetimes (like loadSessionsFromFile does) and reports the traced allocation
+per session, both for the record alone and including its two datetimes.
+"""
+import argparse
+import gc
+import json
+import sys
+import os
+import tracemalloc
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from logic import Session  # noqa: E402
+
+
+class DictSession:
+    def __init__(self, id, startTime, endTime, entityId, is_deleted=0):
+        self.id = id
+        self.startTime = startTime
+        self.endTime = endTime
+        self.entityId = entityId
+        self.is_deleted = is_deleted
+
+
+def _measure(cls, count, start_times, end_times):
+    gc.collect()
+    tracemalloc.start()
+    base, _ = tracemalloc.get_traced_memory()
+    sessions = [cls(i, start_times[i], end_times[i], i % 16) for i in range(count)]
+    used, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del sessions
+    gc.collect()
+    return (used - base) / count
+
+
+def run(count):
+    origin = datetime(2024, 1, 1)
+    # datetimes are built outside the traced region; their cost is added below
+    start_times = [origin + timedelta(seconds=i * 60) for i in range(count)]
+    end_times = [t + timedelta(minutes=25) for t in start_times]
+    datetime_bytes = 2 * sys.getsizeof(origin)
+    results = {}
+    for label, cls in (('before', DictSession), ('after', Session)):
+        record = _measure(cls, count, start_times, end_times)
+        results[label] = {
+            'bytes_per_record': round(record, 1),
+            'bytes_per_session_with_datetimes': round(record + datetime_bytes, 1),
+        }
+    results['saving_pct'] = round(100.0 * (1 - results['after']['bytes_per_record'] / results['before']['bytes_per_record']), 1)
+    results['count'] = count
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--count', type=int, default=1000000)
+    args = parser.parse_args(argv)
+    print(json.dumps(run(args.count), indent=2))
+
+
+if __name__ == '__main__':
+    main()
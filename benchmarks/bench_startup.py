@@ -0,0 +1,121 @@
+"""GUI startup cost: import time and time to first window, with budgets.
+
+    python -m benchmarks.bench_startup [--runs 5] [--import-budget-ms 400] [--window-budget-ms 1500]
+
+Every run starts a fresh interpreter with QT_QPA_PLATFORM=offscreen, so it
+works headless on Linux, inside a scratch directory (empty database, private
+QSettings):
+
+* import: ``python -X importtime -c "import SkillTrackGUI"``; reports the
+  cumulative import time of SkillTrackGUI and its slowest direct imports;
+* window: time from the start of the script until MainWindow has been shown
+  and its first refresh has been delivered.
+
+Medians are printed as JSON.  The exit status is 1 if either median exceeds
+its budget or a module that should load lazily (plotting backends, NumPy)
+was imported before the first window, so CI can catch regressions.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Only FullReportWindow needs these; none should load for the first window
+LAZY_MODULES = ('matplotlib', 'pyqtgraph', 'numpy')
+
+_WINDOW_SCRIPT = r'''
+import json, sys, time
+t0 = time.perf_counter()
+sys.path.insert(0, {root!r})
+from PyQt6.QtWidgets import QApplication
+app = QApplication([])
+import SkillTrackGUI
+win = SkillTrackGUI.MainWindow()
+win.show()
+win.tasks.wait()
+app.processEvents()
+elapsed_ms = (time.perf_counter() - t0) * 1000
+print(json.dumps({{'window_ms': elapsed_ms, 'loaded': [m for m in {lazy!r} if m in sys.modules]}}))
+SkillTrackGUI.shutdown()
+'''
+
+
+def _env(scratch):
+    env = dict(os.environ)
+    env['QT_QPA_PLATFORM'] = 'offscreen'
+    env['XDG_CONFIG_HOME'] = scratch  # keep QSettings out of the real profile
+    env['SKILLTRACK_DB'] = os.path.join(scratch, 'skilltrack.db')
+    env['PYTHONPATH'] = ROOT + os.pathsep + env.get('PYTHONPATH', '')
+    return env
+
+
+def _import_times(scratch):
+    """Cumulative import time (ms) per module of one `import SkillTrackGUI`."""
+    proc = subprocess.run([sys.executable, '-X', 'importtime', '-c', 'import SkillTrackGUI'],
+                          cwd=scratch, env=_env(scratch), capture_output=True, text=True, check=True)
+    times = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        # nesting is shown by indentation; keep SkillTrackGUI's direct imports
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        times[(depth, name.strip())] = int(cumulative_us) / 1000.0
+    return times
+
+
+def _window_time(scratch):
+    script = _WINDOW_SCRIPT.format(root=ROOT, lazy=LAZY_MODULES)
+    proc = subprocess.run([sys.executable, '-c', script], cwd=scratch, env=_env(scratch),
+                          capture_output=True, text=True, check=True)
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+def run(runs):
+    import_ms, window_ms, loaded, slowest = [], [], set(), {}
+    for _ in range(runs):
+        with tempfile.TemporaryDirectory() as scratch:
+            times = _import_times(scratch)
+            import_ms.append(next(ms for (depth, name), ms in times.items() if name == 'SkillTrackGUI'))
+            for (depth, name), ms in times.items():
+                if depth == 1:
+                    slowest.setdefault(name, []).append(ms)
+            window = _window_time(scratch)
+            window_ms.append(window['window_ms'])
+            loaded.update(window['loaded'])
+    top = sorted(((statistics.median(v), k) for k, v in slowest.items()), reverse=True)[:5]
+    return {
+        'runs': runs,
+        'import_ms': round(statistics.median(import_ms), 1),
+        'window_ms': round(statistics.median(window_ms), 1),
+        'slowest_imports_ms': {name: round(ms, 1) for ms, name in top},
+        'lazy_modules_loaded': sorted(loaded),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--import-budget-ms', type=float, default=400.0)
+    parser.add_argument('--window-budget-ms', type=float, default=1500.0)
+    args = parser.parse_args(argv)
+    results = run(args.runs)
+    failures = []
+    if results['import_ms'] > args.import_budget_ms:
+        failures.append(f"import {results['import_ms']} ms > {args.import_budget_ms} ms")
+    if results['window_ms'] > args.window_budget_ms:
+        failures.append(f"first window {results['window_ms']} ms > {args.window_budget_ms} ms")
+    if results['lazy_modules_loaded']:
+        failures.append(f"loaded at startup: {', '.join(results['lazy_modules_loaded'])}")
+    results['failures'] = failures
+    print(json.dumps(results, indent=2))
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,166 @@
+"""Deterministic synthetic data for the benchmarks.
+
+generate(users, entities, sessions) fills the current database (see
+logic.configure_db) with `users` users, `entities` entities per user and
+`sessions` completed sessions per entity.  The same arguments and seed always
+produce the same rows.
+
+Sessions follow a daily pattern: mostly weekdays, starting in a morning,
+afternoon or evening block, with log-normal lengths (median ~40 min, up to
+4 h).  Entities are drawn independently, so a user's sessions overlap now
+and then, and late evening sessions cross midnight.  About 2% are deleted,
+each user has one running timer and every entity has two goals.
+
+    python -m benchmarks.workload --size medium --db /tmp/bench.db
+"""
+import argparse
+import json
+import math
+import os
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import logic  # noqa: E402
+
+# users x entities per user x sessions per entity
+SIZES = {
+    'small': (2, 4, 250),
+    'medium': (5, 8, 1000),
+    'large': (10, 10, 5000),
+}
+
+# every generated history ends here, so runs on different days match
+END = datetime(2025, 1, 1)
+PASSWORD = 'password'
+
+_NAMES = ('DSA', 'Web Dev', 'Rust', 'Guitar', 'Spanish', 'Thesis', 'Side Project', 'Linear Algebra',
+          'Drawing', 'Compilers', 'Statistics', 'Writing')
+# (weight, mean start hour, spread in hours)
+_BLOCKS = ((0.45, 9.5, 1.5), (0.35, 14.5, 2.0), (0.20, 20.5, 1.5))
+
+
+class Workload:
+    """What generate() created; `entities` maps username -> [entity ids]."""
+
+    def __init__(self, users, entities, sessions, first_day, last_day, seconds):
+        self.users = users
+        self.entities = entities
+        self.sessions = sessions
+        self.first_day = first_day
+        self.last_day = last_day
+        self.seconds = seconds
+
+    def as_dict(self):
+        return {
+            'users': len(self.users),
+            'entities': sum(len(ids) for ids in self.entities.values()),
+            'sessions': self.sessions,
+            'first_day': self.first_day.isoformat(),
+            'last_day': self.last_day.isoformat(),
+            'generate_seconds': round(self.seconds, 3),
+        }
+
+
+def _start_offset(rng, days):
+    """Seconds before END at which a session starts, following the daily pattern."""
+    while True:
+        day = rng.randrange(days)
+        # weekends get a third of the weekday activity
+        if (END - timedelta(days=day + 1)).weekday() < 5 or rng.random() < 0.33:
+            break
+    r = rng.random()
+    for weight, mean, spread in _BLOCKS:
+        if r < weight:
+            break
+        r -= weight
+    hour = min(max(rng.gauss(mean, spread), 6.0), 23.9)
+    return (day + 1) * 86400 - hour * 3600
+
+
+def _duration(rng):
+    return min(max(rng.lognormvariate(math.log(2400), 0.7), 60.0), 4 * 3600.0)
+
+
+def iter_session_rows(rng, entity_id, count, days):
+    """Yield (entity_id, start_us, end_us, is_deleted) for one entity."""
+    end_us = logic.to_epoch_us(END)
+    for _ in range(count):
+        start = end_us - round(_start_offset(rng, days) * logic.US_PER_SECOND)
+        yield entity_id, start, start + round(_duration(rng) * logic.US_PER_SECOND), int(rng.random() < 0.02)
+
+
+def generate(users, entities, sessions, days=730, seed=0, batch_size=50000) -> Workload:
+    """Fill the current database; see the module docstring."""
+    rng = random.Random(seed)
+    started = time.perf_counter()
+    # one cheap hash shared by every user; iterations are stored per user
+    salt, pwdhash, iterations = logic._hash_password(PASSWORD, b'benchmark-salt!!', 1000)
+    conn = logic.get_db_connection()
+    names = [f"user{u:03d}" for u in range(users)]
+    created = {}
+    with conn:
+        conn.execute("BEGIN IMMEDIATE")
+        for username in names:
+            conn.execute(
+                "INSERT INTO users (username, salt, pwdhash, iterations, created_at) VALUES (?, ?, ?, ?, ?)",
+                (username, salt, pwdhash, iterations, END.isoformat())
+            )
+            created[username] = [
+                conn.execute(
+                    "INSERT INTO entities (name, type, description, username) VALUES (?, ?, ?, ?)",
+                    (_NAMES[e % len(_NAMES)] + (f" {e // len(_NAMES) + 1}" if e >= len(_NAMES) else ''),
+                     'Skill' if e % 3 else 'Project', f"Synthetic entity {e}", username)
+                ).lastrowid
+                for e in range(entities)
+            ]
+            for entity_id in created[username]:
+                conn.executemany(
+                    "INSERT INTO goals (entity_id, name, target_hours, status) VALUES (?, ?, ?, ?)",
+                    [(entity_id, f"{hours} hours", float(hours), 'Incomplete') for hours in (20, 100)]
+                )
+            # one running timer per user
+            conn.execute("INSERT INTO sessions (entity_id, start_time) VALUES (?, ?)",
+                         (created[username][0], logic.to_epoch_us(END - timedelta(minutes=30))))
+
+    batch = []
+
+    def flush():
+        with conn:
+            conn.execute("BEGIN IMMEDIATE")
+            conn.executemany(
+                "INSERT INTO sessions (entity_id, start_time, end_time, is_deleted) VALUES (?, ?, ?, ?)", batch
+            )
+            logic.add_daily_totals(conn, [(e, s, f) for e, s, f, deleted in batch if not deleted])
+        batch.clear()
+
+    for username in names:
+        for entity_id in created[username]:
+            for row in iter_session_rows(rng, entity_id, sessions, days):
+                batch.append(row)
+                if len(batch) >= batch_size:
+                    flush()
+    if batch:
+        flush()
+    return Workload(names, created, users * entities * sessions,
+                    (END - timedelta(days=days)).date(), (END - timedelta(days=1)).date(),
+                    time.perf_counter() - started)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--size', choices=sorted(SIZES), default='small')
+    parser.add_argument('--db', required=True, help='database file to create (must not exist)')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+    if os.path.exists(args.db):
+        parser.error(f"{args.db} already exists")
+    logic.configure_db(args.db)
+    print(json.dumps(generate(*SIZES[args.size], seed=args.seed).as_dict(), indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -16,10 +16,18 @@ import os
 import csv
 import tempfile
 import sqlite3
-from datetime import datetime, timedelta
+import itertools
+import threading
+import weakref
+from contextlib import contextmanager
+from datetime import date, datetime, timedelta
 from typing import Optional, List
 
+# Records use __slots__: no per-instance __dict__, which matters when the GUI
+# or a report holds hundreds of thousands of sessions at once.
 class Session:
+    __slots__ = ('id', 'startTime', 'endTime', 'entityId', 'is_deleted')
+
     def __init__(self,id,startTime,endTime,entityId,is_deleted=0):
         self.id = id
         self.startTime = startTime
@@ -28,26 +36,35 @@ class Session:
         self.is_deleted = is_deleted
     
 class Entity:
+    __slots__ = ('id', 'name', 'type', 'description')
+
     def __init__(self,id,name,type,description):
         self.id = id
         self.name = name
         self.type = type
         self.description = description
+
 class Report:
-    def __init__(self,id,entityId,startDate,endDate,totalTimeSpent):
+    __slots__ = ('id', 'entityId', 'startDate', 'endDate', 'totalTimeSpent', 'buckets')
+
+    def __init__(self,id,entityId,startDate,endDate,totalTimeSpent,buckets=None):
         self.id = id
         self.entityId = entityId
         self.startDate = startDate
         self.endDate = endDate
         self.totalTimeSpent = totalTimeSpent
+        self.buckets = buckets # {period_start_date: seconds} when grouped
 
 class Goal:
-    def __init__(self, id, entityId, name, targetHours, status):
+    __slots__ = ('id', 'entityId', 'name', 'targetHours', 'status', 'period')
+
+    def __init__(self, id, entityId, name, targetHours, status, period=None):
         self.id = id
         self.entityId = entityId
         self.name = name
         self.targetHours = targetHours
-        self.status = status # 'Incomplete', 'Completed'
+        self.status = status # 'Incomplete', 'Completed': derived from progress
+        self.period = period # None (all time) or 'day', 'week', 'month': the current one
 
 def _ensure_file_exists(filename):
     # Make parent directory if needed (supports per-user data folders)
@@ -67,20 +84,643 @@ def _parse_iso_datetime(value: str) -> Optional[datetime]:
     except Exception:
         return None
 
+# --- Timestamp codec ---
+# Session times are stored as INTEGER microseconds since 1970-01-01 on the
+# naive local wall clock the app has always recorded.  Durations are integer
+# subtraction in SQL, and values are only converted at the API boundary.
+_EPOCH = datetime(1970, 1, 1)
+_ONE_US = timedelta(microseconds=1)
+US_PER_SECOND = 1000000
+
+
+def to_epoch_us(value: Optional[datetime]) -> Optional[int]:
+    if value is None:
+        return None
+    if value.tzinfo is not None:
+        value = value.astimezone().replace(tzinfo=None)
+    return (value - _EPOCH) // _ONE_US
+
+
+def from_epoch_us(value: Optional[int]) -> Optional[datetime]:
+    if value is None:
+        return None
+    return _EPOCH + timedelta(microseconds=value)
+
 # --- SQLite Database Initialization ---
+# Where the database lives, in order of precedence: configure_db(), the
+# SKILLTRACK_DB environment variable, then DB_FILE in the working directory.
+# ':memory:' selects a private in-memory database shared by this process's
+# threads.  Nothing is opened until the first get_db_connection(), which
+# also creates or upgrades the schema.
 DB_FILE = 'skilltrack.db'
+DB_ENV_VAR = 'SKILLTRACK_DB'
+MEMORY_DB = ':memory:'
 
-def get_db_connection():
-    conn = sqlite3.connect(DB_FILE)
+# Connections are long-lived: one per thread, opened on first use and closed
+# when that thread's locals are freed (the thread exited) or by close_all().
+# Every connection gets the same tuning pragmas.
+BUSY_TIMEOUT_MS = 5000
+CONNECTION_PRAGMAS = (
+    "PRAGMA journal_mode = WAL",
+    "PRAGMA synchronous = NORMAL",
+    "PRAGMA cache_size = -16000",      # ~16 MB page cache
+    "PRAGMA mmap_size = 268435456",    # 256 MB memory-mapped reads
+    "PRAGMA temp_store = MEMORY",
+)
+
+_local = threading.local()
+_connections_lock = threading.Lock()
+_connections = {}          # open connection -> database, on every thread
+_generation = 0
+
+_db_target = None          # (database, is_uri) set by configure_db()
+_memory_dbs = itertools.count(1)
+_schema_lock = threading.RLock()
+_schema_ready = set()      # databases migrated since the last close_all()
+
+
+def _memory_uri():
+    # memdb databases are shared by every connection in the process and use
+    # normal locking; older SQLite only has shared-cache in-memory databases
+    name = f"skilltrack-{os.getpid()}-{next(_memory_dbs)}"
+    if sqlite3.sqlite_version_info >= (3, 36, 0):
+        return f"file:/{name}?vfs=memdb"
+    return f"file:{name}?mode=memory&cache=shared"
+
+
+def _target_for(path):
+    if path == MEMORY_DB:
+        return _memory_uri(), True
+    if str(path).startswith('file:'):
+        return str(path), True
+    return os.path.abspath(path), False
+
+
+def configure_db(path=None) -> str:
+    """Use the database at `path` from now on and return its resolved name.
+
+    `path` is a file path, a ``file:`` URI or ':memory:' (a fresh, empty
+    in-memory database on every call); None goes back to SKILLTRACK_DB or
+    DB_FILE.  Open connections are closed; the schema is created on first use.
+    """
+    global _db_target
+    close_all()
+    _db_target = None if path is None else _target_for(path)
+    return database_path()
+
+
+def _resolve_target():
+    global _db_target
+    if _db_target is None:
+        configured = os.environ.get(DB_ENV_VAR)
+        if configured == MEMORY_DB:
+            # pin the in-memory name so every thread gets the same database
+            _db_target = _target_for(configured)
+        else:
+            return _target_for(configured or DB_FILE)
+    return _db_target
+
+
+def database_path() -> str:
+    """The database get_db_connection() currently opens (a path or URI)."""
+    return _resolve_target()[0]
+
+
+def _is_memory(path):
+    return 'mode=memory' in path or 'vfs=memdb' in path
+
+
+def _open_connection(path, uri=False):
+    conn = sqlite3.connect(path, timeout=BUSY_TIMEOUT_MS / 1000.0, check_same_thread=False, uri=uri,
+                           factory=_TrackedConnection)
     conn.row_factory = sqlite3.Row
+    conn.execute(f"PRAGMA busy_timeout = {BUSY_TIMEOUT_MS}")
+    in_memory = uri and _is_memory(path)
+    for pragma in CONNECTION_PRAGMAS:
+        if in_memory and ('journal_mode' in pragma or 'mmap_size' in pragma):
+            continue  # no WAL or mmap without a file
+        conn.execute(pragma)
     return conn
 
-def init_db():
+
+def _ensure_schema(conn, database):
+    if database in _schema_ready:
+        return
+    with _schema_lock:
+        if database not in _schema_ready:
+            migrate(conn)
+            _schema_ready.add(database)
+
+
+class _ConnectionHolder:
+    """The thread-local owner of a thread's connection.
+
+    Python frees a thread's locals when the thread exits (for Qt pool
+    threads, when a task returns), so a finalizer on the holder closes the
+    connection instead of leaving it open until close_all().
+    """
+    __slots__ = ('conn', 'path', 'generation', '__weakref__')
+
+    def __init__(self, conn, path, generation):
+        self.conn = conn
+        self.path = path
+        self.generation = generation
+        weakref.finalize(self, _release_connection, conn)
+
+
+def _release_connection(conn):
+    with _connections_lock:
+        path = _connections.pop(conn, None)
+        if path is not None and _is_memory(path) and path not in _connections.values():
+            # an in-memory database disappears with its last connection
+            _schema_ready.discard(path)
+    try:
+        conn.close()
+    except Exception:
+        pass
+
+
+def get_db_connection():
+    """Return the calling thread's shared connection.
+
+    The connection stays open while its thread lives (or until close_all()),
+    so callers must not close it; use ``with conn:`` to scope a transaction
+    instead.
+    """
+    path, uri = _resolve_target()
+    holder = getattr(_local, 'holder', None)
+    if holder is not None and holder.path == path and holder.generation == _generation:
+        return holder.conn
+    _local.holder = None  # closes a connection to another or an outdated database
+    conn = _open_connection(path, uri)
+    with _connections_lock:
+        _connections[conn] = path
+        holder = _ConnectionHolder(conn, path, _generation)
+    _local.holder = holder
+    try:
+        _ensure_schema(conn, path)
+    except Exception:
+        _local.holder = None
+        raise
+    return conn
+
+
+def close_all():
+    """Close every connection opened by get_db_connection() on any thread."""
+    global _generation
+    with _connections_lock:
+        conns = list(_connections)
+        _connections.clear()
+        _generation += 1
+        # an in-memory database disappears with its last connection
+        _schema_ready.clear()
+    for conn in conns:
+        try:
+            conn.close()
+        except Exception:
+            pass
+    _local.holder = None
+
+
+def data_version() -> int:
+    """PRAGMA data_version of the calling thread's connection.
+
+    The value changes whenever another connection (another thread or
+    process) commits to the database, so pollers can skip reloading when
+    nothing changed.
+    """
+    return get_db_connection().execute("PRAGMA data_version").fetchone()[0]
+
+
+@contextmanager
+def _write_transaction():
+    """Yield the shared connection inside BEGIN IMMEDIATE ... COMMIT.
+
+    Used where a write must read-modify-write consistently (e.g. sessions plus
+    their rollups), so the reads are covered by the same write lock.
+    """
     conn = get_db_connection()
-    cursor = conn.cursor()
-    
-    # Users table
-    cursor.execute('''
+    with conn:
+        conn.execute("BEGIN IMMEDIATE")
+        yield conn
+
+
+# --- Query instrumentation ---
+# Opt-in per-statement statistics.  Every connection is a _TrackedConnection,
+# but cursors only become _TrackedCursors while track_queries() is active or
+# SKILLTRACK_TRACE_SQL is set, so untracked code pays one extra Python call per
+# statement and nothing per row.  A statement's latency covers execute() plus
+# every fetch until its cursor is exhausted, re-executed or closed.
+import atexit
+import logging
+import sys
+import time
+
+TRACE_ENV_VAR = 'SKILLTRACK_TRACE_SQL'
+query_log = logging.getLogger('skilltrack.sql')
+
+_query_sinks = []          # active QueryStats, newest last
+_query_sinks_lock = threading.Lock()
+
+
+class QueryStat:
+    """Totals for one (statement, calling API function) pair."""
+    __slots__ = ('sql', 'caller', 'count', 'total_ms', 'max_ms', 'rows')
+
+    def __init__(self, sql, caller):
+        self.sql = sql
+        self.caller = caller
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.rows = 0
+
+    @property
+    def avg_ms(self) -> float:
+        return self.total_ms / self.count if self.count else 0.0
+
+
+class QueryStats:
+    """Statements recorded while tracking; safe to fill from several threads."""
+
+    def __init__(self, log=False):
+        self.log = log
+        self._stats = {}
+        self._lock = threading.Lock()
+
+    def add(self, sql, caller, ms, rows):
+        sql = ' '.join(sql.split())
+        with self._lock:
+            stat = self._stats.get((sql, caller))
+            if stat is None:
+                stat = self._stats[(sql, caller)] = QueryStat(sql, caller)
+            stat.count += 1
+            stat.total_ms += ms
+            stat.max_ms = max(stat.max_ms, ms)
+            stat.rows += rows
+        if self.log:
+            query_log.debug("%8.3f ms %6d rows  %s  %s", ms, rows, caller, sql)
+
+    def stats(self) -> List[QueryStat]:
+        with self._lock:
+            return list(self._stats.values())
+
+    @property
+    def statements(self) -> int:
+        return sum(s.count for s in self.stats())
+
+    @property
+    def total_ms(self) -> float:
+        return sum(s.total_ms for s in self.stats())
+
+    @property
+    def rows(self) -> int:
+        return sum(s.rows for s in self.stats())
+
+    def by_caller(self):
+        """{caller: statements issued} ."""
+        counts = {}
+        for s in self.stats():
+            counts[s.caller] = counts.get(s.caller, 0) + s.count
+        return counts
+
+    def top(self, n=10, key='total_ms') -> List[QueryStat]:
+        """The `n` statements with the largest `key` ('total_ms', 'max_ms', 'count' or 'rows')."""
+        return sorted(self.stats(), key=lambda s: getattr(s, key), reverse=True)[:n]
+
+    def report(self, n=10, key='total_ms') -> str:
+        lines = [f"{self.statements} statements, {self.total_ms:.1f} ms, {self.rows} rows",
+                 f"{'count':>6} {'total ms':>10} {'avg ms':>8} {'max ms':>8} {'rows':>8}  caller / statement"]
+        for s in self.top(n, key):
+            sql = s.sql if len(s.sql) <= 100 else s.sql[:97] + '...'
+            lines.append(f"{s.count:>6} {s.total_ms:>10.2f} {s.avg_ms:>8.3f} {s.max_ms:>8.3f} {s.rows:>8}"
+                         f"  {s.caller}\n{'':46}{sql}")
+        return '\n'.join(lines)
+
+
+@contextmanager
+def track_queries(log=False):
+    """Record every statement run through get_db_connection() on any thread.
+
+        with track_queries() as stats:
+            GenerateReports(...)
+        print(stats.report())
+
+    log=True also logs each statement to the 'skilltrack.sql' logger (DEBUG).
+    """
+    stats = QueryStats(log)
+    with _query_sinks_lock:
+        _query_sinks.append(stats)
+    try:
+        yield stats
+    finally:
+        with _query_sinks_lock:
+            _query_sinks.remove(stats)
+
+
+def enable_query_logging(top_n=15):
+    """Log every statement for the rest of the process, and a top-N report at exit.
+
+    Called at import when SKILLTRACK_TRACE_SQL is set; the logger gets a
+    stderr handler if nothing else has configured it.
+    """
+    stats = QueryStats(log=True)
+    with _query_sinks_lock:
+        _query_sinks.append(stats)
+    if not query_log.handlers and not logging.getLogger().handlers:
+        query_log.addHandler(logging.StreamHandler())
+    if query_log.level == logging.NOTSET:
+        query_log.setLevel(logging.DEBUG)
+    atexit.register(lambda: query_log.info("slowest statements:\n%s", stats.report(top_n)))
+    return stats
+
+
+def _record_query(sql, caller, ms, rows):
+    for stats in list(_query_sinks):
+        stats.add(sql, caller, ms, rows)
+
+
+class _TrackedCursor(sqlite3.Cursor):
+    _call = None   # [sql, caller, ms, rows] of the statement being fetched
+
+    def _finish(self):
+        call, self._call = self._call, None
+        if call is not None:
+            _record_query(*call)
+
+    def _timed(self, method, *args):
+        started = time.perf_counter()
+        try:
+            return method(*args)
+        finally:
+            if self._call is not None:
+                self._call[2] += (time.perf_counter() - started) * 1000
+
+    def execute(self, sql, parameters=(), /):
+        self._finish()
+        self._call = [sql, _api_caller(), 0.0, 0]
+        self._timed(super().execute, sql, parameters)
+        if self.description is None:
+            self._call[3] = max(self.rowcount, 0)
+            self._finish()
+        return self
+
+    def executemany(self, sql, seq_of_parameters, /):
+        self._finish()
+        self._call = [sql, _api_caller(), 0.0, 0]
+        self._timed(super().executemany, sql, seq_of_parameters)
+        self._call[3] = max(self.rowcount, 0)
+        self._finish()
+        return self
+
+    def fetchone(self):
+        row = self._timed(super().fetchone)
+        if row is None:
+            self._finish()
+        elif self._call is not None:
+            self._call[3] += 1
+        return row
+
+    def fetchmany(self, size=None):
+        rows = self._timed(super().fetchmany, self.arraysize if size is None else size)
+        if self._call is not None:
+            self._call[3] += len(rows)
+        if not rows:
+            self._finish()
+        return rows
+
+    def fetchall(self):
+        rows = self._timed(super().fetchall)
+        if self._call is not None:
+            self._call[3] += len(rows)
+        self._finish()
+        return rows
+
+    def __next__(self):
+        try:
+            row = self._timed(super().__next__)
+        except StopIteration:
+            self._finish()
+            raise
+        if self._call is not None:
+            self._call[3] += 1
+        return row
+
+    def close(self):
+        self._finish()
+        super().close()
+
+    def __del__(self):
+        self._finish()
+
+
+class _TrackedConnection(sqlite3.Connection):
+    # Connection.execute() would bypass an overridden Cursor.execute(), so
+    # statements are routed through cursor() while anything is tracking
+    def cursor(self, factory=sqlite3.Cursor):
+        if _query_sinks and factory is sqlite3.Cursor:
+            factory = _TrackedCursor
+        return super().cursor(factory)
+
+    def execute(self, sql, parameters=(), /):
+        if _query_sinks:
+            return self.cursor().execute(sql, parameters)
+        return super().execute(sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters, /):
+        if _query_sinks:
+            return self.cursor().executemany(sql, seq_of_parameters)
+        return super().executemany(sql, seq_of_parameters)
+
+
+_TRACKING_CODE = {f.__code__ for cls in (_TrackedCursor, _TrackedConnection)
+                  for f in vars(cls).values() if hasattr(f, '__code__')}
+
+
+def _api_caller():
+    """Name of the outermost logic.py function on the stack, else the direct caller."""
+    frame = sys._getframe(1)
+    while frame is not None and frame.f_code in _TRACKING_CODE:
+        frame = frame.f_back
+    api = None
+    while frame is not None and frame.f_code.co_filename == __file__:
+        api = frame.f_code.co_name
+        frame = frame.f_back
+    if api is not None:
+        return f"logic.{api}"
+    if frame is None:
+        return '?'
+    return f"{frame.f_globals.get('__name__', '?')}.{frame.f_code.co_name}"
+
+
+if os.environ.get(TRACE_ENV_VAR):
+    enable_query_logging()
+
+
+# --- Daily rollups ---
+# daily_totals holds per-entity seconds for each calendar day of completed,
+# non-deleted sessions.  Every session write path updates it in the same
+# transaction; sessions crossing midnight are split across the days they cover.
+DAY_US = 86400 * US_PER_SECOND
+
+
+def _day_spans(start_us, end_us):
+    """Yield (day 'YYYY-MM-DD', seconds) for each day the interval touches."""
+    cur = start_us
+    while cur < end_us:
+        day_index = cur // DAY_US
+        boundary = min((day_index + 1) * DAY_US, end_us)
+        yield (_EPOCH + timedelta(days=day_index)).date().isoformat(), (boundary - cur) / US_PER_SECOND
+        cur = boundary
+
+
+def _session_state(conn, session_id):
+    return conn.execute(
+        "SELECT entity_id, start_time, end_time, is_deleted FROM sessions WHERE id = ?", (session_id,)
+    ).fetchone()
+
+
+def _apply_rollup(conn, state, sign):
+    if state is None or state['end_time'] is None or state['is_deleted']:
+        return
+    rows = [(state['entity_id'], day, sign * secs) for day, secs in _day_spans(state['start_time'], state['end_time'])]
+    conn.executemany('''
+        INSERT INTO daily_totals (entity_id, day, seconds) VALUES (?, ?, ?)
+        ON CONFLICT (entity_id, day) DO UPDATE SET seconds = seconds + excluded.seconds
+    ''', rows)
+    if sign < 0:
+        conn.executemany(
+            "DELETE FROM daily_totals WHERE entity_id = ? AND day = ? AND seconds < 0.000001",
+            [(entity_id, day) for entity_id, day, _ in rows]
+        )
+
+
+def _update_rollups(conn, before, after):
+    """Move a session's contribution from its `before` to its `after` state."""
+    _apply_rollup(conn, before, -1)
+    _apply_rollup(conn, after, +1)
+
+
+def add_daily_totals(conn, sessions):
+    """Add (entity_id, start_us, end_us) rows to daily_totals with one upsert.
+
+    For bulk writers that insert many sessions in a transaction of their own;
+    rows without an end time (running timers) are ignored.
+    """
+    totals = {}
+    for entity_id, start_us, end_us in sessions:
+        if end_us is None:
+            continue
+        for day, secs in _day_spans(start_us, end_us):
+            totals[(entity_id, day)] = totals.get((entity_id, day), 0.0) + secs
+    conn.executemany('''
+        INSERT INTO daily_totals (entity_id, day, seconds) VALUES (?, ?, ?)
+        ON CONFLICT (entity_id, day) DO UPDATE SET seconds = seconds + excluded.seconds
+    ''', [(entity_id, day, secs) for (entity_id, day), secs in totals.items()])
+
+
+def _compute_daily_totals(conn):
+    """Recompute {(entity_id, day): seconds} from the raw sessions table."""
+    totals = {}
+    cursor = conn.execute(
+        "SELECT entity_id, start_time, end_time FROM sessions WHERE end_time IS NOT NULL AND is_deleted = 0"
+    )
+    for batch in iter(lambda: cursor.fetchmany(5000), []):
+        for entity_id, start_us, end_us in batch:
+            for day, secs in _day_spans(start_us, end_us):
+                totals[(entity_id, day)] = totals.get((entity_id, day), 0.0) + secs
+    return totals
+
+
+def _fill_daily_totals(conn):
+    conn.execute("DELETE FROM daily_totals")
+    conn.executemany(
+        "INSERT INTO daily_totals (entity_id, day, seconds) VALUES (?, ?, ?)",
+        [(entity_id, day, secs) for (entity_id, day), secs in _compute_daily_totals(conn).items()]
+    )
+
+
+def rebuild_rollups(verify_only=False, tolerance=0.001):
+    """Check daily_totals against the raw sessions and rebuild it.
+
+    Returns a list of (entity_id, day, stored_seconds, actual_seconds) for every
+    row that disagrees.  With verify_only=True the table is left untouched.
+    """
+    with _write_transaction() as conn:
+        actual = _compute_daily_totals(conn)
+        stored = {(r['entity_id'], r['day']): r['seconds'] for r in conn.execute("SELECT * FROM daily_totals")}
+        mismatches = []
+        for key in sorted(set(actual) | set(stored), key=lambda k: (k[0], k[1])):
+            a, st = actual.get(key, 0.0), stored.get(key, 0.0)
+            if abs(a - st) > tolerance:
+                mismatches.append((key[0], key[1], st, a))
+        if mismatches and not verify_only:
+            _fill_daily_totals(conn)
+    return mismatches
+
+
+# --- Schema migrations ---
+_SESSION_INDEXES = (
+    # completed/live sessions per entity, ordered by start
+    "CREATE INDEX IF NOT EXISTS idx_sessions_entity_start ON sessions (entity_id, start_time) WHERE is_deleted = 0",
+    # running timers
+    "CREATE INDEX IF NOT EXISTS idx_sessions_running ON sessions (entity_id) WHERE end_time IS NULL",
+)
+
+
+MIGRATION_BATCH_SIZE = 5000
+
+
+def _migrate_sessions_to_epoch_us(conn):
+    """Rebuild sessions with INTEGER start/end columns.
+
+    Legacy TEXT values may use either ' ' or 'T' as the date/time separator.
+    Rows whose times never parsed were already invisible to every loader and
+    are not carried over.
+    """
+    seq = conn.execute("SELECT seq FROM sqlite_sequence WHERE name = 'sessions'").fetchone()
+    conn.execute('''
+        CREATE TABLE sessions_new (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            entity_id INTEGER NOT NULL,
+            start_time INTEGER NOT NULL,
+            end_time INTEGER,
+            is_deleted INTEGER DEFAULT 0,
+            FOREIGN KEY (entity_id) REFERENCES entities (id)
+        )
+    ''')
+    cursor = conn.execute("SELECT id, entity_id, start_time, end_time, is_deleted FROM sessions")
+    while True:
+        rows = cursor.fetchmany(MIGRATION_BATCH_SIZE)
+        if not rows:
+            break
+        batch = []
+        for row in rows:
+            start = _parse_iso_datetime(row['start_time'])
+            end = _parse_iso_datetime(row['end_time'])
+            if start is None or (row['end_time'] is not None and end is None):
+                continue
+            batch.append((row['id'], row['entity_id'], to_epoch_us(start), to_epoch_us(end), row['is_deleted']))
+        if batch:
+            conn.executemany(
+                "INSERT INTO sessions_new (id, entity_id, start_time, end_time, is_deleted) VALUES (?, ?, ?, ?, ?)",
+                batch
+            )
+    conn.execute("DROP TABLE sessions")
+    conn.execute("ALTER TABLE sessions_new RENAME TO sessions")
+    if seq:
+        conn.execute("UPDATE sqlite_sequence SET seq = MAX(seq, ?) WHERE name = 'sessions'", (seq[0],))
+    for statement in _SESSION_INDEXES:
+        conn.execute(statement)
+
+
+# Ordered, append-only steps.  Each entry is (version, description, steps)
+# where a step is either a SQL statement or a callable taking the connection.
+# Version 1 is the original schema (CREATE ... IF NOT EXISTS), so databases
+# created before migrations existed upgrade in place.
+SCHEMA_MIGRATIONS = [
+    (1, 'base tables', [
+        '''
         CREATE TABLE IF NOT EXISTS users (
             username TEXT PRIMARY KEY,
             salt TEXT NOT NULL,
@@ -88,10 +728,8 @@ def init_db():
             iterations INTEGER NOT NULL,
             created_at TEXT NOT NULL
         )
-    ''')
-    
-    # Entities table
-    cursor.execute('''
+        ''',
+        '''
         CREATE TABLE IF NOT EXISTS entities (
             id INTEGER PRIMARY KEY AUTOINCREMENT,
             name TEXT NOT NULL,
@@ -100,10 +738,8 @@ def init_db():
             username TEXT NOT NULL,
             FOREIGN KEY (username) REFERENCES users (username)
         )
-    ''')
-    
-    # Sessions table
-    cursor.execute('''
+        ''',
+        '''
         CREATE TABLE IF NOT EXISTS sessions (
             id INTEGER PRIMARY KEY AUTOINCREMENT,
             entity_id INTEGER NOT NULL,
@@ -112,10 +748,8 @@ def init_db():
             is_deleted INTEGER DEFAULT 0,
             FOREIGN KEY (entity_id) REFERENCES entities (id)
         )
-    ''')
-    
-    # Goals table
-    cursor.execute('''
+        ''',
+        '''
         CREATE TABLE IF NOT EXISTS goals (
             id INTEGER PRIMARY KEY AUTOINCREMENT,
             entity_id INTEGER NOT NULL,
@@ -124,32 +758,148 @@ def init_db():
             status TEXT NOT NULL,
             FOREIGN KEY (entity_id) REFERENCES entities (id)
         )
+        ''',
+    ]),
+    (2, 'indexes for session, entity and goal lookups', [
+        *_SESSION_INDEXES,
+        "CREATE INDEX IF NOT EXISTS idx_entities_username ON entities (username)",
+        "CREATE INDEX IF NOT EXISTS idx_goals_entity ON goals (entity_id)",
+    ]),
+    (3, 'store session times as integer epoch microseconds', [
+        _migrate_sessions_to_epoch_us,
+    ]),
+    (4, 'daily per-entity rollups', [
+        '''
+        CREATE TABLE IF NOT EXISTS daily_totals (
+            entity_id INTEGER NOT NULL,
+            day TEXT NOT NULL,
+            seconds REAL NOT NULL DEFAULT 0,
+            PRIMARY KEY (entity_id, day)
+        ) WITHOUT ROWID
+        ''',
+        _fill_daily_totals,
+    ]),
+    (5, 'keyset index for paging sessions newest first', [
+        "CREATE INDEX IF NOT EXISTS idx_sessions_start ON sessions (start_time, id)",
+    ]),
+    (6, 'per-user KDF algorithm and remembered-login tokens', [
+        "ALTER TABLE users ADD COLUMN algorithm TEXT NOT NULL DEFAULT 'pbkdf2_sha256'",
+        '''
+        CREATE TABLE IF NOT EXISTS auth_tokens (
+            token_hash TEXT PRIMARY KEY,
+            username TEXT NOT NULL,
+            created_at INTEGER NOT NULL,
+            expires_at INTEGER NOT NULL,
+            FOREIGN KEY (username) REFERENCES users (username)
+        )
+        ''',
+        "CREATE INDEX IF NOT EXISTS idx_auth_tokens_username ON auth_tokens (username)",
+    ]),
+    (7, 'goals over a calendar day, week or month', [
+        "ALTER TABLE goals ADD COLUMN period TEXT",
+    ]),
+]
+
+SCHEMA_VERSION = SCHEMA_MIGRATIONS[-1][0]
+
+
+def get_schema_version(conn=None) -> int:
+    conn = conn or get_db_connection()
+    row = conn.execute(
+        "SELECT name FROM sqlite_master WHERE type = 'table' AND name = 'schema_version'"
+    ).fetchone()
+    if not row:
+        return 0
+    return conn.execute("SELECT COALESCE(MAX(version), 0) FROM schema_version").fetchone()[0]
+
+
+def migrate(conn=None) -> int:
+    """Apply every pending migration and return the resulting schema version.
+
+    Each migration runs in its own write transaction; BEGIN IMMEDIATE makes a
+    second process wait for the first instead of applying a step twice.
+    """
+    conn = conn or get_db_connection()
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS schema_version (
+            version INTEGER PRIMARY KEY,
+            description TEXT NOT NULL,
+            applied_at TEXT NOT NULL
+        )
     ''')
-    
-    conn.commit()
-    conn.close()
+    for version, description, steps in SCHEMA_MIGRATIONS:
+        if version <= get_schema_version(conn):
+            continue
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            if version <= get_schema_version(conn):
+                conn.rollback()
+                continue
+            for step in steps:
+                if callable(step):
+                    step(conn)
+                else:
+                    conn.execute(step)
+            conn.execute(
+                "INSERT INTO schema_version (version, description, applied_at) VALUES (?, ?, ?)",
+                (version, description, datetime.now().isoformat())
+            )
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+    return get_schema_version(conn)
+
 
-# Initialize database on module load
-init_db()
+def init_db():
+    """Create or upgrade the schema now instead of on first use."""
+    migrate()
 
 # --- User auth helpers ---
 class User:
-    def __init__(self, username: str, salt: str, pwdhash: str, iterations: int, created: datetime):
+    __slots__ = ('username', 'salt', 'pwdhash', 'iterations', 'created', 'algorithm')
+
+    def __init__(self, username: str, salt: str, pwdhash: str, iterations: int, created: datetime,
+                 algorithm: str = 'pbkdf2_sha256'):
         self.username = username
         self.salt = salt
         self.pwdhash = pwdhash
         self.iterations = iterations
         self.created = created
+        self.algorithm = algorithm
 
 import hashlib
 import hmac
 import binascii
+import secrets
+
+# Password hashing parameters for new and rehashed passwords.  Each user row
+# records the algorithm and iterations it was hashed with, so these can be
+# raised at any time: a successful login rehashes with the current values.
+KDF_ALGORITHMS = {'pbkdf2_sha256': 'sha256', 'pbkdf2_sha512': 'sha512'}
+KDF_ALGORITHM = os.environ.get('SKILLTRACK_KDF_ALGORITHM', 'pbkdf2_sha256')
+KDF_ITERATIONS = int(os.environ.get('SKILLTRACK_KDF_ITERATIONS', 100000))
+
 
+def configure_kdf(algorithm: str = None, iterations: int = None):
+    """Change the KDF used for new passwords and for rehash-on-login."""
+    global KDF_ALGORITHM, KDF_ITERATIONS
+    if algorithm is not None:
+        if algorithm not in KDF_ALGORITHMS:
+            raise ValueError(f"algorithm must be one of {sorted(KDF_ALGORITHMS)}, not {algorithm!r}")
+        KDF_ALGORITHM = algorithm
+    if iterations is not None:
+        if iterations < 1:
+            raise ValueError("iterations must be positive")
+        KDF_ITERATIONS = int(iterations)
 
-def _hash_password(password: str, salt: bytes = None, iterations: int = 100000):
+
+def _hash_password(password: str, salt: bytes = None, iterations: int = None, algorithm: str = None):
     if salt is None:
         salt = os.urandom(16)
-    dk = hashlib.pbkdf2_hmac('sha256', password.encode('utf-8'), salt, iterations)
+    iterations = iterations or KDF_ITERATIONS
+    digest = KDF_ALGORITHMS[algorithm or KDF_ALGORITHM]
+    dk = hashlib.pbkdf2_hmac(digest, password.encode('utf-8'), salt, iterations)
     return binascii.hexlify(salt).decode('ascii'), binascii.hexlify(dk).decode('ascii'), iterations
 
 
@@ -162,129 +912,505 @@ def loadUsersFromFile(filename='users.txt'):
     for row in cursor.fetchall():
         users[row['username']] = User(
             row['username'], row['salt'], row['pwdhash'], 
-            row['iterations'], _parse_iso_datetime(row['created_at'])
+            row['iterations'], _parse_iso_datetime(row['created_at']), row['algorithm']
         )
-    conn.close()
     return users
 
 
 def create_user(username: str, password: str, filename='users.txt') -> bool:
-    users = loadUsersFromFile()
-    if username in users:
-        return False
+    """Create a user; returns False if the username is taken (the PRIMARY KEY decides)."""
     salt_hex, hash_hex, iterations = _hash_password(password)
-    
     conn = get_db_connection()
-    cursor = conn.cursor()
-    cursor.execute(
-        "INSERT INTO users (username, salt, pwdhash, iterations, created_at) VALUES (?, ?, ?, ?, ?)",
-        (username, salt_hex, hash_hex, iterations, datetime.now().isoformat())
-    )
-    conn.commit()
-    conn.close()
+    try:
+        with conn:
+            conn.execute(
+                "INSERT INTO users (username, salt, pwdhash, iterations, algorithm, created_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (username, salt_hex, hash_hex, iterations, KDF_ALGORITHM, datetime.now().isoformat())
+            )
+    except sqlite3.IntegrityError:
+        return False
     return True
 
 
 def authenticate_user(username: str, password: str, filename='users.txt') -> bool:
     conn = get_db_connection()
-    cursor = conn.cursor()
-    cursor.execute("SELECT * FROM users WHERE username = ?", (username,))
-    u = cursor.fetchone()
-    conn.close()
-    
+    u = conn.execute(
+        "SELECT salt, pwdhash, iterations, algorithm FROM users WHERE username = ?", (username,)
+    ).fetchone()
     if not u:
         return False
     try:
-        salt = binascii.unhexlify(u['salt'])
-        dk = hashlib.pbkdf2_hmac('sha256', password.encode('utf-8'), salt, u['iterations'])
-        return hmac.compare_digest(binascii.hexlify(dk).decode('ascii'), u['pwdhash'])
+        _, hash_hex, _ = _hash_password(password, binascii.unhexlify(u['salt']), u['iterations'], u['algorithm'])
     except Exception:
         return False
+    if not hmac.compare_digest(hash_hex, u['pwdhash']):
+        return False
+    if (u['algorithm'], u['iterations']) != (KDF_ALGORITHM, KDF_ITERATIONS):
+        # parameters changed since this password was stored: upgrade it now
+        # that the plaintext is at hand; skip if someone else already did
+        salt_hex, new_hex, iterations = _hash_password(password)
+        with conn:
+            conn.execute(
+                "UPDATE users SET salt = ?, pwdhash = ?, iterations = ?, algorithm = ? "
+                "WHERE username = ? AND pwdhash = ?",
+                (salt_hex, new_hex, iterations, KDF_ALGORITHM, username, u['pwdhash'])
+            )
+    return True
 
-# Function to calculate total time spent in hours,mins,seconds for a list of sessions
-def calculateTotalTime(sessions):
-    totalSeconds = 0
-    for session in sessions:
-        totalSeconds += (session.endTime - session.startTime).total_seconds()
-    
+
+# Remembered logins: the client keeps a random token, the database only its
+# SHA-256, so resuming a login is a single lookup instead of a KDF run.
+AUTH_TOKEN_TTL = timedelta(days=30)
+
+
+def _token_hash(token: str) -> str:
+    return hashlib.sha256(token.encode('utf-8')).hexdigest()
+
+
+def issue_auth_token(username: str, ttl: timedelta = AUTH_TOKEN_TTL) -> str:
+    """Create a login token for an already authenticated user and return it."""
+    token = secrets.token_urlsafe(32)
+    now = datetime.now()
+    conn = get_db_connection()
+    with conn:
+        conn.execute(
+            "INSERT INTO auth_tokens (token_hash, username, created_at, expires_at) VALUES (?, ?, ?, ?)",
+            (_token_hash(token), username, to_epoch_us(now), to_epoch_us(now + ttl))
+        )
+    return token
+
+
+def resolve_auth_token(token: str) -> Optional[str]:
+    """Return the username a valid, unexpired token belongs to, else None."""
+    if not token:
+        return None
+    row = get_db_connection().execute(
+        "SELECT username FROM auth_tokens WHERE token_hash = ? AND expires_at > ?",
+        (_token_hash(token), to_epoch_us(datetime.now()))
+    ).fetchone()
+    return row['username'] if row else None
+
+
+def revoke_auth_token(token: str):
+    """Forget a token (logout); expired tokens are swept at the same time."""
+    conn = get_db_connection()
+    with conn:
+        conn.execute("DELETE FROM auth_tokens WHERE token_hash = ? OR expires_at <= ?",
+                     (_token_hash(token or ''), to_epoch_us(datetime.now())))
+
+def _split_seconds(totalSeconds):
     hours = totalSeconds // 3600
     minutes = (totalSeconds % 3600) // 60
     seconds = totalSeconds % 60
-    
     return int(hours), int(minutes), int(seconds)
 
+# Function to calculate total time spent in hours,mins,seconds for a list of sessions.
+# Any iterable works, including the lazy iter_sessions() generator.
+def calculateTotalTime(sessions):
+    totalSeconds = 0
+    for session in sessions:
+        totalSeconds += (session.endTime - session.startTime).total_seconds()
+    return _split_seconds(totalSeconds)
+
+
+# Report bucket key for a session: the day, Monday of the week or first of the
+# month it started in (or the report started in, if that is later).
+_START_SECONDS_SQL = "s.start_time / 1000000"
+_PERIOD_SQL = {
+    'day': f"date({_START_SECONDS_SQL}, 'unixepoch')",
+    'week': (f"date({_START_SECONDS_SQL}, 'unixepoch', '-' || "
+             f"((CAST(strftime('%w', {_START_SECONDS_SQL}, 'unixepoch') AS INTEGER) + 6) % 7) || ' days')"),
+    'month': f"strftime('%Y-%m-01', {_START_SECONDS_SQL}, 'unixepoch')",
+}
+
+
+def _session_totals(entity_ids, startDate, endDate, username=None, group_by=None):
+    """Sum completed-session microseconds per entity with one grouped query.
+
+    Returns {entity_id: us}, or {(entity_id, period_date): us} when group_by is
+    'day', 'week' or 'month'.  Sessions overlapping [startDate, endDate] count
+    the part inside it, as the daily rollups do for whole-day ranges; the
+    range's end is served by idx_sessions_entity_start.
+    """
+    entity_ids = list(entity_ids)
+    if not entity_ids:
+        return {}
+    if group_by is not None and group_by not in _PERIOD_SQL:
+        raise ValueError(f"group_by must be one of {sorted(_PERIOD_SQL)}, not {group_by!r}")
+    period = f", {_PERIOD_SQL[group_by]} AS period" if group_by else ""
+    user_join = "JOIN entities e ON e.id = s.entity_id AND e.username = ?" if username else ""
+    placeholders = ', '.join('?' * len(entity_ids))
+    start_us, end_us = to_epoch_us(startDate), to_epoch_us(endDate)
+    params = [start_us, end_us] + ([username] if username else []) + entity_ids + [end_us, start_us]
+    conn = get_db_connection()
+    rows = conn.execute(f'''
+        SELECT s.entity_id, SUM(s.end_time - s.start_time) AS us{period}
+        FROM (
+            SELECT s.entity_id, MAX(s.start_time, ?) AS start_time, MIN(s.end_time, ?) AS end_time
+            FROM sessions s {user_join}
+            WHERE s.entity_id IN ({placeholders}) AND s.is_deleted = 0
+              AND s.start_time < ? AND s.end_time IS NOT NULL AND s.end_time > ?
+        ) s
+        GROUP BY s.entity_id{", period" if group_by else ""}
+    ''', params)
+    if group_by:
+        return {(r['entity_id'], date.fromisoformat(r['period'])): r['us'] or 0 for r in rows}
+    return {r['entity_id']: r['us'] or 0 for r in rows}
+
+
+def _whole_days(startDate, endDate):
+    """Return (first_day, last_day) if the range is made of whole days, else None.
+
+    The end may be either midnight after the last day or 23:59:59 of it, as the
+    GUI's date pickers produce.
+    """
+    if startDate.time() != datetime.min.time():
+        return None
+    if endDate.time() == datetime.min.time():
+        last = endDate.date() - timedelta(days=1)
+    elif endDate.time() >= datetime.max.time().replace(microsecond=0):
+        last = endDate.date()
+    else:
+        return None
+    first = startDate.date()
+    return (first, last) if first <= last else None
+
+
+_DAY_PERIOD_SQL = {
+    'day': "d.day",
+    'week': "date(d.day, '-' || ((CAST(strftime('%w', d.day) AS INTEGER) + 6) % 7) || ' days')",
+    'month': "strftime('%Y-%m-01', d.day)",
+}
+
+
+def _rollup_totals(entity_ids, first_day, last_day, username=None, group_by=None):
+    """Same result shape as _session_totals() (in microseconds), read from daily_totals.
+
+    Reads one row per entity and day, and counts the time spent on those days,
+    so sessions crossing the range boundary contribute the part inside it.
+    """
+    entity_ids = list(entity_ids)
+    if not entity_ids:
+        return {}
+    if group_by is not None and group_by not in _DAY_PERIOD_SQL:
+        raise ValueError(f"group_by must be one of {sorted(_DAY_PERIOD_SQL)}, not {group_by!r}")
+    period = f", {_DAY_PERIOD_SQL[group_by]} AS period" if group_by else ""
+    user_join = "JOIN entities e ON e.id = d.entity_id AND e.username = ?" if username else ""
+    placeholders = ', '.join('?' * len(entity_ids))
+    params = ([username] if username else []) + entity_ids + [first_day.isoformat(), last_day.isoformat()]
+    conn = get_db_connection()
+    rows = conn.execute(f'''
+        SELECT d.entity_id, SUM(d.seconds) AS seconds{period}
+        FROM daily_totals d {user_join}
+        WHERE d.entity_id IN ({placeholders}) AND d.day BETWEEN ? AND ?
+        GROUP BY d.entity_id{", period" if group_by else ""}
+    ''', params)
+    if group_by:
+        return {(r['entity_id'], date.fromisoformat(r['period'])): round(r['seconds'] * US_PER_SECOND) for r in rows}
+    return {r['entity_id']: round(r['seconds'] * US_PER_SECOND) for r in rows}
+
+
+def _report_totals(entity_ids, startDate, endDate, username=None, group_by=None):
+    days = _whole_days(startDate, endDate)
+    if days:
+        return _rollup_totals(entity_ids, days[0], days[1], username, group_by)
+    return _session_totals(entity_ids, startDate, endDate, username, group_by)
+
+
+def loadDailyTotals(entity_ids, first_day, last_day, username=None):
+    """Return {(entity_id, date): seconds} straight from the rollup table."""
+    return {key: us / US_PER_SECOND
+            for key, us in _rollup_totals(entity_ids, first_day, last_day, username, 'day').items()}
+
+
+def _entity_filter(alias, entity_ids, username):
+    """WHERE clauses restricting `alias`.entity_id to a user and/or an id list."""
+    clauses, params = [], []
+    if username:
+        clauses.append(f"{alias}.entity_id IN (SELECT id FROM entities WHERE username = ?)")
+        params.append(username)
+    if entity_ids is not None:
+        entity_ids = list(entity_ids)
+        clauses.append(f"{alias}.entity_id IN ({', '.join('?' * len(entity_ids))})")
+        params.extend(entity_ids)
+    return clauses, params
+
+
+# --- Columnar loaders (NumPy) ---
+# These skip Session/datetime objects entirely: rows are fetched as plain
+# tuples and turned into typed arrays in one step.
+
+def loadSessionColumns(username=None, entity_ids=None, start=None, end=None, include_deleted=False):
+    """Return completed sessions as NumPy arrays.
+
+    Keys: 'id' and 'entity_id' (int64), 'start' and 'end' (datetime64[us]) and
+    'duration' (int64 microseconds).  start/end keep only sessions that lie
+    entirely inside the window.
+    """
+    import numpy as np
+    clauses, params = _entity_filter('s', entity_ids, username)
+    clauses.append("s.end_time IS NOT NULL")
+    if not include_deleted:
+        clauses.append("s.is_deleted = 0")
+    if start is not None:
+        clauses.append("s.start_time >= ?")
+        params.append(to_epoch_us(start))
+    if end is not None:
+        clauses.append("s.end_time <= ?")
+        params.append(to_epoch_us(end))
+    conn = get_db_connection()
+    cursor = conn.execute(
+        f"SELECT s.id, s.entity_id, s.start_time, s.end_time FROM sessions s WHERE {' AND '.join(clauses)}",
+        params
+    )
+    # plain tuples are much cheaper to build than sqlite3.Row objects
+    cursor.row_factory = None
+    data = np.array(cursor.fetchall(), dtype=np.int64).reshape(-1, 4)
+    return {
+        'id': data[:, 0],
+        'entity_id': data[:, 1],
+        'start': data[:, 2].astype('datetime64[us]'),
+        'end': data[:, 3].astype('datetime64[us]'),
+        'duration': data[:, 3] - data[:, 2],
+    }
+
+
+def loadDailyTotalColumns(entity_ids, first_day, last_day, username=None):
+    """Return rollup rows as NumPy arrays: 'entity_id', 'day' (datetime64[D]), 'seconds'."""
+    import numpy as np
+    clauses, params = _entity_filter('d', entity_ids, username)
+    clauses.append("d.day BETWEEN ? AND ?")
+    params += [first_day.isoformat(), last_day.isoformat()]
+    conn = get_db_connection()
+    cursor = conn.execute(
+        f"SELECT d.entity_id, d.day, d.seconds FROM daily_totals d WHERE {' AND '.join(clauses)}", params
+    )
+    cursor.row_factory = None
+    rows = cursor.fetchall()
+    return {
+        'entity_id': np.array([r[0] for r in rows], dtype=np.int64),
+        'day': np.array([r[1] for r in rows], dtype='datetime64[D]'),
+        'seconds': np.array([r[2] for r in rows], dtype=np.float64),
+    }
+
+
+def entity_total_seconds(entity_id, username=None) -> float:
+    """All-time seconds for one entity, summed from its daily rollups."""
+    conn = get_db_connection()
+    user_join = "JOIN entities e ON e.id = d.entity_id AND e.username = ?" if username else ""
+    params = ([username] if username else []) + [entity_id]
+    row = conn.execute(
+        f"SELECT SUM(d.seconds) FROM daily_totals d {user_join} WHERE d.entity_id = ?", params
+    ).fetchone()
+    return row[0] or 0.0
+
+
+def total_session_seconds(entity_id, startDate, endDate, username=None) -> float:
+    """Sum the durations of an entity's completed sessions inside [startDate, endDate].
+
+    Whole-day ranges are answered from daily_totals; anything else is summed
+    from the raw sessions.
+    """
+    return _report_totals([entity_id], startDate, endDate, username).get(entity_id, 0) / US_PER_SECOND
+
+
 def GenerateReport(entity, startDate, endDate, filename='complete_sessions.txt', username=None):
-    allSessions = loadSessionsFromFile(username=username)
-    filteredSessions = [s for s in allSessions if s.entityId == entity.id and s.startTime >= startDate and s.endTime <= endDate]
-    hours, minutes, seconds = calculateTotalTime(filteredSessions)
+    totalSeconds = total_session_seconds(entity.id, startDate, endDate, username=username)
+    hours, minutes, seconds = _split_seconds(totalSeconds)
     return Report(id=0, entityId=entity.id, startDate=startDate, endDate=endDate, totalTimeSpent=(hours, minutes, seconds))
 
 
+def GenerateReports(entities, startDate, endDate, username=None, group_by=None):
+    """Return {entity_id: Report} for many entities from a single grouped query.
+
+    Like GenerateReport, whole-day ranges read the daily rollups.
+
+    `entities` may contain Entity objects or plain ids.  When group_by is
+    'day', 'week' or 'month' each report also carries `buckets`, a dict of
+    period start date -> seconds.
+    """
+    ids = [getattr(e, 'id', e) for e in entities]
+    buckets = None
+    if group_by:
+        buckets = {eid: {} for eid in ids}
+        totals = dict.fromkeys(ids, 0)
+        for (eid, period), us in _report_totals(ids, startDate, endDate, username, group_by).items():
+            buckets[eid][period] = us / US_PER_SECOND
+            totals[eid] += us
+    else:
+        totals = _report_totals(ids, startDate, endDate, username)
+    return {
+        eid: Report(id=0, entityId=eid, startDate=startDate, endDate=endDate,
+                    totalTimeSpent=_split_seconds(totals.get(eid, 0) / US_PER_SECOND),
+                    buckets=buckets[eid] if buckets is not None else None)
+        for eid in ids
+    }
+
+
 def appendSessionToFile(session, filename='complete_sessions.txt'):
     """Append a completed session using SQLite."""
-    conn = get_db_connection()
-    cursor = conn.cursor()
-    start = session.startTime.isoformat() if session.startTime else ''
-    end = session.endTime.isoformat() if session.endTime else ''
-    cursor.execute(
-        "INSERT INTO sessions (entity_id, start_time, end_time) VALUES (?, ?, ?)",
-        (session.entityId, start, end)
+    with _write_transaction() as conn:
+        cursor = conn.cursor()
+        cursor.execute(
+            "INSERT INTO sessions (entity_id, start_time, end_time) VALUES (?, ?, ?)",
+            (session.entityId, to_epoch_us(session.startTime), to_epoch_us(session.endTime))
+        )
+        events = _apply_session_change(conn, None, _session_state(conn, cursor.lastrowid))
+    publish_goal_events(events)
+
+
+# Rows fetched per round trip by the streaming iterators.
+SESSION_BATCH_SIZE = 1000
+
+
+def _stream_sessions(cursor, batch_size):
+    # plain tuples are cheaper than sqlite3.Row; columns are id, entity_id, start, end, is_deleted
+    cursor.row_factory = None
+    try:
+        while True:
+            rows = cursor.fetchmany(batch_size)
+            if not rows:
+                return
+            for sid, entity_id, start_us, end_us, is_deleted in rows:
+                yield Session(sid, from_epoch_us(start_us), from_epoch_us(end_us), entity_id, is_deleted)
+    finally:
+        cursor.close()
+
+
+def iter_sessions(username=None, start=None, end=None, entity_ids=None, include_deleted=False,
+                  batch_size=SESSION_BATCH_SIZE, ordered=False, by_start=False):
+    """Yield completed sessions lazily, fetching `batch_size` rows at a time.
+
+    start/end keep only sessions lying entirely inside the window; with
+    by_start=True they filter on the start alone (start <= startTime < end),
+    like loadSessionPage().  Peak memory is one batch regardless of how much history matches.
+    ordered=True yields them oldest first (walking idx_sessions_start).
+    """
+    clauses, params = _entity_filter('s', entity_ids, username)
+    clauses.append("s.end_time IS NOT NULL")
+    if not include_deleted:
+        clauses.append("s.is_deleted = 0")
+    if start is not None:
+        clauses.append("s.start_time >= ?")
+        params.append(to_epoch_us(start))
+    if end is not None:
+        clauses.append("s.start_time < ?" if by_start else "s.end_time <= ?")
+        params.append(to_epoch_us(end))
+    order = " ORDER BY s.start_time, s.id" if ordered else ""
+    cursor = get_db_connection().execute(
+        "SELECT s.id, s.entity_id, s.start_time, s.end_time, s.is_deleted FROM sessions s "
+        f"WHERE {' AND '.join(clauses)}{order}", params
     )
-    conn.commit()
-    conn.close()
+    return _stream_sessions(cursor, batch_size)
 
 
-def loadSessionsFromFile(filename='complete_sessions.txt', username=None, include_deleted=False):
-    sessions = []
-    conn = get_db_connection()
-    cursor = conn.cursor()
-    
-    deleted_filter = "" if include_deleted else "AND s.is_deleted = 0"
-    
+def iter_started_sessions(username=None, entity_ids=None, batch_size=SESSION_BATCH_SIZE):
+    """Yield running (not yet ended) sessions lazily."""
+    clauses, params = _entity_filter('s', entity_ids, username)
+    clauses.append("s.end_time IS NULL")
+    cursor = get_db_connection().execute(
+        "SELECT s.id, s.entity_id, s.start_time, s.end_time, s.is_deleted FROM sessions s "
+        f"WHERE {' AND '.join(clauses)}", params
+    )
+    return _stream_sessions(cursor, batch_size)
+
+
+def iter_period_totals(entity_ids, first_day, last_day, group_by='day', username=None,
+                       batch_size=SESSION_BATCH_SIZE):
+    """Yield (period start date, entity_id, seconds) from daily_totals, oldest period first.
+
+    Same totals as GenerateReports(group_by=...) over whole days, but streamed
+    `batch_size` rows at a time instead of collected into a dict.
+    """
+    entity_ids = list(entity_ids)
+    if not entity_ids:
+        return
+    if group_by not in _DAY_PERIOD_SQL:
+        raise ValueError(f"group_by must be one of {sorted(_DAY_PERIOD_SQL)}, not {group_by!r}")
+    user_join = "JOIN entities e ON e.id = d.entity_id AND e.username = ?" if username else ""
+    placeholders = ', '.join('?' * len(entity_ids))
+    params = ([username] if username else []) + entity_ids + [first_day.isoformat(), last_day.isoformat()]
+    cursor = get_db_connection().execute(f'''
+        SELECT {_DAY_PERIOD_SQL[group_by]} AS period, d.entity_id, SUM(d.seconds)
+        FROM daily_totals d {user_join}
+        WHERE d.entity_id IN ({placeholders}) AND d.day BETWEEN ? AND ?
+        GROUP BY period, d.entity_id
+        ORDER BY period, d.entity_id
+    ''', params)
+    cursor.row_factory = None
+    try:
+        for batch in iter(lambda: cursor.fetchmany(batch_size), []):
+            for period, entity_id, seconds in batch:
+                yield date.fromisoformat(period), entity_id, seconds
+    finally:
+        cursor.close()
+
+
+SESSION_PAGE_SIZE = 200
+
+
+def loadSessionPage(username=None, entity_ids=None, start=None, end=None, deleted=False,
+                    after=None, limit=SESSION_PAGE_SIZE) -> List[Session]:
+    """One page of completed sessions, newest first, for paged views.
+
+    Keyset pagination: `after` is the (startTime, id) of the last row of the
+    previous page, so every page is an index range scan no matter how deep.
+    start/end filter on the session start (start <= startTime < end);
+    deleted=True pages through the Trash instead of live sessions.
+    """
+    clauses, params = _entity_filter('s', entity_ids, None)
     if username:
-        # Join with entities to filter by user
-        cursor.execute(f'''
-            SELECT s.* FROM sessions s
-            JOIN entities e ON s.entity_id = e.id
-            WHERE e.username = ? AND s.end_time IS NOT NULL {deleted_filter}
-        ''', (username,))
-    else:
-        where_clause = "WHERE end_time IS NOT NULL"
-        if not include_deleted:
-            where_clause += " AND is_deleted = 0"
-        cursor.execute(f"SELECT * FROM sessions {where_clause}")
-        
-    for row in cursor.fetchall():
-        start = _parse_iso_datetime(row['start_time'])
-        end = _parse_iso_datetime(row['end_time'])
-        if start and end:
-            sessions.append(Session(row['id'], start, end, row['entity_id'], row['is_deleted']))
-    conn.close()
-    return sessions
+        # unary + keeps the user filter off idx_sessions_entity_start so the
+        # ORDER BY walks idx_sessions_start instead of sorting all history
+        clauses.append("+s.entity_id IN (SELECT id FROM entities WHERE username = ?)")
+        params.append(username)
+    clauses.append("s.end_time IS NOT NULL")
+    clauses.append("s.is_deleted = ?")
+    params.append(1 if deleted else 0)
+    if start is not None:
+        clauses.append("s.start_time >= ?")
+        params.append(to_epoch_us(start))
+    if end is not None:
+        clauses.append("s.start_time < ?")
+        params.append(to_epoch_us(end))
+    if after is not None:
+        clauses.append("(s.start_time, s.id) < (?, ?)")
+        params.extend((to_epoch_us(after[0]), after[1]))
+    params.append(limit)
+    cursor = get_db_connection().execute(
+        "SELECT s.id, s.entity_id, s.start_time, s.end_time, s.is_deleted FROM sessions s "
+        f"WHERE {' AND '.join(clauses)} ORDER BY s.start_time DESC, s.id DESC LIMIT ?", params
+    )
+    return list(_stream_sessions(cursor, limit))
+
+
+def loadSessionsFromFile(filename='complete_sessions.txt', username=None, include_deleted=False):
+    return list(iter_sessions(username=username, include_deleted=include_deleted))
 
 def delete_session(session_id):
-    conn = get_db_connection()
-    cursor = conn.cursor()
-    cursor.execute("UPDATE sessions SET is_deleted = 1 WHERE id = ?", (session_id,))
-    conn.commit()
-    conn.close()
+    with _write_transaction() as conn:
+        before = _session_state(conn, session_id)
+        conn.execute("UPDATE sessions SET is_deleted = 1 WHERE id = ?", (session_id,))
+        events = _apply_session_change(conn, before, _session_state(conn, session_id))
+    publish_goal_events(events)
 
 def recover_session(session_id):
-    conn = get_db_connection()
-    cursor = conn.cursor()
-    cursor.execute("UPDATE sessions SET is_deleted = 0 WHERE id = ?", (session_id,))
-    conn.commit()
-    conn.close()
+    with _write_transaction() as conn:
+        before = _session_state(conn, session_id)
+        conn.execute("UPDATE sessions SET is_deleted = 0 WHERE id = ?", (session_id,))
+        events = _apply_session_change(conn, before, _session_state(conn, session_id))
+    publish_goal_events(events)
 
 def update_session(session_id, entity_id, start_time, end_time):
-    conn = get_db_connection()
-    cursor = conn.cursor()
-    cursor.execute(
-        "UPDATE sessions SET entity_id = ?, start_time = ?, end_time = ? WHERE id = ?",
-        (entity_id, start_time.isoformat(), end_time.isoformat(), session_id)
-    )
-    conn.commit()
-    conn.close()
+    with _write_transaction() as conn:
+        before = _session_state(conn, session_id)
+        conn.execute(
+            "UPDATE sessions SET entity_id = ?, start_time = ?, end_time = ? WHERE id = ?",
+            (entity_id, to_epoch_us(start_time), to_epoch_us(end_time), session_id)
+        )
+        events = _apply_session_change(conn, before, _session_state(conn, session_id))
+    publish_goal_events(events)
 
 
 def saveSessionsToFile(sessions, filename='complete_sessions.txt'):
@@ -295,36 +1421,17 @@ def saveSessionsToFile(sessions, filename='complete_sessions.txt'):
 def appendStartedSessionToFile(session, filename='started_sessions.txt'):
     """Append a started session in SQLite and update its id."""
     conn = get_db_connection()
-    cursor = conn.cursor()
-    start = session.startTime.isoformat() if session.startTime else ''
-    cursor.execute(
-        "INSERT INTO sessions (entity_id, start_time, end_time) VALUES (?, ?, ?)",
-        (session.entityId, start, None)
-    )
-    session.id = cursor.lastrowid
-    conn.commit()
-    conn.close()
+    with conn:
+        cursor = conn.cursor()
+        cursor.execute(
+            "INSERT INTO sessions (entity_id, start_time, end_time) VALUES (?, ?, ?)",
+            (session.entityId, to_epoch_us(session.startTime), None)
+        )
+        session.id = cursor.lastrowid
     return session.id
 
 def loadStartedSessionsFromFile(filename='started_sessions.txt', username=None):
-    sessions = []
-    conn = get_db_connection()
-    cursor = conn.cursor()
-    if username:
-        cursor.execute('''
-            SELECT s.* FROM sessions s
-            JOIN entities e ON s.entity_id = e.id
-            WHERE e.username = ? AND s.end_time IS NULL
-        ''', (username,))
-    else:
-        cursor.execute("SELECT * FROM sessions WHERE end_time IS NULL")
-        
-    for row in cursor.fetchall():
-        start = _parse_iso_datetime(row['start_time'])
-        if start:
-            sessions.append(Session(row['id'], start, None, row['entity_id'], row['is_deleted']))
-    conn.close()
-    return sessions
+    return list(iter_started_sessions(username=username))
 
 def saveStartedSessionsToFile(sessions, filename='started_sessions.txt'):
     # Manual synchronization not needed for SQLite.
@@ -334,14 +1441,13 @@ def appendEntityToFile(entity, filename='entities.txt', username=None):
     if not username:
         return None
     conn = get_db_connection()
-    cursor = conn.cursor()
-    cursor.execute(
-        "INSERT INTO entities (name, type, description, username) VALUES (?, ?, ?, ?)",
-        (entity.name, entity.type, entity.description, username)
-    )
-    new_id = cursor.lastrowid
-    conn.commit()
-    conn.close()
+    with conn:
+        cursor = conn.cursor()
+        cursor.execute(
+            "INSERT INTO entities (name, type, description, username) VALUES (?, ?, ?, ?)",
+            (entity.name, entity.type, entity.description, username)
+        )
+        new_id = cursor.lastrowid
     return new_id
 
 def loadEntitiesFromFile(filename='entities.txt', username=None):
@@ -355,7 +1461,6 @@ def loadEntitiesFromFile(filename='entities.txt', username=None):
         
     for row in cursor.fetchall():
         entities.append(Entity(row['id'], row['name'], row['type'], row['description']))
-    conn.close()
     return entities
 
 def saveEntitesToFile(entities, filename='entities.txt', username=None):
@@ -363,14 +1468,13 @@ def saveEntitesToFile(entities, filename='entities.txt', username=None):
     if not username:
         return
     conn = get_db_connection()
-    cursor = conn.cursor()
-    for e in entities:
-        cursor.execute(
-            "UPDATE entities SET name = ?, type = ?, description = ? WHERE id = ? AND username = ?",
-            (e.name, e.type, e.description, e.id, username)
-        )
-    conn.commit()
-    conn.close()
+    with conn:
+        cursor = conn.cursor()
+        for e in entities:
+            cursor.execute(
+                "UPDATE entities SET name = ?, type = ?, description = ? WHERE id = ? AND username = ?",
+                (e.name, e.type, e.description, e.id, username)
+            )
 
 
 def startSession(entity):
@@ -380,58 +1484,255 @@ def startSession(entity):
     return session
 
 def endSession(session):
-    conn = get_db_connection()
-    cursor = conn.cursor()
     now = datetime.now()
-    cursor.execute("UPDATE sessions SET end_time = ? WHERE id = ?", (now.isoformat(), session.id))
-    conn.commit()
-    conn.close()
+    with _write_transaction() as conn:
+        before = _session_state(conn, session.id)
+        conn.execute("UPDATE sessions SET end_time = ? WHERE id = ?", (to_epoch_us(now), session.id))
+        events = _apply_session_change(conn, before, _session_state(conn, session.id))
     session.endTime = now
+    publish_goal_events(events)
     return session
 
 def appendGoalToFile(goal, filename='goals.txt'):
+    _check_goal_period(goal.period)
     conn = get_db_connection()
-    cursor = conn.cursor()
-    cursor.execute(
-        "INSERT INTO goals (entity_id, name, target_hours, status) VALUES (?, ?, ?, ?)",
-        (goal.entityId, goal.name, goal.targetHours, goal.status)
-    )
-    new_id = cursor.lastrowid
-    conn.commit()
-    conn.close()
+    with conn:
+        cursor = conn.cursor()
+        cursor.execute(
+            "INSERT INTO goals (entity_id, name, target_hours, status, period) VALUES (?, ?, ?, ?, ?)",
+            (goal.entityId, goal.name, goal.targetHours, goal.status, goal.period)
+        )
+        new_id = cursor.lastrowid
+        events = update_goal_statuses(conn, [goal.entityId])
+    publish_goal_events(events)
     return new_id
 
-def loadGoalsFromFile(filename='goals.txt', username=None):
+def loadGoalsFromFile(filename='goals.txt', username=None, entity_id=None):
     goals = []
     conn = get_db_connection()
     cursor = conn.cursor()
-    if username:
-        cursor.execute('''
-            SELECT g.* FROM goals g
-            JOIN entities e ON g.entity_id = e.id
-            WHERE e.username = ?
-        ''', (username,))
-    else:
-        cursor.execute("SELECT * FROM goals")
-        
+    clauses, params = _entity_filter('g', None if entity_id is None else [entity_id], username)
+    where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+    cursor.execute(f"SELECT g.* FROM goals g {where} ORDER BY g.id", params)
+
     for row in cursor.fetchall():
-        goals.append(Goal(row['id'], row['entity_id'], row['name'], row['target_hours'], row['status']))
-    conn.close()
+        goals.append(Goal(row['id'], row['entity_id'], row['name'], row['target_hours'], row['status'],
+                          row['period']))
     return goals
 
 def saveGoalsToFile(goals, filename='goals.txt'):
-    conn = get_db_connection()
-    cursor = conn.cursor()
+    if not goals:
+        return
     for g in goals:
-        cursor.execute(
-            "UPDATE goals SET name = ?, target_hours = ?, status = ? WHERE id = ?",
-            (g.name, g.targetHours, g.status, g.id)
-        )
-    conn.commit()
-    conn.close()
+        _check_goal_period(g.period)
+    conn = get_db_connection()
+    with conn:
+        cursor = conn.cursor()
+        for g in goals:
+            cursor.execute(
+                "UPDATE goals SET name = ?, target_hours = ?, status = ?, period = ? WHERE id = ?",
+                (g.name, g.targetHours, g.status, g.period, g.id)
+            )
+        # a new target or window can complete (or reopen) the goal right away
+        ids = [g.id for g in goals]
+        cursor.execute(f"SELECT DISTINCT entity_id FROM goals WHERE id IN ({', '.join('?' * len(ids))})", ids)
+        events = update_goal_statuses(conn, [row[0] for row in cursor.fetchall()])
+    publish_goal_events(events)
+
+
+# --- Goal progress ---
+# Progress for many goals comes from one aggregate query over daily_totals:
+# each goal sums its entity's rollup days inside its window (all time, or the
+# calendar day/week/month containing `today`).  Results are cached per thread
+# until anything commits, which data_version (other connections) and
+# total_changes (this connection) reveal without reading any table.
+
+GOAL_PERIODS = ('day', 'week', 'month')
+
+
+class GoalProgress:
+    """A goal and the seconds counted towards it in its current window."""
+    __slots__ = ('goal', 'seconds', 'first_day', 'last_day')
+
+    def __init__(self, goal, seconds, first_day=None, last_day=None):
+        self.goal = goal
+        self.seconds = seconds
+        self.first_day = first_day  # None for all-time goals
+        self.last_day = last_day
+
+    @property
+    def spent_hours(self) -> float:
+        return self.seconds / 3600.0
+
+    @property
+    def fraction(self) -> float:
+        """Share of the target reached, capped at 1.0."""
+        if self.goal.targetHours <= 0:
+            return 1.0
+        return min(self.spent_hours / self.goal.targetHours, 1.0)
+
+    @property
+    def reached(self) -> bool:
+        return self.fraction >= 1.0
+
+
+def _check_goal_period(period):
+    if period is not None and period not in GOAL_PERIODS:
+        raise ValueError(f"goal period must be None or one of {GOAL_PERIODS}, not {period!r}")
+
+
+def goal_window(period, today=None):
+    """(first_day, last_day) of the calendar period containing `today`; (None, None) for all time.
+
+    Weeks start on Monday, as in grouped reports.
+    """
+    _check_goal_period(period)
+    today = today or date.today()
+    if period is None:
+        return None, None
+    if period == 'day':
+        return today, today
+    if period == 'week':
+        first = today - timedelta(days=today.weekday())
+        return first, first + timedelta(days=6)
+    first = today.replace(day=1)
+    return first, (first + timedelta(days=32)).replace(day=1) - timedelta(days=1)
+
+
+def _compute_goal_progress(conn, username, entity_ids, today):
+    windows = {period: goal_window(period, today) for period in GOAL_PERIODS}
+    params = [v for period in GOAL_PERIODS for v in (period, *(d.isoformat() for d in windows[period]))]
+    clauses, filter_params = _entity_filter('g', entity_ids, username)
+    where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+    cursor = conn.execute(f'''
+        WITH w (period, first_day, last_day) AS (VALUES (?, ?, ?), (?, ?, ?), (?, ?, ?))
+        SELECT g.id, g.entity_id, g.name, g.target_hours, g.status, g.period, COALESCE(SUM(d.seconds), 0)
+        FROM goals g
+        LEFT JOIN w ON w.period = g.period
+        LEFT JOIN daily_totals d ON d.entity_id = g.entity_id
+            AND d.day BETWEEN COALESCE(w.first_day, '0000-01-01') AND COALESCE(w.last_day, '9999-12-31')
+        {where}
+        GROUP BY g.id
+        ORDER BY g.id
+    ''', params + filter_params)
+    cursor.row_factory = None
+    return [
+        GoalProgress(Goal(gid, eid, name, target, status, period), seconds, *windows.get(period, (None, None)))
+        for gid, eid, name, target, status, period, seconds in cursor.fetchall()
+    ]
+
+
+def _commit_stamp(conn):
+    """A value that changes whenever any connection commits to the database."""
+    return conn, conn.execute("PRAGMA data_version").fetchone()[0], conn.total_changes
+
+
+def goal_progress(username=None, entity_ids=None, today=None) -> List[GoalProgress]:
+    """Progress of every goal of `username` (and/or of `entity_ids`), ordered by goal id.
+
+    Cached until the next commit; the GoalProgress objects are shared, so do
+    not modify them.
+    """
+    conn = get_db_connection()
+    today = today or date.today()
+    key = (username, None if entity_ids is None else tuple(entity_ids), today)
+    stamp = _commit_stamp(conn)
+    cache = getattr(_local, 'goal_progress', None)
+    if cache is None or cache[0] != stamp:
+        cache = _local.goal_progress = (stamp, {})
+    if key not in cache[1]:
+        cache[1][key] = _compute_goal_progress(conn, username, key[1], today)
+    return list(cache[1][key])
+
+
+# --- Goal events ---
+# Session writes re-evaluate the goals of the entities they touch inside their
+# own transaction, so a goal's status never disagrees with the committed
+# rollups.  Goals that flip are published to subscribers after the commit;
+# callbacks run on the writing thread and must not raise (errors are logged).
+# Status is derived from progress alone: there is no manual completion, and a
+# goal below its target reopens at the next evaluation (a session write, an
+# import, a goal edit or evaluate_goals() at login).
+
+class GoalEvent:
+    """A goal whose status changed; `goal.status` is the new one."""
+    __slots__ = ('goal', 'previous', 'seconds')
+
+    def __init__(self, goal, previous, seconds):
+        self.goal = goal
+        self.previous = previous
+        self.seconds = seconds
+
+    @property
+    def completed(self) -> bool:
+        return self.goal.status == 'Completed'
+
+
+_goal_subscribers = []
+_goal_subscribers_lock = threading.Lock()
+goal_log = logging.getLogger('skilltrack.goals')
+
+
+def subscribe_goal_events(callback):
+    """Call callback([GoalEvent, ...]) after every commit that changes goal statuses."""
+    with _goal_subscribers_lock:
+        _goal_subscribers.append(callback)
+    return callback
+
+
+def unsubscribe_goal_events(callback):
+    with _goal_subscribers_lock:
+        if callback in _goal_subscribers:
+            _goal_subscribers.remove(callback)
+
+
+def publish_goal_events(events):
+    if not events:
+        return
+    with _goal_subscribers_lock:
+        subscribers = list(_goal_subscribers)
+    for callback in subscribers:
+        try:
+            callback(events)
+        except Exception:
+            goal_log.exception("goal event subscriber %r failed", callback)
+
+
+def update_goal_statuses(conn, entity_ids, today=None) -> List[GoalEvent]:
+    """Set the status of `entity_ids`' goals from their progress, in the caller's transaction.
+
+    For writers that manage their own transaction; publish the returned
+    events with publish_goal_events() once it has committed.
+    """
+    entity_ids = list(entity_ids)
+    if not entity_ids:
+        return []
+    events = []
+    for p in _compute_goal_progress(conn, None, entity_ids, today or date.today()):
+        status = 'Completed' if p.reached else 'Incomplete'
+        if p.goal.status != status:
+            events.append(GoalEvent(p.goal, p.goal.status, p.seconds))
+            p.goal.status = status
+    conn.executemany("UPDATE goals SET status = ? WHERE id = ?", [(e.goal.status, e.goal.id) for e in events])
+    return events
+
+
+def _counted(state):
+    return state is not None and state['end_time'] is not None and not state['is_deleted']
+
+
+def _apply_session_change(conn, before, after) -> List[GoalEvent]:
+    """Move a session's rollups from `before` to `after` and re-evaluate the goals this affects."""
+    _update_rollups(conn, before, after)
+    return update_goal_statuses(conn, {s['entity_id'] for s in (before, after) if _counted(s)})
 
-    
-    
-    
 
-   
\ No newline at end of file
+def evaluate_goals(username=None, entity_ids=None, today=None) -> List[GoalEvent]:
+    """Re-evaluate goal statuses outside any session write, e.g. when a new week starts."""
+    with _write_transaction() as conn:
+        clauses, params = _entity_filter('g', entity_ids, username)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        ids = [row[0] for row in conn.execute(f"SELECT DISTINCT g.entity_id FROM goals g {where}", params)]
+        events = update_goal_statuses(conn, ids, today)
+    publish_goal_events(events)
+    return events
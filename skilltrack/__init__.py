@@ -1,2 +1,2 @@
 # skilltrack package init
-__all__ = ["controller"]
+__all__ = ["controller", "export", "importer", "reports", "tasks"]
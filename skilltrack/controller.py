@@ -1,4 +1,4 @@
-from typing import List, Optional
+from typing import Dict, List, Optional
 import os
 import sqlite3
 from logic import (
@@ -12,17 +12,36 @@ from logic import (
     saveStartedSessionsToFile,
     appendSessionToFile,
     loadSessionsFromFile,
+    iter_sessions,
+    loadSessionPage,
     GenerateReport,
+    GenerateReports,
+    entity_total_seconds,
+    loadSessionColumns,
+    loadDailyTotalColumns,
     create_user,
     authenticate_user,
+    issue_auth_token,
+    resolve_auth_token,
+    revoke_auth_token,
     loadUsersFromFile,
     Goal,
+    GoalProgress,
+    GoalEvent,
+    goal_progress,
+    evaluate_goals as logic_evaluate_goals,
+    subscribe_goal_events,
+    unsubscribe_goal_events,
     loadGoalsFromFile,
     appendGoalToFile,
     saveGoalsToFile,
     startSession,
     endSession,
     get_db_connection,
+    close_all,
+    configure_db,
+    database_path,
+    data_version,
     delete_session as logic_delete_session,
     recover_session as logic_recover_session,
     update_session as logic_update_session
@@ -47,31 +66,83 @@ def _user_file(base: str, username: Optional[str]) -> str:
     return os.path.join(userdir, f"{base}.txt")
 
 
+# --- Entity cache ---
+# The current user's entities, indexed by id and by name.  Built on first
+# use and dropped by create/update/delete_entity; it is keyed by username,
+# so switching users never serves another user's entities.
+class _EntityCache:
+    __slots__ = ('database', 'username', 'entities', 'by_id', 'by_name', 'names')
+
+    def __init__(self, database, username, entities):
+        self.database = database
+        self.username = username
+        self.entities = entities
+        self.by_id = {e.id: e for e in entities}
+        self.by_name = {e.name: e for e in entities}
+        self.names = {e.id: e.name for e in entities}
+
+
+_entity_cache: Optional[_EntityCache] = None
+
+
+def _entities() -> _EntityCache:
+    global _entity_cache
+    cache = _entity_cache
+    user = current_user()
+    database = database_path()
+    if cache is None or cache.username != user or cache.database != database:
+        cache = _EntityCache(database, user, loadEntitiesFromFile(username=user))
+        _entity_cache = cache
+    return cache
+
+
+def invalidate_entity_cache():
+    global _entity_cache
+    _entity_cache = None
+
+
 # Controller functions used by UI
 
 def get_entities() -> List[Entity]:
-    return loadEntitiesFromFile(username=current_user())
+    return list(_entities().entities)
+
+
+def get_entity(entity_id: int) -> Optional[Entity]:
+    return _entities().by_id.get(entity_id)
+
+
+def get_entity_by_name(name: str) -> Optional[Entity]:
+    return _entities().by_name.get(name)
+
+
+def entity_name_map() -> Dict[int, str]:
+    """id -> name for the current user's entities (shared; do not modify)."""
+    return _entities().names
 
 
 def create_entity(name: str, type_: str, description: str) -> Entity:
     ent = Entity(id=0, name=name, type=type_, description=description)
-    appendEntityToFile(ent, username=current_user())
+    new_id = appendEntityToFile(ent, username=current_user())
+    if new_id is not None:
+        ent.id = new_id
+    invalidate_entity_cache()
     return ent
 
 
 def delete_entity(entity_id: int) -> bool:
     conn = get_db_connection()
-    cursor = conn.cursor()
-    cursor.execute("DELETE FROM entities WHERE id = ? AND username = ?", (entity_id, current_user()))
-    rows = cursor.rowcount
-    conn.commit()
-    conn.close()
+    with conn:
+        cursor = conn.cursor()
+        cursor.execute("DELETE FROM entities WHERE id = ? AND username = ?", (entity_id, current_user()))
+        rows = cursor.rowcount
+    invalidate_entity_cache()
     return rows > 0
 
 
 def update_entity(entity_id: int, name: str, type_: str, description: str, filename: str = None) -> bool:
     ent = Entity(id=entity_id, name=name, type=type_, description=description)
     saveEntitesToFile([ent], username=current_user())
+    invalidate_entity_cache()
     return True
 
 
@@ -91,6 +162,20 @@ def get_completed_sessions(include_deleted: bool = False):
     return loadSessionsFromFile(username=current_user(), include_deleted=include_deleted)
 
 
+def iter_completed_sessions(start=None, end=None, entity_ids=None, include_deleted: bool = False):
+    """Stream the current user's completed sessions without building a list."""
+    return iter_sessions(username=current_user(), start=start, end=end, entity_ids=entity_ids,
+                         include_deleted=include_deleted)
+
+
+def get_session_page(entity_id=None, start=None, end=None, deleted: bool = False, after=None, limit=None):
+    """Next page of the current user's sessions, newest first (see logic.loadSessionPage)."""
+    kwargs = {} if limit is None else {'limit': limit}
+    return loadSessionPage(username=current_user(),
+                           entity_ids=None if entity_id is None else [entity_id],
+                           start=start, end=end, deleted=deleted, after=after, **kwargs)
+
+
 def add_manual_session(entity_id: int, start_dt, end_dt):
     from logic import Session, appendSessionToFile
     session = Session(id=0, startTime=start_dt, endTime=end_dt, entityId=entity_id)
@@ -114,6 +199,46 @@ def generate_report(entity: Entity, start, end):
     return GenerateReport(entity, start, end, username=current_user())
 
 
+def generate_reports(entity_ids, start, end, group_by: Optional[str] = None):
+    """Reports for several entities at once, keyed by entity id.
+
+    group_by ('day', 'week' or 'month') adds per-period `buckets` to each report.
+    """
+    return GenerateReports(entity_ids, start, end, username=current_user(), group_by=group_by)
+
+
+def get_session_columns(entity_ids=None, start=None, end=None):
+    """Completed sessions of the current user as NumPy columns."""
+    return loadSessionColumns(username=current_user(), entity_ids=entity_ids, start=start, end=end)
+
+
+def get_daily_total_columns(entity_ids, first_day, last_day):
+    """Daily rollup rows of the current user as NumPy columns."""
+    return loadDailyTotalColumns(entity_ids, first_day, last_day, username=current_user())
+
+
+def get_time_spent(entity_id: int) -> float:
+    """All-time seconds recorded for an entity."""
+    return entity_total_seconds(entity_id, username=current_user())
+
+
+# --- Export API ---
+
+def export_sessions(path, entity_id=None, start=None, end=None, fmt=None) -> int:
+    """Stream the current user's completed sessions to a CSV or JSON Lines file."""
+    from skilltrack import export
+    return export.export_sessions(path, current_user(), None if entity_id is None else [entity_id],
+                                  start, end, fmt or export.format_for(path), names=entity_name_map())
+
+
+def export_report(path, entity_ids, first_day, last_day, group_by='day', fmt=None, **options) -> int:
+    """Stream per-period hours of the current user's entities (see skilltrack.export.export_report)."""
+    from skilltrack import export
+    options.setdefault('names', entity_name_map())
+    return export.export_report(path, entity_ids, first_day, last_day, group_by, current_user(),
+                                fmt or export.format_for(path), **options)
+
+
 # --- Authentication API ---
 
 def register_user(username: str, password: str) -> bool:
@@ -130,9 +255,51 @@ def login_user(username: str, password: str) -> bool:
     return ok
 
 
-def logout_user():
+def remember_login() -> Optional[str]:
+    """Return a token that logs the current user in again without the password."""
+    if _current_user is None:
+        return None
+    return issue_auth_token(_current_user)
+
+
+def resume_login(token: str) -> bool:
+    """Log in with a token from remember_login(); no password hashing involved."""
+    global _current_user
+    username = resolve_auth_token(token)
+    if username is None:
+        return False
+    _current_user = username
+    return True
+
+
+def forget_login(token: str):
+    """Revoke a token from remember_login()."""
+    if token:
+        revoke_auth_token(token)
+
+
+def logout_user(token: Optional[str] = None):
+    """Log out, revoking the remembered-login token if one is given."""
     global _current_user
     _current_user = None
+    forget_login(token)
+
+
+def set_database(path=None) -> str:
+    """Switch to the database at `path` (see logic.configure_db) and drop cached entities."""
+    resolved = configure_db(path)
+    invalidate_entity_cache()
+    return resolved
+
+
+def get_data_version() -> int:
+    """Token that changes when another connection commits to the database."""
+    return data_version()
+
+
+def shutdown():
+    """Release the shared database connections before the process exits."""
+    close_all()
 
 
 def current_user() -> Optional[str]:
@@ -150,26 +317,58 @@ def list_users() -> List[str]:
 # --- Goals API ---
 
 def get_goals(entity_id: Optional[int] = None) -> List[Goal]:
-    return loadGoalsFromFile(username=current_user())
+    return loadGoalsFromFile(username=current_user(), entity_id=entity_id)
+
+
+def get_goal_progress(entity_id: Optional[int] = None, today=None) -> List[GoalProgress]:
+    """The current user's goals (or one entity's) with their progress; see logic.goal_progress."""
+    return goal_progress(username=current_user(), entity_ids=None if entity_id is None else [entity_id],
+                         today=today)
+
 
+def evaluate_goals(today=None) -> List[GoalEvent]:
+    """Bring the current user's goal statuses up to date, e.g. after a new week started.
 
-def add_goal(entity_id: int, name: str, target_hours: float) -> Goal:
-    goal = Goal(id=0, entityId=entity_id, name=name, targetHours=target_hours, status='Incomplete')
-    appendGoalToFile(goal)
+    Session writes already do this for their entity; subscribers get the events.
+    """
+    return logic_evaluate_goals(username=current_user(), today=today)
+
+
+def on_goal_events(callback):
+    """Call callback([GoalEvent, ...]) whenever goals complete or reopen; returns an unsubscribe function."""
+    subscribe_goal_events(callback)
+    return lambda: unsubscribe_goal_events(callback)
+
+
+def add_goal(entity_id: int, name: str, target_hours: float, period: Optional[str] = None) -> Goal:
+    """period: None for an all-time goal, or 'day', 'week' or 'month' for the current one."""
+    goal = Goal(id=0, entityId=entity_id, name=name, targetHours=target_hours, status='Incomplete', period=period)
+    goal.id = appendGoalToFile(goal)
     return goal
 
 
-def update_goal(goal_id: int, name: str, target_hours: float, status: str) -> bool:
-    goal = Goal(id=goal_id, entityId=0, name=name, targetHours=target_hours, status=status)
+_UNCHANGED = object()
+
+
+def update_goal(goal_id: int, name: str, target_hours: float, period=_UNCHANGED) -> bool:
+    """Change a goal's name, target or window (kept when `period` is omitted; None means all time).
+
+    Its status follows from its progress.
+    """
+    row = get_db_connection().execute("SELECT status, period FROM goals WHERE id = ?", (goal_id,)).fetchone()
+    if row is None:
+        return False
+    if period is _UNCHANGED:
+        period = row['period']
+    goal = Goal(id=goal_id, entityId=0, name=name, targetHours=target_hours, status=row['status'], period=period)
     saveGoalsToFile([goal])
     return True
 
 
 def delete_goal(goal_id: int) -> bool:
     conn = get_db_connection()
-    cursor = conn.cursor()
-    cursor.execute("DELETE FROM goals WHERE id = ?", (goal_id,))
-    rows = cursor.rowcount
-    conn.commit()
-    conn.close()
+    with conn:
+        cursor = conn.cursor()
+        cursor.execute("DELETE FROM goals WHERE id = ?", (goal_id,))
+        rows = cursor.rowcount
     return rows > 0
@@ -0,0 +1,254 @@
+"""Streaming export of sessions and period reports to CSV or JSON Lines.
+
+    python -m skilltrack.export sessions [--user NAME] [--entity ID ...] [--from DAY] [--to DAY] [-o FILE]
+    python -m skilltrack.export report --from DAY --to DAY [--group-by day|week|month] [--wide] [-o FILE]
+
+Rows go from a database cursor to the output `EXPORT_BATCH_SIZE` at a time,
+so memory stays bounded however much history is exported.  Running totals
+are carried along as the rows pass (one addition per row):
+
+* sessions: one row per completed session, oldest first, with the running
+  total of its entity and of the whole export;
+* report: one row per period and entity with hours and cumulative hours,
+  read from the daily_totals rollup; wide=True writes one row per period
+  with a column per entity instead, as the Full Report's CSV does.
+
+The format is 'csv' or 'jsonl' (one JSON object per line); format_for()
+picks it from a file name.
+"""
+import argparse
+import csv
+import json
+import sys
+from contextlib import contextmanager
+from datetime import date, datetime, timedelta
+
+import logic
+
+EXPORT_BATCH_SIZE = 5000
+FORMATS = ('csv', 'jsonl')
+GROUP_BY_CHOICES = ('day', 'week', 'month')
+
+SESSION_FIELDS = ('id', 'entity_id', 'entity', 'start', 'end', 'seconds',
+                  'entity_total_seconds', 'total_seconds')
+REPORT_FIELDS = ('period', 'entity_id', 'entity', 'hours', 'cumulative_hours')
+
+
+def format_for(path, default='csv') -> str:
+    """'jsonl' for *.jsonl / *.json file names, else `default`."""
+    if str(path).lower().endswith(('.jsonl', '.json')):
+        return 'jsonl'
+    return default
+
+
+@contextmanager
+def _output(out):
+    # a path is opened (and closed) here; file objects are used as they are
+    if hasattr(out, 'write'):
+        yield out
+    else:
+        with open(out, 'w', newline='', encoding='utf-8') as f:
+            yield f
+
+
+class _Writer:
+    """Write rows (tuples in `fields` order) as CSV or JSON Lines, a batch at a time."""
+
+    def __init__(self, f, fmt, fields):
+        if fmt not in FORMATS:
+            raise ValueError(f"format must be one of {FORMATS}, not {fmt!r}")
+        self.f = f
+        self.fields = list(fields)
+        self.rows = 0
+        if fmt == 'csv':
+            self._csv = csv.writer(f)
+            self._csv.writerow(self.fields)
+        else:
+            self._csv = None
+
+    def write(self, batch):
+        if self._csv is not None:
+            self._csv.writerows(batch)
+        else:
+            self.f.writelines(json.dumps(dict(zip(self.fields, row))) + '\n' for row in batch)
+        self.rows += len(batch)
+
+
+def _write_batched(writer, rows, batch_size):
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= batch_size:
+            writer.write(batch)
+            batch = []
+    if batch:
+        writer.write(batch)
+    return writer.rows
+
+
+def _entity_names(username):
+    return {e.id: e.name for e in logic.loadEntitiesFromFile(username=username)}
+
+
+def export_sessions(out, username=None, entity_ids=None, start=None, end=None, fmt='csv',
+                    names=None, batch_size=EXPORT_BATCH_SIZE) -> int:
+    """Write completed sessions to `out` (path or text file), oldest first.
+
+    start/end select sessions that start inside the window (start <= start
+    time < end), the same ones the Sessions tab and `sessions list` show.
+    Returns the number of rows written.
+    """
+    names = names if names is not None else _entity_names(username)
+
+    def rows():
+        per_entity = {}
+        total = 0.0
+        for s in logic.iter_sessions(username, start, end, entity_ids, batch_size=batch_size, ordered=True,
+                                     by_start=True):
+            seconds = (s.endTime - s.startTime).total_seconds()
+            per_entity[s.entityId] = per_entity.get(s.entityId, 0.0) + seconds
+            total += seconds
+            yield (s.id, s.entityId, names.get(s.entityId, ''), s.startTime.isoformat(),
+                   s.endTime.isoformat(), round(seconds, 6), round(per_entity[s.entityId], 6), round(total, 6))
+
+    with _output(out) as f:
+        return _write_batched(_Writer(f, fmt, SESSION_FIELDS), rows(), batch_size)
+
+
+def _period_start(day, group_by):
+    if group_by == 'week':
+        return day - timedelta(days=day.weekday())
+    if group_by == 'month':
+        return day.replace(day=1)
+    return day
+
+
+def _next_period(period, group_by):
+    if group_by == 'week':
+        return period + timedelta(days=7)
+    if group_by == 'month':
+        return date(period.year + period.month // 12, period.month % 12 + 1, 1)
+    return period + timedelta(days=1)
+
+
+def iter_report(entity_ids, first_day, last_day, group_by='day', username=None, batch_size=EXPORT_BATCH_SIZE):
+    """Yield (period start, [seconds per entity in entity_ids order]) for every period.
+
+    Periods run from the one containing first_day up to last_day, including
+    those without any time, and only time on first_day..last_day counts.
+    """
+    if group_by not in GROUP_BY_CHOICES:
+        raise ValueError(f"group_by must be one of {GROUP_BY_CHOICES}, not {group_by!r}")
+    entity_ids = list(entity_ids)
+    columns = {eid: i for i, eid in enumerate(entity_ids)}
+    totals = logic.iter_period_totals(entity_ids, first_day, last_day, group_by, username, batch_size)
+    pending = next(totals, None)
+    period = _period_start(first_day, group_by)
+    while period <= last_day:
+        seconds = [0.0] * len(entity_ids)
+        while pending is not None and pending[0] == period:
+            seconds[columns[pending[1]]] += pending[2]
+            pending = next(totals, None)
+        yield period, seconds
+        period = _next_period(period, group_by)
+
+
+def export_report(out, entity_ids=None, first_day=None, last_day=None, group_by='day', username=None,
+                  fmt='csv', names=None, wide=False, cumulative=True, skip_leading_empty=False,
+                  batch_size=EXPORT_BATCH_SIZE) -> int:
+    """Write per-period hours for `entity_ids` (default: every entity of `username`).
+
+    wide=True writes one row per period with a column per entity holding its
+    cumulative hours (cumulative=False: the hours of that period).
+    skip_leading_empty drops periods before the first one with any time.
+    Returns the number of rows written.
+    """
+    all_names = _entity_names(username)
+    names = names if names is not None else all_names
+    entity_ids = list(entity_ids) if entity_ids is not None else sorted(all_names)
+    last_day = last_day or date.today()
+    first_day = first_day or last_day
+
+    def periods():
+        started = not skip_leading_empty
+        for period, seconds in iter_report(entity_ids, first_day, last_day, group_by, username, batch_size):
+            started = started or any(seconds)
+            if started:
+                yield period, seconds
+
+    def long_rows():
+        running = [0.0] * len(entity_ids)
+        for period, seconds in periods():
+            for i, eid in enumerate(entity_ids):
+                running[i] += seconds[i]
+                yield (period.isoformat(), eid, names.get(eid, ''),
+                       round(seconds[i] / 3600.0, 3), round(running[i] / 3600.0, 3))
+
+    def wide_rows():
+        running = [0.0] * len(entity_ids)
+        for period, seconds in periods():
+            for i in range(len(entity_ids)):
+                running[i] += seconds[i]
+            values = running if cumulative else seconds
+            yield (period.isoformat(),) + tuple(f"{v / 3600.0:.3f}" for v in values)
+
+    with _output(out) as f:
+        if wide:
+            header = ['Period'] + [names.get(eid, f"Entity {eid}") for eid in entity_ids]
+            return _write_batched(_Writer(f, fmt, header), wide_rows(), batch_size)
+        return _write_batched(_Writer(f, fmt, REPORT_FIELDS), long_rows(), batch_size)
+
+
+def _day(value):
+    return date.fromisoformat(value)
+
+
+def add_arguments(parser):
+    """Add the 'sessions' and 'report' subcommands to `parser`."""
+    kinds = parser.add_subparsers(dest='kind', required=True)
+    sessions = kinds.add_parser('sessions', help='completed sessions, oldest first')
+    report = kinds.add_parser('report', help='hours per period and entity')
+    for sub in (sessions, report):
+        sub.add_argument('--user', help='only this user\'s entities')
+        sub.add_argument('--entity', type=int, action='append', dest='entities', metavar='ID',
+                         help='entity id (repeatable; default: all)')
+        sub.add_argument('--from', dest='first_day', type=_day, metavar='YYYY-MM-DD')
+        sub.add_argument('--to', dest='last_day', type=_day, metavar='YYYY-MM-DD')
+        sub.add_argument('--format', choices=FORMATS, help='default: from the output name, else csv')
+        sub.add_argument('-o', '--output', default='-', help='output file (default: stdout)')
+    report.add_argument('--group-by', choices=GROUP_BY_CHOICES, default='day')
+    report.add_argument('--wide', action='store_true', help='one row per period, one column per entity')
+    report.add_argument('--per-period', action='store_true', help='with --wide: hours per period, not cumulative')
+
+
+def run(args) -> int:
+    out = sys.stdout if args.output == '-' else args.output
+    fmt = args.format or format_for(args.output)
+    try:
+        if args.kind == 'sessions':
+            start = datetime.combine(args.first_day, datetime.min.time()) if args.first_day else None
+            end = datetime.combine(args.last_day + timedelta(days=1), datetime.min.time()) if args.last_day else None
+            rows = export_sessions(out, args.user, args.entities, start, end, fmt)
+        else:
+            rows = export_report(out, args.entities, args.first_day, args.last_day, args.group_by, args.user,
+                                 fmt, wide=args.wide, cumulative=not args.per_period)
+    except (OSError, ValueError) as ex:
+        print(f"export failed: {ex}", file=sys.stderr)
+        return 1
+    if out is not sys.stdout:
+        print(f"{rows} rows written to {args.output}")
+    return 0
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--db', help=f'database file (default: ${logic.DB_ENV_VAR} or {logic.DB_FILE})')
+    add_arguments(parser)
+    args = parser.parse_args(argv)
+    if args.db:
+        logic.configure_db(args.db)
+    return run(args)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
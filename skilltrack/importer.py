@@ -0,0 +1,374 @@
+"""Bulk import of the legacy text files (and CSV files in the same layout).
+
+    python -m skilltrack.importer [--user NAME] [--db PATH] [--batch-size N] PATH [PATH ...]
+
+The legacy layout is what the app wrote before it moved to SQLite:
+
+* users.txt               username,salt,pwdhash,iterations,created_at
+* entities.txt            id,name,type,description
+* complete_sessions.txt   id,start,end,entity_id   (started_sessions.txt: empty end)
+* goals.txt               id,entity_id,name,target_hours,status
+* data/<user>/...         the same files for one user
+
+A PATH that is a directory is imported as such a tree: users.txt first, then
+every data/<user>/ folder for its user, then the top-level files for --user
+(skipped without one).  A PATH that is a file is imported as sessions for
+--user.  Entity ids in session and goal files are resolved through the
+entities.txt next to them (or the tree's top-level one); each referenced
+legacy entity becomes (or is matched by name and type to) an entity of the
+importing user.  Files without a catalog must use that user's database ids.
+
+Timestamps may use ' ' or 'T' between date and time.  Rows are parsed as
+they are read and written with executemany() in one transaction per
+`batch_size` rows, together with their daily_totals rollups and the status
+of the affected entities' goals (see logic.update_goal_statuses).  Rows that
+exactly repeat an existing session (same entity, start and end), goal or
+user are skipped, so importing the same files twice is harmless.
+"""
+import argparse
+import csv
+import os
+import sys
+import time
+from datetime import datetime
+
+import logic
+
+IMPORT_BATCH_SIZE = 50000
+
+SESSION_FILES = ('complete_sessions.txt', 'started_sessions.txt')
+
+
+class ImportStats:
+    """Per-kind counters ('users', 'entities', 'sessions', 'goals') for one import."""
+
+    KINDS = ('users', 'entities', 'sessions', 'goals')
+
+    def __init__(self):
+        self.read = dict.fromkeys(self.KINDS, 0)
+        self.inserted = dict.fromkeys(self.KINDS, 0)
+        self.duplicates = dict.fromkeys(self.KINDS, 0)
+        self.malformed = dict.fromkeys(self.KINDS, 0)
+        self.files = []
+        self.seconds = 0.0
+
+    @property
+    def rows_per_second(self) -> float:
+        rows = sum(self.read.values())
+        return rows / self.seconds if self.seconds else 0.0
+
+    def as_dict(self):
+        return {
+            'files': self.files,
+            'read': self.read,
+            'inserted': self.inserted,
+            'duplicates': self.duplicates,
+            'malformed': self.malformed,
+            'seconds': round(self.seconds, 3),
+            'rows_per_second': round(self.rows_per_second, 1),
+        }
+
+    def summary(self) -> str:
+        lines = [f"{'':10}{'read':>10}{'inserted':>10}{'dupes':>10}{'bad':>10}"]
+        for kind in self.KINDS:
+            lines.append(f"{kind:10}{self.read[kind]:>10}{self.inserted[kind]:>10}"
+                         f"{self.duplicates[kind]:>10}{self.malformed[kind]:>10}")
+        lines.append(f"{sum(self.read.values())} rows in {self.seconds:.2f} s "
+                     f"({self.rows_per_second:,.0f} rows/s)")
+        return '\n'.join(lines)
+
+
+_HEADER_FIELDS = ('id', 'username')
+
+
+def _rows(path):
+    """Yield the comma-separated fields of each line, skipping blanks and a header."""
+    with open(path, newline='', encoding='utf-8') as f:
+        for lineno, fields in enumerate(csv.reader(f), 1):
+            if not fields:
+                continue
+            if lineno == 1 and fields[0].strip().lower() in _HEADER_FIELDS:
+                continue  # CSV header
+            yield fields
+
+
+def _timestamp_us(value):
+    # fromisoformat() accepts both the ' ' and the 'T' separator
+    value = value.strip()
+    return logic.to_epoch_us(datetime.fromisoformat(value)) if value else None
+
+
+def read_entity_catalog(path, stats=None):
+    """Return {legacy id: (name, type, description)} from an entities.txt.
+
+    Lines without an integer id, a name and a type are skipped and counted
+    as malformed entities in `stats`.
+    """
+    catalog = {}
+    if path and os.path.exists(path):
+        for fields in _rows(path):
+            try:
+                if len(fields) < 3:
+                    raise ValueError(fields)
+                catalog[int(fields[0])] = (fields[1], fields[2], ','.join(fields[3:]))
+            except ValueError:
+                if stats is not None:
+                    stats.read['entities'] += 1
+                    stats.malformed['entities'] += 1
+    return catalog
+
+
+class _EntityMap:
+    """Resolve legacy entity ids of one file to the importing user's entity ids."""
+
+    def __init__(self, username, catalog, stats):
+        self.username = username
+        self.catalog = catalog
+        self.stats = stats
+        self.ids = {}
+
+    def resolve(self, conn, legacy_id):
+        """Database id for `legacy_id`, creating the entity if needed; None if unknown."""
+        if legacy_id in self.ids:
+            return self.ids[legacy_id]
+        if not self.catalog:
+            row = conn.execute("SELECT id FROM entities WHERE id = ? AND username = ?",
+                               (legacy_id, self.username)).fetchone()
+            entity_id = row[0] if row else None
+        elif legacy_id not in self.catalog:
+            entity_id = None
+        else:
+            name, type_, description = self.catalog[legacy_id]
+            self.stats.read['entities'] += 1
+            row = conn.execute("SELECT id FROM entities WHERE username = ? AND name = ? AND type = ?",
+                               (self.username, name, type_)).fetchone()
+            if row:
+                entity_id = row[0]
+                self.stats.duplicates['entities'] += 1
+            else:
+                entity_id = conn.execute(
+                    "INSERT INTO entities (name, type, description, username) VALUES (?, ?, ?, ?)",
+                    (name, type_, description, self.username)
+                ).lastrowid
+                self.stats.inserted['entities'] += 1
+        self.ids[legacy_id] = entity_id
+        return entity_id
+
+
+def _batches(rows, size):
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def _write_batches(rows, size, write):
+    """Call write(conn, batch) for each batch inside its own BEGIN IMMEDIATE ... COMMIT.
+
+    write() may return goal events, which are published once its batch commits.
+    """
+    conn = logic.get_db_connection()
+    for batch in _batches(rows, size):
+        with conn:
+            conn.execute("BEGIN IMMEDIATE")
+            events = write(conn, batch)
+        logic.publish_goal_events(events)
+
+
+def import_users(path, stats=None) -> ImportStats:
+    """Import users.txt; password hashes are kept as they are (PBKDF2-SHA256)."""
+    stats = stats or ImportStats()
+
+    def parse():
+        for fields in _rows(path):
+            stats.read['users'] += 1
+            try:
+                username, salt, pwdhash, iterations, created_at = (f.strip() for f in fields[:5])
+                yield username, salt, pwdhash, int(iterations), created_at
+            except ValueError:
+                stats.malformed['users'] += 1
+
+    def write(conn, batch):
+        cursor = conn.executemany(
+            "INSERT OR IGNORE INTO users (username, salt, pwdhash, iterations, created_at) "
+            "VALUES (?, ?, ?, ?, ?)", batch
+        )
+        stats.inserted['users'] += cursor.rowcount
+        stats.duplicates['users'] += len(batch) - cursor.rowcount
+
+    _write_batches(parse(), IMPORT_BATCH_SIZE, write)
+    stats.files.append(path)
+    return stats
+
+
+def import_sessions(path, username, catalog=None, stats=None, batch_size=IMPORT_BATCH_SIZE) -> ImportStats:
+    """Stream a sessions file (id,start,end,entity_id) into `username`'s sessions."""
+    stats = stats or ImportStats()
+    entities = _EntityMap(username, catalog, stats)
+    seen = {}  # entity id -> {(start_us, end_us)} already stored or imported
+
+    def parse():
+        for fields in _rows(path):
+            stats.read['sessions'] += 1
+            try:
+                start_us = _timestamp_us(fields[1])
+                end_us = _timestamp_us(fields[2]) if len(fields) > 3 else None
+                legacy_entity = int(fields[-1])
+            except (ValueError, IndexError):
+                stats.malformed['sessions'] += 1
+                continue
+            if start_us is None or (end_us is not None and end_us < start_us):
+                stats.malformed['sessions'] += 1
+                continue
+            yield legacy_entity, start_us, end_us
+
+    def known(conn, entity_id):
+        if entity_id not in seen:
+            seen[entity_id] = {(start_us, end_us) for start_us, end_us in conn.execute(
+                "SELECT start_time, end_time FROM sessions WHERE entity_id = ?", (entity_id,)
+            )}
+        return seen[entity_id]
+
+    def write(conn, batch):
+        rows = []
+        for legacy_entity, start_us, end_us in batch:
+            entity_id = entities.resolve(conn, legacy_entity)
+            if entity_id is None:
+                stats.malformed['sessions'] += 1
+                continue
+            keys = known(conn, entity_id)
+            if (start_us, end_us) in keys:
+                stats.duplicates['sessions'] += 1
+                continue
+            keys.add((start_us, end_us))
+            rows.append((entity_id, start_us, end_us))
+        conn.executemany("INSERT INTO sessions (entity_id, start_time, end_time) VALUES (?, ?, ?)", rows)
+        logic.add_daily_totals(conn, rows)
+        stats.inserted['sessions'] += len(rows)
+        return logic.update_goal_statuses(conn, {entity_id for entity_id, _, _ in rows})
+
+    _write_batches(parse(), batch_size, write)
+    stats.files.append(path)
+    return stats
+
+
+def import_goals(path, username, catalog=None, stats=None) -> ImportStats:
+    """Import a goals file (id,entity_id,name,target_hours,status) for `username`."""
+    stats = stats or ImportStats()
+    entities = _EntityMap(username, catalog, stats)
+
+    def parse():
+        for fields in _rows(path):
+            stats.read['goals'] += 1
+            try:
+                legacy_entity = int(fields[1])
+                name = ','.join(fields[2:-2])
+                target = float(fields[-2])
+                status = fields[-1].strip()
+            except (ValueError, IndexError):
+                stats.malformed['goals'] += 1
+                continue
+            yield legacy_entity, name, target, status
+
+    def write(conn, batch):
+        touched = set()
+        for legacy_entity, name, target, status in batch:
+            entity_id = entities.resolve(conn, legacy_entity)
+            if entity_id is None:
+                stats.malformed['goals'] += 1
+                continue
+            if conn.execute("SELECT 1 FROM goals WHERE entity_id = ? AND name = ? AND target_hours = ?",
+                            (entity_id, name, target)).fetchone():
+                stats.duplicates['goals'] += 1
+                continue
+            conn.execute("INSERT INTO goals (entity_id, name, target_hours, status) VALUES (?, ?, ?, ?)",
+                         (entity_id, name, target, status))
+            stats.inserted['goals'] += 1
+            touched.add(entity_id)
+        # legacy statuses were set by hand; bring them in line with the imported time
+        return logic.update_goal_statuses(conn, touched)
+
+    _write_batches(parse(), IMPORT_BATCH_SIZE, write)
+    stats.files.append(path)
+    return stats
+
+
+def _import_folder(folder, username, catalog, stats, batch_size):
+    for name in SESSION_FILES:
+        path = os.path.join(folder, name)
+        if os.path.exists(path):
+            import_sessions(path, username, catalog, stats, batch_size)
+    path = os.path.join(folder, 'goals.txt')
+    if os.path.exists(path):
+        import_goals(path, username, catalog, stats)
+
+
+def import_tree(root, username=None, stats=None, batch_size=IMPORT_BATCH_SIZE) -> ImportStats:
+    """Import a legacy data directory (see the module docstring)."""
+    stats = stats or ImportStats()
+    users = os.path.join(root, 'users.txt')
+    if os.path.exists(users):
+        import_users(users, stats)
+    catalog = read_entity_catalog(os.path.join(root, 'entities.txt'), stats)
+    data = os.path.join(root, 'data')
+    if os.path.isdir(data):
+        for user in sorted(os.listdir(data)):
+            folder = os.path.join(data, user)
+            if os.path.isdir(folder):
+                own = read_entity_catalog(os.path.join(folder, 'entities.txt'), stats) or catalog
+                _import_folder(folder, user, own, stats, batch_size)
+    if username:
+        _import_folder(root, username, catalog, stats, batch_size)
+    return stats
+
+
+def import_paths(paths, username=None, batch_size=IMPORT_BATCH_SIZE) -> ImportStats:
+    """Import each directory (legacy tree) or sessions file in `paths` and time the whole run."""
+    stats = ImportStats()
+    started = time.perf_counter()
+    for path in paths:
+        if os.path.isdir(path):
+            import_tree(path, username, stats, batch_size)
+        elif not username:
+            raise ValueError(f"a username is required to import {path}")
+        else:
+            catalog = read_entity_catalog(os.path.join(os.path.dirname(path), 'entities.txt'), stats)
+            import_sessions(path, username, catalog, stats, batch_size)
+    stats.seconds = time.perf_counter() - started
+    return stats
+
+
+def add_arguments(parser):
+    parser.add_argument('paths', nargs='+', metavar='PATH',
+                        help='legacy data directory or sessions file (.txt/.csv)')
+    parser.add_argument('--user', help='owner of top-level files and of single session files')
+    parser.add_argument('--batch-size', type=int, default=IMPORT_BATCH_SIZE,
+                        help='rows per write transaction')
+
+
+def run(args) -> int:
+    try:
+        stats = import_paths(args.paths, args.user, args.batch_size)
+    except (OSError, ValueError) as ex:
+        print(f"import failed: {ex}", file=sys.stderr)
+        return 1
+    print(stats.summary())
+    return 0
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    add_arguments(parser)
+    parser.add_argument('--db', help=f'database file (default: ${logic.DB_ENV_VAR} or {logic.DB_FILE})')
+    args = parser.parse_args(argv)
+    if args.db:
+        logic.configure_db(args.db)
+    return run(args)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,142 @@
+"""Vectorized period x entity aggregation for the Full Report.
+
+Works on the column dicts returned by logic.loadSessionColumns() and
+logic.loadDailyTotalColumns(): every row is mapped to a period index and an
+entity index with array arithmetic, then accumulated with np.add.at.
+"""
+from datetime import date
+from typing import List, Optional
+
+import numpy as np
+
+GROUP_BY_CHOICES = ('day', 'week', 'month')
+
+_LABEL_FORMATS = {'day': '%m-%d', 'week': '%Y-%m-%d', 'month': '%Y-%m'}
+
+
+class PeriodMatrix:
+    """Seconds per (period, entity) plus the derived series used for plots and CSV."""
+
+    def __init__(self, periods, entity_ids, seconds, totals, group_by):
+        self.periods = periods            # datetime64[D] period starts, ascending
+        self.entity_ids = entity_ids      # column order of `seconds`
+        self.seconds = seconds            # float64 array, shape (len(periods), len(entity_ids))
+        self.totals = totals              # seconds per entity over every input row
+        self.group_by = group_by
+
+    @property
+    def hours(self):
+        return self.seconds / 3600.0
+
+    @property
+    def cumulative_hours(self):
+        return np.cumsum(self.seconds, axis=0) / 3600.0
+
+    def period_dates(self) -> List[date]:
+        return self.periods.astype(object).tolist()
+
+    def labels(self) -> List[str]:
+        fmt = _LABEL_FORMATS[self.group_by]
+        return [d.strftime(fmt) for d in self.period_dates()]
+
+    def column(self, entity_id) -> int:
+        return self.entity_ids.index(entity_id)
+
+
+def period_start(days, group_by):
+    """Map datetime64 values to the start of their day, Monday-week or month."""
+    days = np.asarray(days).astype('datetime64[D]')
+    if group_by == 'day':
+        return days
+    if group_by == 'week':
+        # 1970-01-01 was a Thursday, so (n + 3) % 7 is the weekday with Monday = 0
+        n = days.astype(np.int64)
+        return days - ((n + 3) % 7).astype('timedelta64[D]')
+    if group_by == 'month':
+        return days.astype('datetime64[M]').astype('datetime64[D]')
+    raise ValueError(f"group_by must be one of {GROUP_BY_CHOICES}, not {group_by!r}")
+
+
+def period_range(first_day, last_day, group_by):
+    """Every period start from the one containing first_day up to last_day."""
+    first = period_start(np.datetime64(first_day, 'D'), group_by)
+    last = np.datetime64(last_day, 'D')
+    if group_by == 'month':
+        months = np.arange(first.astype('datetime64[M]'), last.astype('datetime64[M]') + 1)
+        return months.astype('datetime64[D]')
+    step = 7 if group_by == 'week' else 1
+    return np.arange(first, last + 1, step, dtype='datetime64[D]')
+
+
+def period_matrix(entity_col, when, seconds, entity_ids, group_by,
+                  first_day: Optional[date] = None, last_day: Optional[date] = None) -> PeriodMatrix:
+    """Bucket rows into a (period x entity) matrix of seconds.
+
+    entity_col/when/seconds are parallel arrays (e.g. a session's entity id,
+    start and duration in seconds, or a rollup's entity, day and seconds).
+    Periods cover first_day..last_day, defaulting to the span of `when`; rows
+    outside that span still count towards `totals`.
+    """
+    entity_ids = list(entity_ids)
+    entity_col = np.asarray(entity_col, dtype=np.int64)
+    seconds = np.asarray(seconds, dtype=np.float64)
+    days = np.asarray(when).astype('datetime64[D]')
+
+    order = np.array(entity_ids, dtype=np.int64)
+    sorter = np.argsort(order)
+    pos = np.searchsorted(order, entity_col, sorter=sorter)
+    pos = np.clip(pos, 0, max(len(order) - 1, 0))
+    known = (order[sorter][pos] == entity_col) if len(order) else np.zeros(len(entity_col), bool)
+    cols = sorter[pos] if len(order) else pos
+
+    totals = np.zeros(len(entity_ids), dtype=np.float64)
+    np.add.at(totals, cols[known], seconds[known])
+
+    if first_day is None or last_day is None:
+        if not known.any():
+            empty = np.array([], dtype='datetime64[D]')
+            return PeriodMatrix(empty, entity_ids, np.zeros((0, len(entity_ids))), totals, group_by)
+        first_day = first_day or days[known].min()
+        last_day = last_day or days[known].max()
+    periods = period_range(first_day, last_day, group_by)
+
+    keys = period_start(days, group_by)
+    rows = np.searchsorted(periods, keys)
+    inside = known & (rows < len(periods))
+    inside[inside] &= periods[rows[inside]] == keys[inside]
+
+    matrix = np.zeros((len(periods), len(entity_ids)), dtype=np.float64)
+    np.add.at(matrix, (rows[inside], cols[inside]), seconds[inside])
+    return PeriodMatrix(periods, entity_ids, matrix, totals, group_by)
+
+
+def period_chunks(first_day, last_day, group_by, periods_per_chunk):
+    """Split first_day..last_day into consecutive runs of whole periods.
+
+    Returns [(chunk_first, chunk_last), ...] as dates; each chunk can be
+    loaded and bucketed on its own and the results stacked with
+    concat_matrices(), which lets long reports be built (and shown) in parts.
+    """
+    periods = period_range(first_day, last_day, group_by)
+    first = np.datetime64(first_day, 'D')
+    last = np.datetime64(last_day, 'D')
+    chunks = []
+    for i in range(0, len(periods), periods_per_chunk):
+        lo = max(periods[i], first)
+        nxt = i + periods_per_chunk
+        hi = periods[nxt] - np.timedelta64(1, 'D') if nxt < len(periods) else last
+        chunks.append((lo.astype(object), hi.astype(object)))
+    return chunks
+
+
+def concat_matrices(parts) -> PeriodMatrix:
+    """Stack matrices of consecutive chunks (same entity columns) into one."""
+    parts = list(parts)
+    first = parts[0]
+    return PeriodMatrix(
+        np.concatenate([p.periods for p in parts]),
+        first.entity_ids,
+        np.vstack([p.seconds for p in parts]),
+        np.sum([p.totals for p in parts], axis=0),
+        first.group_by,
+    )
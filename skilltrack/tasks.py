@@ -0,0 +1,194 @@
+"""Background tasks for the Qt GUI.
+
+TaskRunner runs plain callables (usually controller functions) on a
+QThreadPool (task_pool() unless given another) and hands their results back on the GUI thread through Qt
+signals.  Every task is submitted under a key such as 'reports'; submitting
+again under the same key supersedes the earlier task, whose result is then
+dropped instead of overwriting newer data.
+
+Long-running work can be started with submit_job() instead: the function then
+receives a Job it uses to report progress and to notice cancellation.
+"""
+import itertools
+import logging
+import threading
+import time
+
+from PyQt6 import sip
+from PyQt6.QtCore import QCoreApplication, QObject, QRunnable, QThreadPool, pyqtSignal
+
+
+log = logging.getLogger(__name__)
+
+_pool = None
+
+
+def task_pool() -> QThreadPool:
+    """The pool TaskRunners share by default.
+
+    Unlike QThreadPool.globalInstance(), whose idle threads exit after 30 s,
+    its threads never expire, so a long-running app does not keep replacing
+    worker threads and the database connections they open.  A new pool is
+    made if the application that owned the last one was destroyed.
+    """
+    global _pool
+    if _pool is None or sip.isdeleted(_pool):
+        _pool = QThreadPool()
+        _pool.setExpiryTimeout(-1)
+    return _pool
+
+
+class _TaskSignals(QObject):
+    # created on the GUI thread, so queued emits from workers land there
+    done = pyqtSignal(int, object)
+    failed = pyqtSignal(int, object)
+    progress = pyqtSignal(int, object)
+
+
+class Cancelled(Exception):
+    """Raised by Job.check() once the job has been cancelled or superseded."""
+
+
+class Job:
+    """Handle passed as the first argument to functions started by submit_job()."""
+
+    def __init__(self, token, signals):
+        self._token = token
+        self._signals = signals
+        self._cancel = threading.Event()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancel.is_set()
+
+    def cancel(self):
+        self._cancel.set()
+
+    def check(self):
+        """Raise Cancelled if the job should stop; call between units of work."""
+        if self._cancel.is_set():
+            raise Cancelled()
+
+    def progress(self, value):
+        """Send `value` to the submitter's on_progress callback on the GUI thread."""
+        self._signals.progress.emit(self._token, value)
+
+
+class _Task(QRunnable):
+    def __init__(self, token, fn, args, kwargs, signals, job=None):
+        super().__init__()
+        self.token = token
+        self.fn = fn
+        self.args = (job,) + args if job is not None else args
+        self.kwargs = kwargs
+        self.signals = signals
+
+    def run(self):
+        try:
+            result = self.fn(*self.args, **self.kwargs)
+        except Exception as ex:
+            self.signals.failed.emit(self.token, ex)
+            return
+        self.signals.done.emit(self.token, result)
+
+
+class TaskRunner(QObject):
+    """Submit work off the GUI thread and receive the newest result per key."""
+
+    # (key, busy): a key turns busy on its first pending task and idle once
+    # its newest task has been delivered or cancelled
+    busyChanged = pyqtSignal(str, bool)
+
+    def __init__(self, parent=None, pool=None):
+        super().__init__(parent)
+        self.pool = pool or task_pool()
+        self._tokens = itertools.count(1)
+        self._latest = {}   # key -> token of the newest task
+        self._tasks = {}    # token -> (key, on_result, on_error, on_progress, job, signals)
+
+    def submit(self, key, fn, *args, on_result=None, on_error=None, **kwargs) -> int:
+        """Run fn(*args, **kwargs) on the pool and call on_result(value) on the GUI thread.
+
+        on_error(exception) is called instead if fn raises.  Neither is
+        called if another task is submitted under `key` (or the key is
+        cancelled) before this one finishes.
+        """
+        return self._start(key, fn, args, kwargs, on_result, on_error)
+
+    def submit_job(self, key, fn, *args, on_progress=None, on_result=None, on_error=None, **kwargs) -> int:
+        """Like submit(), but run fn(job, *args, **kwargs) with a cancellable Job.
+
+        Values passed to job.progress() reach on_progress(value) on the GUI
+        thread.  Superseding or cancelling the key also cancels the job, so
+        fn stops at its next job.check().
+        """
+        return self._start(key, fn, args, kwargs, on_result, on_error, on_progress, with_job=True)
+
+    def _start(self, key, fn, args, kwargs, on_result, on_error, on_progress=None, with_job=False):
+        token = next(self._tokens)
+        signals = _TaskSignals()
+        signals.done.connect(self._on_done)
+        signals.failed.connect(self._on_failed)
+        signals.progress.connect(self._on_progress)
+        job = Job(token, signals) if with_job else None
+        previous = self._latest.get(key)
+        if previous is not None:
+            self._cancel_job(previous)
+        self._latest[key] = token
+        self._tasks[token] = (key, on_result, on_error, on_progress, job, signals)
+        self.pool.start(_Task(token, fn, args, kwargs, signals, job))
+        if previous is None:
+            self.busyChanged.emit(key, True)
+        return token
+
+    def cancel(self, key):
+        """Drop the result of the pending task under `key`, if any, and cancel its job."""
+        token = self._latest.pop(key, None)
+        if token is not None:
+            self._cancel_job(token)
+            self.busyChanged.emit(key, False)
+
+    def _cancel_job(self, token):
+        job = self._tasks[token][4]
+        if job is not None:
+            job.cancel()
+
+    def is_busy(self, key) -> bool:
+        return key in self._latest
+
+    def wait(self, timeout_ms=30000) -> bool:
+        """Block until every submitted task has finished and been delivered."""
+        deadline = time.monotonic() + timeout_ms / 1000.0
+        while self._tasks and time.monotonic() < deadline:
+            self.pool.waitForDone(50)
+            QCoreApplication.processEvents()
+        return not self._tasks
+
+    def _finish(self, token):
+        key, on_result, on_error, _progress, _job, _signals = self._tasks.pop(token)
+        if self._latest.get(key) != token:
+            return None  # superseded or cancelled
+        del self._latest[key]
+        self.busyChanged.emit(key, False)
+        return on_result, on_error
+
+    def _on_progress(self, token, value):
+        task = self._tasks.get(token)
+        if task is None or self._latest.get(task[0]) != token or task[3] is None:
+            return
+        task[3](value)
+
+    def _on_done(self, token, result):
+        callbacks = self._finish(token)
+        if callbacks and callbacks[0] is not None:
+            callbacks[0](result)
+
+    def _on_failed(self, token, error):
+        key = self._tasks[token][0]
+        callbacks = self._finish(token)
+        if callbacks is None or isinstance(error, Cancelled):
+            return
+        if callbacks[1] is not None:
+            callbacks[1](error)
+        else:
+            log.error("Background task %r failed", key, exc_info=(type(error), error, error.__traceback__))
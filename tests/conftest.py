@@ -0,0 +1,13 @@
+import pytest
+
+import logic
+import skilltrack.controller as controller
+
+
+@pytest.fixture(autouse=True)
+def isolated_db():
+    """Run every test against its own empty in-memory database."""
+    controller.set_database(logic.MEMORY_DB)
+    yield
+    controller.logout_user()
+    controller.set_database(None)
@@ -25,3 +25,43 @@ def test_users_file_format(tmp_path):
     u = users['carol']
     assert u.username == 'carol'
     assert u.salt and u.pwdhash and u.iterations
+
+
+def test_login_rehashes_when_kdf_parameters_change(monkeypatch):
+    import logic
+    monkeypatch.setattr(logic, 'KDF_ITERATIONS', 1000)
+    monkeypatch.setattr(logic, 'KDF_ALGORITHM', 'pbkdf2_sha256')
+    assert create_user('dave', 'pw') is True
+    before = loadUsersFromFile()['dave']
+    assert (before.algorithm, before.iterations) == ('pbkdf2_sha256', 1000)
+
+    logic.configure_kdf(algorithm='pbkdf2_sha512', iterations=2000)
+    assert authenticate_user('dave', 'wrong') is False
+    assert loadUsersFromFile()['dave'].pwdhash == before.pwdhash
+    assert authenticate_user('dave', 'pw') is True
+    after = loadUsersFromFile()['dave']
+    assert (after.algorithm, after.iterations) == ('pbkdf2_sha512', 2000)
+    assert after.pwdhash != before.pwdhash
+    assert authenticate_user('dave', 'pw') is True
+
+
+def test_remembered_login_tokens(monkeypatch):
+    from datetime import timedelta
+    import logic
+    import skilltrack.controller as controller
+    monkeypatch.setattr(logic, 'KDF_ITERATIONS', 1000)
+    create_user('erin', 'pw')
+    assert controller.login_user('erin', 'pw')
+    token = controller.remember_login()
+    controller.logout_user()
+    # the database keeps only a hash of the token
+    stored = logic.get_db_connection().execute("SELECT token_hash FROM auth_tokens").fetchall()
+    assert [r[0] for r in stored] != [token]
+
+    assert controller.resume_login(token) and controller.current_user() == 'erin'
+    assert controller.resume_login('not-a-token') is False
+    controller.logout_user(token)
+    assert controller.resume_login(token) is False
+
+    expired = logic.issue_auth_token('erin', ttl=timedelta(seconds=-1))
+    assert logic.resolve_auth_token(expired) is None
@@ -0,0 +1,26 @@
+import logic
+from benchmarks import bench_logic, workload
+
+
+def _session_rows():
+    return [tuple(r) for r in logic.get_db_connection().execute(
+        "SELECT entity_id, start_time, end_time, is_deleted FROM sessions ORDER BY id")]
+
+
+def test_workload_is_deterministic_and_consistent():
+    work = workload.generate(2, 3, 40, days=60, seed=7)
+    first = _session_rows()
+    assert len(first) == 2 * 3 * 40 + 2  # plus one running timer per user
+    assert work.entities == {'user000': [1, 2, 3], 'user001': [4, 5, 6]}
+    assert logic.rebuild_rollups(verify_only=True) == []
+    assert logic.authenticate_user('user001', workload.PASSWORD)
+
+    logic.configure_db(logic.MEMORY_DB)
+    workload.generate(2, 3, 40, days=60, seed=7)
+    assert _session_rows() == first
+
+
+def test_every_benchmark_case_runs():
+    work = workload.generate(1, 2, 20, days=30)
+    for name, fn in bench_logic.cases(work).items():
+        fn()
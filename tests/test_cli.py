@@ -0,0 +1,85 @@
+import csv
+import io
+import json
+import os
+import subprocess
+import sys
+from datetime import datetime
+
+import logic
+from logic import Entity, Session, appendSessionToFile
+import SkillTrackCLi as cli
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _entity(name, username='cli'):
+    return logic.appendEntityToFile(Entity(0, name, 'Skill', ''), username=username)
+
+
+def test_start_status_stop_by_name(capsys):
+    rust = _entity('Rust')
+    _entity('Rust', username='other')  # same name, another user
+    assert cli.main(['--user', 'cli', 'start', 'rust']) == 0
+    assert cli.main(['--user', 'cli', 'start', 'Rust']) == 1
+    assert 'already running' in capsys.readouterr().err
+
+    assert cli.main(['--user', 'cli', 'status', '--format', 'json']) == 0
+    rows = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    assert [r['entity'] for r in rows] == ['Rust']
+
+    assert cli.main(['--user', 'cli', 'stop']) == 0
+    assert 'Stopped Rust' in capsys.readouterr().out
+    assert not list(logic.iter_started_sessions(entity_ids=[rust]))
+    assert cli.main(['--user', 'cli', 'stop']) == 1
+
+
+def test_report_totals_and_grouped_csv(capsys):
+    a, b = _entity('A'), _entity('B')
+    appendSessionToFile(Session(0, datetime(2024, 1, 2, 9), datetime(2024, 1, 2, 10, 30), a))
+    appendSessionToFile(Session(0, datetime(2024, 1, 9, 9), datetime(2024, 1, 9, 9, 30), b))
+
+    assert cli.main(['--user', 'cli', 'report', '--from', '2024-01-01', '--to', '2024-01-14',
+                     '--format', 'json']) == 0
+    rows = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    assert [(r['entity'], r['hours']) for r in rows] == [('A', 1.5), ('B', 0.5)]
+
+    assert cli.main(['--user', 'cli', 'report', '--from', '2024-01-01', '--to', '2024-01-14',
+                     '--group-by', 'week', '--entity', 'B', '--format', 'csv']) == 0
+    rows = list(csv.DictReader(io.StringIO(capsys.readouterr().out)))
+    assert [(r['period'], r['hours']) for r in rows] == [('2024-01-01', '0.0'), ('2024-01-08', '0.5')]
+
+
+def test_sessions_list_pages_newest_first(capsys, monkeypatch):
+    a = _entity('A')
+    for day in range(1, 6):
+        appendSessionToFile(Session(0, datetime(2024, 1, day, 9), datetime(2024, 1, day, 10), a))
+    monkeypatch.setattr(logic, 'SESSION_PAGE_SIZE', 2)
+
+    with logic.track_queries() as stats:
+        assert cli.main(['--user', 'cli', 'sessions', 'list', '--limit', '4', '--format', 'csv']) == 0
+    rows = list(csv.DictReader(io.StringIO(capsys.readouterr().out)))
+    assert [r['start'][:10] for r in rows] == ['2024-01-05', '2024-01-04', '2024-01-03', '2024-01-02']
+    assert stats.rows == 1 + 4  # the entities, then two pages of two
+
+
+def test_user_after_the_command(capsys):
+    a = _entity('A')
+    appendSessionToFile(Session(0, datetime(2024, 1, 2, 9), datetime(2024, 1, 2, 10), a))
+
+    assert cli.main(['report', '--user', 'cli', '--from', '2024-01-01', '--to', '2024-01-07',
+                     '--format', 'json']) == 0
+    rows = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    assert [(r['entity'], r['hours']) for r in rows] == [('A', 1.0)]
+
+    assert cli.main(['--user', 'other', 'sessions', 'list', '--user', 'cli', '--format', 'csv']) == 0
+    rows = list(csv.DictReader(io.StringIO(capsys.readouterr().out)))
+    assert [r['start'][:10] for r in rows] == ['2024-01-02']
+
+
+def test_does_not_import_qt(tmp_path):
+    script = ("import sys, SkillTrackCLi; SkillTrackCLi.main(['status']); "
+              "sys.exit(any(m.startswith(('PyQt6', 'matplotlib')) for m in sys.modules))")
+    env = dict(os.environ, SKILLTRACK_DB=str(tmp_path / 'cli.db'))
+    result = subprocess.run([sys.executable, '-c', script], cwd=ROOT, env=env, capture_output=True, text=True)
+    assert result.returncode == 0, result.stderr
@@ -0,0 +1,68 @@
+import csv
+import io
+import json
+from datetime import date, datetime
+
+import logic
+from logic import Entity, Session, appendSessionToFile
+from skilltrack import export
+
+
+def _entity(name, username='exp'):
+    return logic.appendEntityToFile(Entity(0, name, 'Skill', ''), username=username)
+
+
+def test_export_sessions_streams_oldest_first_with_running_totals():
+    a, b = _entity('A'), _entity('B')
+    appendSessionToFile(Session(0, datetime(2024, 1, 3, 9), datetime(2024, 1, 3, 10), a))
+    appendSessionToFile(Session(0, datetime(2024, 1, 1, 9), datetime(2024, 1, 1, 9, 30), a))
+    appendSessionToFile(Session(0, datetime(2024, 1, 2, 9), datetime(2024, 1, 2, 9, 15), b))
+
+    out = io.StringIO()
+    assert export.export_sessions(out, 'exp', batch_size=2) == 3
+    rows = list(csv.DictReader(io.StringIO(out.getvalue())))
+    assert [r['entity'] for r in rows] == ['A', 'B', 'A']
+    assert [float(r['entity_total_seconds']) for r in rows] == [1800.0, 900.0, 5400.0]
+    assert [float(r['total_seconds']) for r in rows] == [1800.0, 2700.0, 6300.0]
+
+
+def test_export_report_fills_gaps_and_accumulates():
+    a = _entity('A')
+    appendSessionToFile(Session(0, datetime(2024, 1, 30, 10), datetime(2024, 1, 30, 12), a))
+    appendSessionToFile(Session(0, datetime(2024, 3, 5, 10), datetime(2024, 3, 5, 11), a))
+
+    out = io.StringIO()
+    export.export_report(out, [a], date(2024, 1, 15), date(2024, 3, 31), 'month', 'exp', fmt='jsonl')
+    rows = [json.loads(line) for line in out.getvalue().splitlines()]
+    assert [(r['period'], r['hours'], r['cumulative_hours']) for r in rows] == [
+        ('2024-01-01', 2.0, 2.0), ('2024-02-01', 0.0, 2.0), ('2024-03-01', 1.0, 3.0),
+    ]
+
+
+def test_export_report_wide_matches_full_report_layout(tmp_path):
+    a, b = _entity('A'), _entity('B')
+    appendSessionToFile(Session(0, datetime(2024, 5, 8, 10), datetime(2024, 5, 8, 11), a))
+    appendSessionToFile(Session(0, datetime(2024, 5, 9, 10), datetime(2024, 5, 9, 10, 30), b))
+
+    path = tmp_path / 'report.csv'
+    export.export_report(str(path), [a, b], date(2024, 5, 1), date(2024, 5, 10), 'day', 'exp',
+                         wide=True, skip_leading_empty=True)
+    lines = path.read_text(encoding='utf-8').splitlines()
+    assert lines[:3] == ['Period,A,B', '2024-05-08,1.000,0.000', '2024-05-09,1.000,0.500']
+    assert len(lines) == 4
+
+
+def test_export_sessions_matches_the_listed_page(tmp_path):
+    a = _entity('A')
+    for start, end in [(datetime(2024, 6, 1, 9), datetime(2024, 6, 1, 10)),
+                       (datetime(2024, 6, 2, 23), datetime(2024, 6, 3, 1)),   # ends after the range
+                       (datetime(2024, 5, 31, 23), datetime(2024, 6, 1, 1)),  # starts before it
+                       (datetime(2024, 6, 3, 9), datetime(2024, 6, 3, 10))]:
+        appendSessionToFile(Session(0, start, end, a))
+    start, end = datetime(2024, 6, 1), datetime(2024, 6, 3)  # what the Sessions tab passes for 1-2 June
+
+    out = io.StringIO()
+    export.export_sessions(out, 'exp', [a], start, end)
+    exported = [int(r['id']) for r in csv.DictReader(io.StringIO(out.getvalue()))]
+    listed = [s.id for s in logic.loadSessionPage('exp', [a], start, end)]
+    assert sorted(exported) == sorted(listed) and len(listed) == 2
@@ -0,0 +1,80 @@
+from datetime import date
+
+import logic
+from skilltrack import importer
+
+USERS = "ana,00ff,abcd,100000,2026-01-02T10:28:28.537123\n"
+ENTITIES = "1,DSA,Skill,Algorithms, mostly\n2,Site,Project,\n"
+SESSIONS = (
+    "1,2026-01-01 08:00:00.000000,2026-01-01 09:00:00.000000,1\n"
+    "1,2026-01-01 08:00:00.000000,2026-01-01 09:00:00.000000,1\n"  # exact duplicate
+    "2,2026-01-02T23:30:00.000000,2026-01-03T00:30:00.000000,2\n"
+    "3,not a date,2026-01-02T10:00:00,1\n"
+    "4,2026-01-04T10:00:00,2026-01-04T11:00:00,9\n"  # unknown entity
+)
+
+
+def _tree(tmp_path):
+    (tmp_path / 'users.txt').write_text(USERS, encoding='utf-8')
+    (tmp_path / 'entities.txt').write_text(ENTITIES, encoding='utf-8')
+    folder = tmp_path / 'data' / 'ana'
+    folder.mkdir(parents=True)
+    (folder / 'complete_sessions.txt').write_text(SESSIONS, encoding='utf-8')
+    (folder / 'goals.txt').write_text("1,2,Ship it,10.0,Incomplete\n", encoding='utf-8')
+    return tmp_path
+
+
+def test_import_tree_maps_entities_and_skips_duplicates(tmp_path):
+    stats = importer.import_paths([str(_tree(tmp_path))])
+    assert stats.inserted == {'users': 1, 'entities': 2, 'sessions': 2, 'goals': 1}
+    assert stats.duplicates['sessions'] == 1
+    assert stats.malformed['sessions'] == 2
+
+    entities = {e.name: e for e in logic.loadEntitiesFromFile(username='ana')}
+    assert entities['DSA'].description == 'Algorithms, mostly'
+    site = entities['Site'].id
+    assert [g.entityId for g in logic.loadGoalsFromFile(username='ana')] == [site]
+    totals = logic.loadDailyTotals([site], date(2026, 1, 2), date(2026, 1, 3))
+    assert totals == {(site, date(2026, 1, 2)): 1800.0, (site, date(2026, 1, 3)): 1800.0}
+    assert logic.rebuild_rollups(verify_only=True) == []
+
+
+def test_import_is_idempotent_and_batches(tmp_path):
+    root = str(_tree(tmp_path))
+    importer.import_paths([root], batch_size=1)
+    again = importer.import_paths([root], batch_size=1)
+    assert again.inserted == {'users': 0, 'entities': 0, 'sessions': 0, 'goals': 0}
+    assert again.duplicates['sessions'] == 3
+    assert len(list(logic.iter_sessions(username='ana'))) == 2
+
+
+def test_import_csv_file_uses_database_entity_ids(tmp_path):
+    eid = logic.appendEntityToFile(logic.Entity(0, 'Go', 'Skill', ''), username='bo')
+    f = tmp_path / 'sessions.csv'
+    f.write_text(f"id,start,end,entity_id\n7,2026-02-01T10:00:00,2026-02-01T10:15:00,{eid}\n",
+                 encoding='utf-8')
+    assert importer.main([str(f), '--user', 'bo']) == 0
+    assert logic.entity_total_seconds(eid) == 900.0
+
+
+def test_import_completes_goals(tmp_path):
+    eid = logic.appendEntityToFile(logic.Entity(0, 'Go', 'Skill', ''), username='bo')
+    logic.appendGoalToFile(logic.Goal(0, eid, 'Quarter hour', 0.25, 'Incomplete'))
+    received = []
+    logic.subscribe_goal_events(received.extend)
+    try:
+        f = tmp_path / 'sessions.csv'
+        f.write_text(f"1,2026-02-01T10:00:00,2026-02-01T10:20:00,{eid}\n", encoding='utf-8')
+        importer.import_paths([str(f)], 'bo')
+    finally:
+        logic.unsubscribe_goal_events(received.extend)
+    assert [(e.goal.name, e.completed) for e in received] == [('Quarter hour', True)]
+    assert logic.loadGoalsFromFile(username='bo')[0].status == 'Completed'
+
+
+def test_malformed_catalog_lines_are_counted_not_fatal(tmp_path):
+    _tree(tmp_path)
+    (tmp_path / 'entities.txt').write_text("x,Broken,Skill,\n3\n" + ENTITIES, encoding='utf-8')
+    stats = importer.import_paths([str(tmp_path)])
+    assert stats.malformed['entities'] == 2
+    assert stats.inserted['entities'] == 2 and stats.inserted['sessions'] == 2
@@ -2,7 +2,9 @@ import os
 import tempfile
 from datetime import datetime, timedelta
 
-from logic import Session, appendSessionToFile, loadSessionsFromFile, appendStartedSessionToFile, loadStartedSessionsFromFile, GenerateReport, Entity
+import pytest
+
+from logic import Session, appendSessionToFile, loadSessionsFromFile, appendStartedSessionToFile, loadStartedSessionsFromFile, GenerateReport, Entity, calculateTotalTime
 
 
 def test_load_sessions_skips_malformed(tmp_path):
@@ -63,3 +65,323 @@ def test_update_entity(tmp_path):
     assert len(ents) == 1
     assert ents[0].name == 'NewName'
 
+
+def test_connection_is_shared_and_closed_by_close_all(tmp_path):
+    import threading
+    import logic
+    logic.configure_db(str(tmp_path / "wal.db"))
+    conn = logic.get_db_connection()
+    assert logic.get_db_connection() is conn
+    assert conn.execute("PRAGMA journal_mode").fetchone()[0] == 'wal'
+
+    # other threads get their own connection
+    seen = []
+    t = threading.Thread(target=lambda: seen.append(logic.get_db_connection()))
+    t.start()
+    t.join()
+    assert seen and seen[0] is not conn
+
+    logic.close_all()
+    fresh = logic.get_db_connection()
+    assert fresh is not conn
+    assert fresh.execute("SELECT 1").fetchone()[0] == 1
+
+
+def test_connection_closes_when_its_thread_exits(tmp_path):
+    import sqlite3
+    import threading
+    import logic
+    logic.configure_db(str(tmp_path / "threads.db"))
+    main = logic.get_db_connection()
+    seen = []
+    for _ in range(20):
+        t = threading.Thread(target=lambda: seen.append(logic.get_db_connection()))
+        t.start()
+        t.join()
+    assert list(logic._connections) == [main]
+    with pytest.raises(sqlite3.ProgrammingError):
+        seen[0].execute("SELECT 1")
+
+
+def test_database_is_configurable_and_lazy(tmp_path, monkeypatch):
+    import threading
+    import logic
+    # in-memory databases are shared across threads and fresh per configure_db()
+    logic.configure_db(logic.MEMORY_DB)
+    appendSessionToFile(Session(0, datetime(2013, 1, 1, 9), datetime(2013, 1, 1, 10), 8301))
+    counts = []
+    t = threading.Thread(target=lambda: counts.append(len(loadSessionsFromFile())))
+    t.start()
+    t.join()
+    assert counts == [1]
+    logic.configure_db(logic.MEMORY_DB)
+    assert loadSessionsFromFile() == []
+    # SKILLTRACK_DB is read on first use; nothing is created before that
+    db = tmp_path / "env.db"
+    monkeypatch.setenv(logic.DB_ENV_VAR, str(db))
+    logic.configure_db(None)
+    assert logic.database_path() == str(db) and not db.exists()
+    assert logic.get_schema_version() == logic.SCHEMA_VERSION
+    assert db.exists()
+
+
+def test_legacy_database_upgrades_in_place(tmp_path, monkeypatch):
+    import sqlite3
+    import logic
+    db = tmp_path / "legacy.db"
+    legacy = sqlite3.connect(str(db))
+    legacy.execute("CREATE TABLE sessions (id INTEGER PRIMARY KEY AUTOINCREMENT, entity_id INTEGER NOT NULL, "
+                   "start_time TEXT NOT NULL, end_time TEXT, is_deleted INTEGER DEFAULT 0)")
+    # legacy rows mix ' ' and 'T' separators
+    legacy.execute("INSERT INTO sessions (entity_id, start_time, end_time) VALUES (1, '2020-01-01T09:00:00', '2020-01-01T10:00:00')")
+    legacy.execute("INSERT INTO sessions (entity_id, start_time, end_time) VALUES (1, '2020-01-02 09:00:00.250000', '2020-01-02 09:30:00.250000')")
+    legacy.commit()
+    legacy.close()
+
+    logic.configure_db(str(db))
+    logic.init_db()
+    conn = logic.get_db_connection()
+    assert logic.get_schema_version(conn) == logic.SCHEMA_VERSION
+    indexes = {r['name'] for r in conn.execute("SELECT name FROM sqlite_master WHERE type = 'index'")}
+    assert {'idx_sessions_entity_start', 'idx_sessions_running', 'idx_entities_username', 'idx_goals_entity'} <= indexes
+    rows = conn.execute("SELECT start_time, end_time FROM sessions ORDER BY id").fetchall()
+    assert [r['end_time'] - r['start_time'] for r in rows] == [3600 * 10**6, 1800 * 10**6]
+    assert logic.from_epoch_us(rows[1]['start_time']) == datetime(2020, 1, 2, 9, 0, 0, 250000)
+    # running migrate again is a no-op
+    assert logic.migrate(conn) == logic.SCHEMA_VERSION
+
+
+def test_legacy_migration_keeps_rows_after_an_unparsable_batch(tmp_path, monkeypatch):
+    import sqlite3
+    import logic
+    db = tmp_path / "legacy.db"
+    legacy = sqlite3.connect(str(db))
+    legacy.execute("CREATE TABLE sessions (id INTEGER PRIMARY KEY AUTOINCREMENT, entity_id INTEGER NOT NULL, "
+                   "start_time TEXT NOT NULL, end_time TEXT, is_deleted INTEGER DEFAULT 0)")
+    legacy.executemany("INSERT INTO sessions (entity_id, start_time, end_time) VALUES (1, ?, ?)",
+                       [('garbage', None), ('2020-01-01 09:00:00', 'garbage'),
+                        ('2020-01-02 09:00:00', '2020-01-02 10:00:00'), ('2020-01-03 09:00:00', None)])
+    legacy.commit()
+    legacy.close()
+    monkeypatch.setattr(logic, 'MIGRATION_BATCH_SIZE', 2)
+
+    logic.configure_db(str(db))
+    logic.init_db()
+    rows = logic.get_db_connection().execute("SELECT id, end_time FROM sessions ORDER BY id").fetchall()
+    assert [(r['id'], r['end_time'] is None) for r in rows] == [(3, False), (4, True)]
+
+
+def test_generate_report_filters_in_sql():
+    import logic
+    base = datetime(2019, 6, 1, 9, 0, 0)
+    inside = Session(0, base, base + timedelta(minutes=45), 4242)
+    outside = Session(0, base - timedelta(days=3), base - timedelta(days=3, minutes=-30), 4242)
+    other = Session(0, base, base + timedelta(hours=2), 4243)
+    for s in (inside, outside, other):
+        appendSessionToFile(s)
+    deleted = Session(0, base + timedelta(hours=3), base + timedelta(hours=4), 4242)
+    appendSessionToFile(deleted)
+    deleted_id = logic.get_db_connection().execute("SELECT MAX(id) FROM sessions").fetchone()[0]
+    logic.delete_session(deleted_id)
+
+    report = GenerateReport(Entity(4242, 'E', 'Skill', ''), datetime(2019, 6, 1), datetime(2019, 6, 2))
+    assert report.totalTimeSpent == (0, 45, 0)
+
+
+def test_reports_clip_sessions_crossing_midnight_on_both_paths():
+    import logic
+    entity = Entity(4244, 'E', 'Skill', '')
+    appendSessionToFile(Session(0, datetime(2019, 7, 1, 23), datetime(2019, 7, 2, 1), entity.id))
+    appendSessionToFile(Session(0, datetime(2019, 7, 1, 10), datetime(2019, 7, 1, 11), entity.id))
+
+    def hms(start, end):
+        return GenerateReport(entity, start, end).totalTimeSpent
+    # whole day (rollups) and almost the whole day (raw sessions) agree
+    assert hms(datetime(2019, 7, 1), datetime(2019, 7, 1, 23, 59, 59)) == (2, 0, 0)
+    assert hms(datetime(2019, 7, 1), datetime(2019, 7, 1, 23, 59, 58)) == (1, 59, 58)
+    assert hms(datetime(2019, 7, 2, 0, 30), datetime(2019, 7, 2, 12)) == (0, 30, 0)
+    grouped = logic.GenerateReports([entity.id], datetime(2019, 7, 1, 10, 30), datetime(2019, 7, 2, 0, 30),
+                                    group_by='day')[entity.id]
+    assert grouped.buckets == {datetime(2019, 7, 1).date(): 2 * 3600}  # 0.5 h + 1.5 h, by start day
+
+
+def test_epoch_codec_round_trips():
+    import logic
+    dt = datetime(2024, 2, 29, 23, 59, 59, 999999)
+    assert logic.from_epoch_us(logic.to_epoch_us(dt)) == dt
+    assert logic.to_epoch_us(None) is None and logic.from_epoch_us(None) is None
+
+
+def test_generate_reports_batches_entities_and_buckets():
+    from logic import GenerateReports
+    # Monday 2018-01-01 and Wednesday 2018-01-10
+    appendSessionToFile(Session(0, datetime(2018, 1, 1, 9), datetime(2018, 1, 1, 10), 5101))
+    appendSessionToFile(Session(0, datetime(2018, 1, 3, 9), datetime(2018, 1, 3, 9, 30), 5101))
+    appendSessionToFile(Session(0, datetime(2018, 1, 10, 9), datetime(2018, 1, 10, 11), 5102))
+
+    start, end = datetime(2018, 1, 1), datetime(2018, 1, 31, 23, 59, 59)
+    reports = GenerateReports([5101, 5102, 5103], start, end)
+    assert reports[5101].totalTimeSpent == (1, 30, 0)
+    assert reports[5102].totalTimeSpent == (2, 0, 0)
+    assert reports[5103].totalTimeSpent == (0, 0, 0)
+
+    weekly = GenerateReports([5101, 5102], start, end, group_by='week')
+    assert weekly[5101].buckets == {datetime(2018, 1, 1).date(): 5400.0}
+    assert weekly[5102].buckets == {datetime(2018, 1, 8).date(): 7200.0}
+    assert weekly[5101].totalTimeSpent == (1, 30, 0)
+
+
+def test_iter_sessions_streams_in_batches():
+    import types
+    import logic
+    for day in range(1, 6):
+        appendSessionToFile(Session(0, datetime(2015, 1, day, 8), datetime(2015, 1, day, 8, 10), 8101))
+    it = logic.iter_sessions(entity_ids=[8101], start=datetime(2015, 1, 2), end=datetime(2015, 1, 5), batch_size=2)
+    assert isinstance(it, types.GeneratorType)
+    assert calculateTotalTime(it) == (0, 30, 0)
+    assert len(loadSessionsFromFile()) >= 5
+
+
+def test_session_pages_follow_keyset():
+    import logic
+    for day in range(1, 8):
+        appendSessionToFile(Session(0, datetime(2014, 3, day, 9), datetime(2014, 3, day, 10), 8201))
+    appendSessionToFile(Session(0, datetime(2014, 3, 7, 9), datetime(2014, 3, 7, 9, 30), 8201))
+    seen, after = [], None
+    while True:
+        page = logic.loadSessionPage(entity_ids=[8201], after=after, limit=3)
+        seen.extend(page)
+        if len(page) < 3:
+            break
+        after = (page[-1].startTime, page[-1].id)
+    assert len(seen) == 8 and len({s.id for s in seen}) == 8
+    assert [(s.startTime, s.id) for s in seen] == sorted(((s.startTime, s.id) for s in seen), reverse=True)
+    dated = logic.loadSessionPage(entity_ids=[8201], start=datetime(2014, 3, 2), end=datetime(2014, 3, 4))
+    assert [s.startTime.day for s in dated] == [3, 2]
+    logic.delete_session(seen[0].id)
+    assert [s.id for s in logic.loadSessionPage(entity_ids=[8201], deleted=True)] == [seen[0].id]
+
+
+def test_records_are_slotted():
+    import logic
+    records = [Session(1, None, None, 2), Entity(1, 'n', 't', 'd'), logic.Goal(1, 2, 'g', 1.0, 'Incomplete'),
+               logic.Report(0, 1, None, None, (0, 0, 0)), logic.User('u', 's', 'h', 1, None)]
+    for record in records:
+        assert not hasattr(record, '__dict__')
+
+
+def test_track_queries_counts_latency_rows_and_callers():
+    import threading
+    import logic
+    for day in range(1, 4):
+        appendSessionToFile(Session(0, datetime(2013, 5, day, 9), datetime(2013, 5, day, 10), 8301))
+    with logic.track_queries() as stats:
+        assert len(list(logic.iter_sessions(entity_ids=[8301], batch_size=1))) == 3
+        # statements from other threads count too
+        worker = threading.Thread(target=GenerateReport, args=(Entity(8301, 'e', 'Skill', ''),
+                                                               datetime(2013, 5, 1), datetime(2013, 5, 4)))
+        worker.start()
+        worker.join()
+    selects = {s.caller: s.count for s in stats.stats() if s.sql.startswith('SELECT')}
+    assert selects == {'logic.iter_sessions': 1, 'logic.GenerateReport': 1}
+    # the worker's first call also opened (and tuned) its own connection
+    assert stats.by_caller()['logic.GenerateReport'] > 1
+    streamed = next(s for s in stats.stats() if s.caller == 'logic.iter_sessions')
+    assert streamed.rows == 3 and streamed.total_ms > 0
+    assert stats.top(1)[0].total_ms == max(s.total_ms for s in stats.stats())
+    assert 'logic.iter_sessions' in stats.report()
+
+    # nothing is recorded once the block has exited
+    count = stats.statements
+    logic.iter_sessions(entity_ids=[8301])
+    assert stats.statements == count
+
+
+def test_goal_progress_windows_and_cache():
+    import threading
+    import logic
+    from datetime import date
+    eid = logic.appendEntityToFile(Entity(0, 'Piano', 'Skill', ''), username='gp')
+    for day in (1, 8, 9):  # Mon 1 Jan, Mon 8 Jan, Tue 9 Jan 2024
+        appendSessionToFile(Session(0, datetime(2024, 1, day, 9), datetime(2024, 1, day, 11), eid))
+    for period in (None, 'day', 'week', 'month'):
+        logic.appendGoalToFile(logic.Goal(0, eid, f"4h {period}", 4.0, 'Incomplete', period))
+
+    progress = logic.goal_progress(username='gp', today=date(2024, 1, 10))
+    assert [(p.goal.period, p.spent_hours, p.reached) for p in progress] == [
+        (None, 6.0, True), ('day', 0.0, False), ('week', 4.0, True), ('month', 6.0, True)]
+    assert (progress[2].first_day, progress[2].last_day) == (date(2024, 1, 8), date(2024, 1, 14))
+
+    # served from the cache until a commit, from this thread or another one
+    assert logic.goal_progress(username='gp', today=date(2024, 1, 10))[1] is progress[1]
+    worker = threading.Thread(target=appendSessionToFile,
+                              args=(Session(0, datetime(2024, 1, 10, 9), datetime(2024, 1, 10, 10), eid),))
+    worker.start()
+    worker.join()
+    assert logic.goal_progress(username='gp', today=date(2024, 1, 10))[1].spent_hours == 1.0
+    logic.saveGoalsToFile([logic.Goal(progress[1].goal.id, eid, 'daily', 0.5, 'Incomplete', 'day')])
+    assert logic.goal_progress(username='gp', today=date(2024, 1, 10))[1].reached
+    assert logic.goal_progress(username='other', today=date(2024, 1, 10)) == []
+
+
+def test_session_writes_flip_goal_statuses_and_publish_after_commit():
+    import logic
+    a = logic.appendEntityToFile(Entity(0, 'A', 'Skill', ''), username='ge')
+    b = logic.appendEntityToFile(Entity(0, 'B', 'Skill', ''), username='ge')
+    goal_id = logic.appendGoalToFile(logic.Goal(0, a, '1h', 1.0, 'Incomplete'))
+    logic.appendGoalToFile(logic.Goal(0, b, '1h', 1.0, 'Incomplete'))
+    received = []
+
+    def on_events(events):
+        assert not logic.get_db_connection().in_transaction  # only after the commit
+        received.extend((e.goal.id, e.previous, e.goal.status) for e in events)
+    logic.subscribe_goal_events(on_events)
+    try:
+        appendSessionToFile(Session(0, datetime(2024, 2, 1, 9), datetime(2024, 2, 1, 9, 40), a))
+        assert received == []
+        with logic.track_queries() as stats:
+            appendSessionToFile(Session(0, datetime(2024, 2, 2, 9), datetime(2024, 2, 2, 9, 30), a))
+        assert received == [(goal_id, 'Incomplete', 'Completed')]
+        assert {s.count for s in stats.stats() if s.sql.startswith('UPDATE goals')} == {1}
+
+        session_id = logic.loadSessionPage(entity_ids=[a])[0].id
+        logic.delete_session(session_id)
+        logic.recover_session(session_id)
+        logic.update_session(session_id, b, datetime(2024, 2, 2, 9), datetime(2024, 2, 2, 9, 30))  # moved away
+        assert [r[2] for r in received] == ['Completed', 'Incomplete', 'Completed', 'Incomplete']
+        assert {g.entityId: g.status for g in logic.loadGoalsFromFile(username='ge')} == {
+            a: 'Incomplete', b: 'Incomplete'}
+    finally:
+        logic.unsubscribe_goal_events(on_events)
+
+
+def test_editing_a_goal_keeps_its_derived_status():
+    import logic
+    from skilltrack import controller
+    eid = logic.appendEntityToFile(Entity(0, 'A', 'Skill', ''), username='ed')
+    appendSessionToFile(Session(0, datetime(2024, 3, 1, 9), datetime(2024, 3, 1, 11), eid))
+    goal = logic.Goal(0, eid, '1h', 1.0, 'Incomplete')
+    goal.id = logic.appendGoalToFile(goal)
+    received = []
+    logic.subscribe_goal_events(received.extend)
+    try:
+        assert controller.update_goal(goal.id, 'renamed', 1.5)
+        assert received == []  # still completed, nothing flipped
+        assert controller.update_goal(goal.id, 'renamed', 3.0)
+        assert [(e.previous, e.goal.status) for e in received] == [('Completed', 'Incomplete')]
+    finally:
+        logic.unsubscribe_goal_events(received.extend)
+    assert not controller.update_goal(10**6, 'missing', 1.0)
+
+
+def test_update_goal_keeps_the_period_unless_given():
+    import logic
+    from skilltrack import controller
+    eid = logic.appendEntityToFile(Entity(0, 'A', 'Skill', ''), username='ed')
+    goal = logic.Goal(0, eid, '10h', 10.0, 'Incomplete', 'week')
+    goal.id = logic.appendGoalToFile(goal)
+
+    assert controller.update_goal(goal.id, '12h', 12.0)
+    assert [(g.targetHours, g.period) for g in logic.loadGoalsFromFile(username='ed')] == [(12.0, 'week')]
+    assert controller.update_goal(goal.id, '12h', 12.0, None)
+    assert [g.period for g in logic.loadGoalsFromFile(username='ed')] == [None]
@@ -49,3 +49,27 @@ def test_per_user_files(tmp_path, monkeypatch):
     # ensure alice files still present and unchanged
     assert Path('data/alice/entities.txt').exists()
     assert Path('data/alice/complete_sessions.txt').exists()
+
+
+def test_entity_cache_is_per_user_and_invalidated(monkeypatch):
+    calls = []
+    real_load = controller.loadEntitiesFromFile
+    monkeypatch.setattr(controller, 'loadEntitiesFromFile', lambda **kw: calls.append(kw) or real_load(**kw))
+
+    monkeypatch.setattr(controller, '_current_user', 'cache_user_a')
+    e = controller.create_entity('Reading', 'Skill', '')
+    assert controller.get_entity(e.id).name == 'Reading'
+    assert controller.entity_name_map()[e.id] == 'Reading'
+    controller.get_entities()
+    assert len(calls) == 1
+
+    controller.update_entity(e.id, 'Writing', 'Skill', '')
+    assert controller.get_entity_by_name('Writing').id == e.id
+    assert len(calls) == 2
+
+    monkeypatch.setattr(controller, '_current_user', 'cache_user_b')
+    assert controller.get_entity(e.id) is None
+
+    monkeypatch.setattr(controller, '_current_user', 'cache_user_a')
+    assert controller.delete_entity(e.id) is True
+    assert controller.get_entity(e.id) is None
@@ -0,0 +1,153 @@
+"""Statement and row budgets for hot paths, measured with logic.track_queries().
+
+Each operation runs on a small and a larger generated workload; the number
+of statements must stay within a fixed budget and be the same for both, so
+an accidental per-entity or per-session query (N+1) fails here.
+"""
+import os
+
+import pytest
+
+import logic
+import skilltrack.controller as controller
+from benchmarks import workload
+
+# (entities, sessions per entity)
+SIZES = ((2, 20), (12, 150))
+
+
+@pytest.fixture
+def make_workload(monkeypatch):
+    # the workload's cheap password hash must not trigger a rehash on login
+    monkeypatch.setattr(logic, 'KDF_ITERATIONS', 1000)
+
+    def make(entities, sessions):
+        controller.set_database(logic.MEMORY_DB)
+        work = workload.generate(1, entities, sessions, days=120)
+        assert controller.login_user(work.users[0], workload.PASSWORD)
+        controller.get_entities()  # warm the entity cache, as the GUI's first refresh does
+        return work
+    return make
+
+
+def _track(fn):
+    with logic.track_queries() as stats:
+        fn()
+    return stats
+
+
+def _statements(stats):
+    """Statements excluding per-connection setup, which depends on worker-thread reuse."""
+    return sum(s.count for s in stats.stats() if not s.sql.startswith('PRAGMA') or s.sql == 'PRAGMA data_version')
+
+
+def _range(work):
+    from datetime import datetime
+    return (datetime.combine(work.first_day, datetime.min.time()),
+            datetime.combine(work.last_day, datetime.max.time().replace(microsecond=0)))
+
+
+def test_completed_sessions_read_once(make_workload):
+    for entities, sessions in SIZES:
+        make_workload(entities, sessions)
+        result = []
+        stats = _track(lambda: result.extend(controller.get_completed_sessions()))
+        assert stats.statements == 1
+        assert stats.rows == len(result)  # nothing read beyond what is returned
+
+
+@pytest.mark.parametrize('group_by', [None, 'week'])
+def test_reports_for_all_entities_take_one_query(make_workload, group_by):
+    for entities, sessions in SIZES:
+        work = make_workload(entities, sessions)
+        ids = work.entities[work.users[0]]
+        stats = _track(lambda: controller.generate_reports(ids, *_range(work), group_by=group_by))
+        assert stats.statements == 1
+        if group_by is None:
+            assert stats.rows <= entities  # one aggregate row per entity, not per session
+
+
+def test_goal_progress_reads_only_the_selected_entity(make_workload):
+    for entities, sessions in SIZES:
+        work = make_workload(entities, sessions)
+        entity_id = work.entities[work.users[0]][0]
+        stats = _track(lambda: controller.get_goals(entity_id))
+        assert (stats.statements, stats.rows) == (1, 2)  # the entity's two goals
+        # what MainWindow.load_goals runs for one selected entity
+        stats = _track(lambda: controller.get_goal_progress(entity_id))
+        assert stats.statements == 2  # data_version and one aggregate
+        assert stats.rows <= 1 + 2
+        stats = _track(lambda: controller.get_goal_progress(entity_id))
+        assert {s.sql for s in stats.stats()} == {'PRAGMA data_version'}  # cached until the next commit
+
+
+# --- GUI refresh paths (offscreen, no display needed) ---
+
+# data_version, running timers, first sessions page and the reports query;
+# entities come from the controller's cache
+REFRESH_STATEMENT_BUDGET = 4
+
+
+@pytest.fixture
+def make_window(make_workload):
+    os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+    QtWidgets = pytest.importorskip('PyQt6.QtWidgets')
+    app = QtWidgets.QApplication.instance() or QtWidgets.QApplication([])
+    import SkillTrackGUI
+    windows = []
+
+    def make(entities, sessions):
+        make_workload(entities, sessions)
+        win = SkillTrackGUI.MainWindow()
+        win.ui_timer.stop()  # ticks are driven by hand below
+        win.tasks.wait()
+        windows.append(win)
+        return win
+    yield make
+    for win in windows:
+        win.tasks.wait()
+        win.close()
+        win.deleteLater()
+    app.processEvents()
+
+
+def test_refresh_all_statement_budget(make_window):
+    counts = []
+    for entities, sessions in SIZES:
+        win = make_window(entities, sessions)
+
+        def refresh():
+            win.refresh_all()
+            win.tasks.wait()
+        stats = _track(refresh)
+        counts.append(_statements(stats))
+        assert counts[-1] <= REFRESH_STATEMENT_BUDGET, stats.report()
+        # rows follow what is shown (entities, goals, one page of sessions), never the full history
+        assert stats.rows <= 4 * entities + logic.SESSION_PAGE_SIZE + 2, stats.report()
+    assert counts[0] == counts[1]
+
+
+def test_timer_ticks_only_poll_data_version(make_window):
+    for entities, sessions in SIZES:
+        win = make_window(entities, sessions)
+        ticks = 3 * win.DB_CHECK_TICKS
+        stats = _track(lambda: [win.tick_timers() for _ in range(ticks)])
+        assert stats.statements == ticks // win.DB_CHECK_TICKS
+        assert {s.sql for s in stats.stats()} == {'PRAGMA data_version'}
+
+
+def test_new_day_reopens_daily_goals(make_window):
+    from datetime import date, timedelta
+    win = make_window(*SIZES[0])
+    entity_id = win.entities[0].id
+    goal = controller.add_goal(entity_id, 'daily', 0.5, 'day')
+    logic.get_db_connection().execute("UPDATE goals SET status = 'Completed' WHERE id = ?", (goal.id,))
+    logic.get_db_connection().commit()
+
+    win.tick_timers()
+    win.tasks.wait()
+    assert controller.get_goals(entity_id)[-1].status == 'Completed'  # same day: nothing re-evaluated
+    win._goal_day = date.today() - timedelta(days=1)  # as if the app had been open since yesterday
+    win.tick_timers()
+    win.tasks.wait()
+    assert controller.get_goals(entity_id)[-1].status == 'Incomplete'
@@ -0,0 +1,59 @@
+from datetime import date, datetime
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from logic import Session, appendSessionToFile, loadSessionColumns
+from skilltrack.reports import concat_matrices, period_chunks, period_matrix, period_start
+
+
+def test_period_start_week_and_month():
+    days = np.array(['2021-03-01', '2021-03-07', '2021-03-08', '2021-02-28'], dtype='datetime64[D]')
+    assert period_start(days, 'week').astype(str).tolist() == ['2021-03-01', '2021-03-01', '2021-03-08', '2021-02-22']
+    assert period_start(days, 'month').astype(str).tolist() == ['2021-03-01', '2021-03-01', '2021-03-01', '2021-02-01']
+
+
+def test_period_matrix_buckets_and_cumulates():
+    entity_col = [1, 2, 1, 1, 9]
+    when = np.array(['2021-03-01', '2021-03-02', '2021-03-09', '2021-03-10', '2021-03-01'], dtype='datetime64[D]')
+    seconds = [3600, 1800, 7200, 3600, 999]
+    m = period_matrix(entity_col, when, seconds, [1, 2], 'week', date(2021, 3, 1), date(2021, 3, 14))
+    assert m.period_dates() == [date(2021, 3, 1), date(2021, 3, 8)]
+    assert m.labels() == ['2021-03-01', '2021-03-08']
+    assert m.hours.tolist() == [[1.0, 0.5], [3.0, 0.0]]
+    assert m.cumulative_hours.tolist() == [[1.0, 0.5], [4.0, 0.5]]
+    # entity 9 was not requested and is ignored
+    assert m.totals.tolist() == [14400.0, 1800.0]
+
+
+def test_chunked_matrix_matches_whole_range():
+    rng = np.random.default_rng(7)
+    when = np.datetime64('2020-01-01') + rng.integers(0, 700, 500).astype('timedelta64[D]')
+    entity_col = rng.integers(1, 4, 500)
+    seconds = rng.integers(60, 7200, 500).astype(float)
+    first, last = date(2020, 1, 15), date(2021, 11, 20)
+    keep = (when >= np.datetime64(first)) & (when <= np.datetime64(last))
+    when, entity_col, seconds = when[keep], entity_col[keep], seconds[keep]
+    whole = period_matrix(entity_col, when, seconds, [1, 2, 3], 'week', first, last)
+    chunks = period_chunks(first, last, 'week', 10)
+    assert chunks[0][0] == first and chunks[-1][1] == last
+    parts = []
+    for lo, hi in chunks:
+        inside = (when >= np.datetime64(lo)) & (when <= np.datetime64(hi))
+        parts.append(period_matrix(entity_col[inside], when[inside], seconds[inside], [1, 2, 3], 'week', lo, hi))
+    joined = concat_matrices(parts)
+    assert joined.periods.tolist() == whole.periods.tolist()
+    assert np.allclose(joined.seconds, whole.seconds)
+    assert np.allclose(joined.totals, whole.totals)
+
+
+def test_load_session_columns():
+    appendSessionToFile(Session(0, datetime(2016, 2, 1, 8), datetime(2016, 2, 1, 9, 30), 7101))
+    appendSessionToFile(Session(0, datetime(2016, 2, 2, 8), datetime(2016, 2, 2, 8, 15), 7101))
+    cols = loadSessionColumns(entity_ids=[7101], start=datetime(2016, 2, 1), end=datetime(2016, 2, 3))
+    assert cols['entity_id'].tolist() == [7101, 7101]
+    assert sorted((cols['duration'] // 10**6).tolist()) == [900, 5400]
+    assert cols['start'].dtype == np.dtype('datetime64[us]')
+    m = period_matrix(cols['entity_id'], cols['start'], cols['duration'] / 1e6, [7101], 'day')
+    assert m.hours[:, 0].tolist() == [1.5, 0.25]
@@ -0,0 +1,43 @@
+from datetime import datetime, date
+
+import logic
+from logic import Session, appendSessionToFile, loadDailyTotals
+
+
+def _session_id():
+    return logic.get_db_connection().execute("SELECT MAX(id) FROM sessions").fetchone()[0]
+
+
+def test_rollup_splits_sessions_across_midnight():
+    appendSessionToFile(Session(0, datetime(2017, 3, 1, 23, 0), datetime(2017, 3, 2, 1, 30), 6101))
+    totals = loadDailyTotals([6101], date(2017, 3, 1), date(2017, 3, 2))
+    assert totals == {(6101, date(2017, 3, 1)): 3600.0, (6101, date(2017, 3, 2)): 5400.0}
+
+
+def test_rollup_follows_update_delete_and_recover():
+    appendSessionToFile(Session(0, datetime(2017, 4, 1, 9, 0), datetime(2017, 4, 1, 10, 0), 6102))
+    sid = _session_id()
+    days = (date(2017, 4, 1), date(2017, 4, 3))
+
+    logic.update_session(sid, 6103, datetime(2017, 4, 2, 9, 0), datetime(2017, 4, 2, 9, 45))
+    assert loadDailyTotals([6102, 6103], *days) == {(6103, date(2017, 4, 2)): 2700.0}
+
+    logic.delete_session(sid)
+    assert loadDailyTotals([6102, 6103], *days) == {}
+
+    logic.recover_session(sid)
+    assert loadDailyTotals([6102, 6103], *days) == {(6103, date(2017, 4, 2)): 2700.0}
+    assert logic.rebuild_rollups(verify_only=True) == []
+
+
+def test_end_session_updates_rollup_and_rebuild_repairs_drift():
+    started = logic.startSession(logic.Entity(6104, 'E', 'Skill', ''))
+    logic.endSession(started)
+    assert logic.entity_total_seconds(6104) >= 0
+
+    conn = logic.get_db_connection()
+    with conn:
+        conn.execute("INSERT INTO daily_totals (entity_id, day, seconds) VALUES (6105, '2017-05-01', 99)")
+    assert logic.rebuild_rollups(verify_only=True) == [(6105, '2017-05-01', 99.0, 0.0)]
+    assert logic.rebuild_rollups() == [(6105, '2017-05-01', 99.0, 0.0)]
+    assert logic.rebuild_rollups(verify_only=True) == []
@@ -0,0 +1,18 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+pytest.importorskip("PyQt6.QtWidgets")
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_gui_import_defers_heavy_modules(tmp_path):
+    code = ("import sys, SkillTrackGUI; "
+            "print(','.join(m for m in ('matplotlib', 'pyqtgraph', 'numpy') if m in sys.modules))")
+    env = dict(os.environ, PYTHONPATH=ROOT, QT_QPA_PLATFORM='offscreen')
+    out = subprocess.run([sys.executable, '-c', code], cwd=tmp_path, env=env,
+                         capture_output=True, text=True, check=True).stdout
+    assert out.strip() == ''
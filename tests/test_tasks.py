@@ -0,0 +1,58 @@
+import threading
+
+import pytest
+
+QtCore = pytest.importorskip("PyQt6.QtCore")
+
+from skilltrack.tasks import TaskRunner
+
+
+@pytest.fixture(scope="module")
+def app():
+    return QtCore.QCoreApplication.instance() or QtCore.QCoreApplication([])
+
+
+def test_newer_task_supersedes_older(app):
+    runner = TaskRunner()
+    gate = threading.Event()
+    results, busy = [], []
+    runner.busyChanged.connect(lambda key, state: busy.append((key, state)))
+    runner.submit('k', lambda: gate.wait(5) and 'old', on_result=results.append)
+    runner.submit('k', lambda: 'new', on_result=results.append)
+    gate.set()
+    assert runner.wait()
+    assert results == ['new']
+    assert busy == [('k', True), ('k', False)]
+
+
+def test_errors_go_to_on_error(app):
+    runner = TaskRunner()
+    errors = []
+    runner.submit('k', lambda: 1 / 0, on_result=lambda r: errors.append('unexpected'), on_error=errors.append)
+    runner.cancel('other')
+    assert runner.wait()
+    assert len(errors) == 1 and isinstance(errors[0], ZeroDivisionError)
+    assert not runner.is_busy('k')
+
+
+def test_worker_connections_stay_bounded(app):
+    import logic
+    from skilltrack.tasks import task_pool
+    assert task_pool().expiryTimeout() == -1
+    logic.get_db_connection()
+    runner = TaskRunner()
+    for i in range(40):
+        runner.submit(f'k{i}', lambda: logic.get_db_connection().execute("SELECT 1").fetchone())
+        if i % 10 == 9:
+            assert runner.wait()  # also lets Qt retire the idle threads
+    assert runner.wait()
+    assert len(logic._connections) <= task_pool().maxThreadCount() + 1
+
+
+def test_unhandled_errors_are_logged(app, caplog, capsys):
+    runner = TaskRunner()
+    runner.submit('boom', lambda: 1 / 0)
+    assert runner.wait()
+    record = next(r for r in caplog.records if r.name == 'skilltrack.tasks')
+    assert "'boom'" in record.getMessage() and record.exc_info[0] is ZeroDivisionError
+    assert capsys.readouterr().out == ''